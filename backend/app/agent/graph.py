@@ -1,4 +1,5 @@
 import asyncio
+from typing import Dict
 from langgraph.graph import StateGraph, END
 import logging
 from langchain_core.messages import SystemMessage
@@ -10,6 +11,7 @@ from app.tools.calendar import (
     list_calendars,
     list_events,
     create_event,
+    create_events_batch,
     delete_event,
     _get_selected_calendars
 )
@@ -27,6 +29,7 @@ tools = [
     list_calendars,
     list_events,
     create_event,
+    create_events_batch,
     delete_event,
     summarize_meeting_notes, # Added
     verify_calendar_registrations # Added
@@ -43,58 +46,20 @@ from app.core.google_auth import get_calendar_service # Added import
 from app.services.context_manager import context_manager # Added import
 from app.core.utils import extract_json # Added import
 from app.core.datetime_utils import now_kst
-
-TRAVEL_ROUTER_HINTS = (
-    "osaka", "오사카", "간사이", "일본",
-    "비행", "항공", "항공편", "항공권", "항공사", "편명", "탑승", "게이트",
-    "출발", "도착", "환승", "경유", "수하물", "예약번호", "pnr",
-    "flight", "airline", "booking", "ticket", "boarding", "gate", "itinerary",
-    "여행", "여정", "숙소", "호텔", "렌터카", "투어",
-)
-TRAVEL_ROUTER_REGEX = (
-    re.compile(r"\b(kix|itm|nrt|hnd|icn|gmp)\b", re.IGNORECASE),
-    re.compile(r"\b(e-?ticket|eticket)\b", re.IGNORECASE),
-)
-CALENDAR_ONLY_HINTS = (
-    "캘린더", "calendar", "일정", "스케줄", "회의", "미팅", "약속",
-    "오늘 일정", "내일 일정", "이번 주 일정", "주간 일정", "월간 일정",
-    "today schedule", "tomorrow schedule", "weekly schedule",
-)
-CALENDAR_FORCE_HINTS = (
-    "일정", "캘린더", "스케줄", "미팅", "회의", "약속",
-    "schedule", "calendar", "meeting", "appointment",
-)
-CALENDAR_CREATE_HINTS = (
-    "추가", "등록", "만들", "잡아", "예약", "생성",
-    "add", "create", "book", "set up", "schedule",
-)
+from app.agent.routing import FastPathRouter, RouteDecision, RoutingRule
+from app.agent.keyword_matcher import keyword_matcher
 
 def is_travel_query(message: str) -> bool:
-    if not message:
-        return False
-    text = message.lower()
-    has_travel_hint = any(hint in text for hint in TRAVEL_ROUTER_HINTS) or any(
-        pattern.search(text) for pattern in TRAVEL_ROUTER_REGEX
-    )
-    has_calendar_hint = any(hint in text for hint in CALENDAR_ONLY_HINTS)
-
-    if has_calendar_hint and not has_travel_hint:
-        return False
-    return has_travel_hint
+    features = keyword_matcher.features(message)
+    # Calendar wording without any travel hint stays a calendar query
+    return "travel" in features
 
 def is_calendar_query(message: str) -> bool:
-    if not message:
-        return False
-    text = message.lower()
-    if any(hint in text for hint in CALENDAR_ONLY_HINTS):
-        return True
-    return any(hint in text for hint in CALENDAR_FORCE_HINTS)
+    features = keyword_matcher.features(message)
+    return "calendar_only" in features or "calendar_force" in features
 
 def is_calendar_create_query(message: str) -> bool:
-    if not message:
-        return False
-    text = message.lower()
-    return any(hint in text for hint in CALENDAR_CREATE_HINTS)
+    return keyword_matcher.has(message, "calendar_create")
 
 def is_calendar_list_query(message: str) -> bool:
     return is_calendar_query(message) and not is_calendar_create_query(message)
@@ -130,13 +95,7 @@ def normalize_travel_search_query(intent: str, last_user_message: str, args: dic
     """
     Ensure travel search uses a specific query rather than a vague destination-only lookup.
     """
-    flight_hints = (
-        "flight", "airline", "ticket", "boarding", "gate", "pnr",
-        "비행", "항공", "항공편", "항공권", "항공사", "편명", "탑승", "게이트", "예약번호",
-    )
-    intent_text = (intent or "").lower()
-    user_text = (last_user_message or "").lower()
-    wants_flight = any(h in intent_text for h in flight_hints) or any(h in user_text for h in flight_hints)
+    wants_flight = keyword_matcher.has(intent, "flight") or keyword_matcher.has(last_user_message, "flight")
 
     dest = args.get("destination") or args.get("location")
     query = args.get("query")
@@ -266,7 +225,7 @@ base_planner_parser = PydanticOutputParser(pydantic_object=PlannerResponse)
 base_executor_parser = PydanticOutputParser(pydantic_object=ExecutorResponse)
 
 
-def fix_json_with_llm(json_str: str, error: str, parser):
+async def fix_json_with_llm(json_str: str, error: str, parser):
     """Custom fallback fixer for malformed JSON using the 27B model."""
     logger.info("Attempting to fix malformed JSON with Remote LLM...")
     llm = get_llm(model=settings.LLM_MODEL_PLANNER, format="json", is_complex=True)
@@ -279,17 +238,76 @@ Raw Text:
 Please extract and fix the JSON. Respond ONLY with the fixed JSON object.
 """
     try:
-        response = llm.invoke(prompt)
+        response = await llm.ainvoke(prompt)
         fixed_content = extract_json(response.content)
         return parser.parse(fixed_content)
     except Exception as e:
         logger.error(f"JSON Fixing failed: {e}")
         raise e
 
-def router_node(state: AgentState, config):
+# --- Fast-path routing rules (scores are confidences in [0, 1]) ---
+GREETING_REGEX = re.compile(
+    r"^\s*(안녕|반가|고마|감사|(?:hello|hi|hey|thanks|thank you|good (?:morning|afternoon|evening))\b)",
+    re.IGNORECASE,
+)
+
+def _is_plain_calendar_query(message: str) -> bool:
+    return (
+        is_calendar_query(message)
+        and not is_travel_query(message)
+        and not keyword_matcher.has(message, "complex")
+    )
+
+def _score_meeting_notes(message: str) -> float:
+    features = keyword_matcher.features(message)
+    if "meeting_notes" in features:
+        return 0.95
+    # "정리/요약" alone is ambiguous unless the user pasted a long body of notes
+    if "complex" in features and len(message) > 200:
+        return 0.9
+    return 0.0
+
+def _score_travel(message: str) -> float:
+    return 0.9 if is_travel_query(message) else 0.0
+
+def _score_calendar_create(message: str) -> float:
+    return 0.9 if _is_plain_calendar_query(message) and is_calendar_create_query(message) else 0.0
+
+def _score_calendar_list(message: str) -> float:
+    return 0.9 if _is_plain_calendar_query(message) and not is_calendar_create_query(message) else 0.0
+
+def _score_greeting(message: str) -> float:
+    if not GREETING_REGEX.match(message):
+        return 0.0
+    if is_calendar_query(message) or is_travel_query(message):
+        return 0.0
+    return 0.95 if len(message.strip()) <= 20 else 0.5
+
+fast_path_router = FastPathRouter(
+    [
+        RoutingRule("meeting_notes", "complex", _score_meeting_notes),
+        RoutingRule("travel", "complex", _score_travel),
+        RoutingRule("calendar_create", "simple", _score_calendar_create),
+        RoutingRule("calendar_list", "simple", _score_calendar_list),
+        RoutingRule("greeting", "answer", _score_greeting),
+    ],
+    threshold=settings.ROUTER_FAST_PATH_THRESHOLD,
+)
+
+async def router_node(state: AgentState, config):
     """
     Initial routing node.
+    High-confidence intents are routed by rules; everything else goes to the LLM router.
     """
+    messages = state["messages"]
+    last_user_message = next((m.content for m in reversed(messages) if isinstance(m, HumanMessage)), "")
+
+    decision = fast_path_router.classify(last_user_message)
+    if decision:
+        logger.info(f"Router fast-path: {decision.source} -> {decision.mode} ({decision.confidence:.2f})")
+        fast_path_router.record(decision)
+        return {"router_mode": decision.mode}
+
     thread_id = config.get("configurable", {}).get("thread_id", "default")
     profile = memory_service.get_user_profile(thread_id=thread_id)
     user_info = profile.get("user", {})
@@ -297,17 +315,6 @@ def router_node(state: AgentState, config):
     context_str = f"\nUser: {user_info}\nFacts: {facts}" if user_info or facts else ""
     time_str = f"Current Time(Asia/Seoul): {get_current_time_str()}"
 
-    messages = state["messages"]
-    last_user_message = next((m.content for m in reversed(messages) if isinstance(m, HumanMessage)), "")
-    
-    lower_user_message = last_user_message.lower()
-    if is_calendar_query(last_user_message) and not is_travel_query(last_user_message):
-        # Keywords that indicate we need complex reasoning/summary
-        complex_keywords = ["회의록", "녹취록", "정리", "요약", "meeting notes", "transcript", "summary", "action items"]
-        if not any(kw in lower_user_message for kw in complex_keywords):
-            logger.info("Router short-circuit: calendar query -> simple")
-            return {"router_mode": "simple"}
-
     system_prompt = f"""[Identity]
 You are a STERN AI ROUTER. You ONLY output JSON. NO CHAT.
 
@@ -332,11 +339,12 @@ You are a STERN AI ROUTER. You ONLY output JSON. NO CHAT.
         fallback_llm = get_llm(model=settings.LLM_MODEL_ROUTER, format="")
         modern_llm = primary_llm.with_fallbacks([fallback_llm])
         
-        response = modern_llm.invoke(prompt)
+        response = await modern_llm.ainvoke(prompt)
         content = response.content
         json_str = extract_json(content)
         if not json_str:
              logger.warning("Router returned empty or invalid JSON. Defaulting to 'complex'. Content: " + str(content[:100]))
+             fast_path_router.record(RouteDecision("complex", 0.0, "llm_fallback"))
              # Ensure we don't return an empty string/message
              return {"router_mode": "complex"}
         
@@ -344,36 +352,26 @@ You are a STERN AI ROUTER. You ONLY output JSON. NO CHAT.
             parsed = base_router_parser.parse(json_str)
         except Exception as parse_err:
             logger.warning(f"Router JSON parse failed. Attempting fix... Error: {parse_err}")
-            parsed = fix_json_with_llm(json_str, str(parse_err), base_router_parser)
+            parsed = await fix_json_with_llm(json_str, str(parse_err), base_router_parser)
                 
         logger.info(f"Router Decision: {parsed.mode} in {time.time()-start_t:.2f}s")
-        if is_travel_query(last_user_message) and parsed.mode in ("answer", "simple"):
+        mode = parsed.mode
+        if is_travel_query(last_user_message) and mode in ("answer", "simple"):
             logger.info("Router override: travel query -> complex")
-            return {"router_mode": "complex"}
-        if is_calendar_query(last_user_message) and parsed.mode == "answer":
+            mode = "complex"
+        elif is_calendar_query(last_user_message) and mode == "answer":
             logger.info("Router override: calendar query -> simple")
-            return {"router_mode": "simple"}
-        return {"router_mode": parsed.mode}
+            mode = "simple"
+        fast_path_router.record(RouteDecision(mode, 1.0, "llm"))
+        return {"router_mode": mode}
     except Exception as e:
         logger.error(f"Routing failed: {e}")
+        fast_path_router.record(RouteDecision("complex", 0.0, "llm_fallback"))
         return {"router_mode": "complex"}
 
 def _should_suppress_travel_facts(message: str) -> bool:
-    if not message:
-        return False
-    text = message.lower()
-    calendar_only = (
-        "캘린더", "calendar", "일정", "스케줄", "회의", "미팅", "약속",
-        "오늘 일정", "내일 일정", "이번 주 일정", "주간 일정", "월간 일정",
-        "today schedule", "tomorrow schedule", "weekly schedule",
-    )
-    travel_only = (
-        "여행", "여정", "오사카", "간사이", "항공", "비행", "호텔", "숙소",
-        "flight", "airline", "ticket", "itinerary", "osaka",
-    )
-    has_calendar = any(h in text for h in calendar_only)
-    has_travel = any(h in text for h in travel_only)
-    return has_calendar and not has_travel
+    features = keyword_matcher.features(message)
+    return "calendar_only" in features and "travel_fact" not in features
 
 
 def _filter_travel_facts(facts: dict) -> dict:
@@ -400,7 +398,7 @@ def _is_registration_confirmation(message: str) -> bool:
     return any(k in lowered for k in keywords)
 
 
-def planner(state: AgentState, config):
+async def planner(state: AgentState, config):
     """The planner node using Remote LLM with Structured Output."""
     from app.services.memory import memory_service
     thread_id = config.get("configurable", {}).get("thread_id", "default")
@@ -485,7 +483,7 @@ def planner(state: AgentState, config):
                         SystemMessage(content="A tool was executed to summarize meeting notes but returned empty data. Summarize the conversation history for the user and ask for the specific meeting content if it was missing. DO NOT OUTPUT JSON. Answer in Korean."),
                         HumanMessage(content=f"Last tool result: {last_tool_msg.content}")
                     ]
-                    summary_res = get_llm().invoke(summary_prompt)
+                    summary_res = await get_llm().ainvoke(summary_prompt)
                     return {
                         "messages": [summary_res],
                         "mode": "plan",
@@ -506,7 +504,7 @@ def planner(state: AgentState, config):
                 SystemMessage(content="Summarize this tool result for the user in 1-2 friendly Korean sentences. NO JSON. IMPORTANT: Keep the original event summaries EXACTLY as they are (e.g., preserve brackets like [MemberName])."),
                 HumanMessage(content=f"Tool: {last_tool_msg.name}\nOutput: {str(last_tool_msg.content)}")
             ]
-            summary_res = get_llm().invoke(summary_prompt)
+            summary_res = await get_llm().ainvoke(summary_prompt)
             return {
                 "messages": [summary_res],
                 "mode": "plan",
@@ -540,7 +538,7 @@ You are a PROFESSIONAL PLANNER. YOU ONLY OUTPUT JSON.
 - Calendar Queries -> MUST set 'mode': 'execute'.
 - Respond in {state.get("language", "Korean")}.
 - When describing a successful registration, say ONLY something like "[Event Name]을(를) [Calendar Name]에 [Time]에 추가했습니다." (No "Double-checked", no technical details).
-- **REGISTRATION STATUS**: NEVER claim "I have registered" or "Added to calendar" until you see a `ToolMessage` with `status: success` from `create_event`.
+- **REGISTRATION STATUS**: NEVER claim "I have registered" or "Added to calendar" until you see a `ToolMessage` with `status: success` from `create_event` (or per-item `status: success` in `create_events_batch` results).
 - **WORKFLOW**: Current Meeting Workflow Step: {state.get('meeting_workflow_step', 'None')}. 
     - If 'review', use a numbered list for events (e.g., "1. [Meeting] at 10:00") and ask "Would you like to register all, or just specific ones?".
     - If user says "Proceed" or "Yes" during 'review', set `mode`: 'execute' and `intent_description`: 'Confirm and register all pending_calendar_events'.
@@ -596,13 +594,13 @@ You are a PROFESSIONAL PLANNER. YOU ONLY OUTPUT JSON.
         
         modern_llm = primary_llm.with_fallbacks([fallback_llm])
         
-        response = modern_llm.invoke(prompt_messages)
+        response = await modern_llm.ainvoke(prompt_messages)
         content = response.content
         
         if not content or not content.strip():
              # If even fallback returned empty, try one last time with fresh fallback instance
              logger.warning("Modern LLM returned empty content. Final manual retry...")
-             response = fallback_llm.invoke(prompt_messages)
+             response = await fallback_llm.ainvoke(prompt_messages)
              content = response.content
 
         json_str = extract_json(content)
@@ -626,7 +624,7 @@ You are a PROFESSIONAL PLANNER. YOU ONLY OUTPUT JSON.
                 )
             else:
                 try:
-                    parsed = fix_json_with_llm(json_str, str(parse_err), base_planner_parser)
+                    parsed = await fix_json_with_llm(json_str, str(parse_err), base_planner_parser)
                 except:
                     # Final fallback: if everything fails, return a plan mode response to avoid complete crash
                     logger.error("All JSON parsing and fixing failed. Using emergency plan response.")
@@ -655,7 +653,7 @@ You are a PROFESSIONAL PLANNER. YOU ONLY OUTPUT JSON.
                      SystemMessage(content="You previously tried to search but we are in a loop. Summarize the following tool result for the user in natural language. DO NOT OUTPUT JSON. Answer directly to the user."),
                      HumanMessage(content=f"Tool result to summarize: {str(last_tool_msg.content)}")
                  ]
-                 summary_res = get_llm().invoke(summary_prompt)
+                 summary_res = await get_llm().ainvoke(summary_prompt)
                  parsed.assistant_message = summary_res.content
                  logger.info(f"Forced natural summary generated: {parsed.assistant_message[:100]}...")
 
@@ -712,7 +710,7 @@ You are a PROFESSIONAL PLANNER. YOU ONLY OUTPUT JSON.
         friendy_msg = "죄송합니다. 요청을 처리하는 중에 문제가 발생했습니다. (모델 응답 지연 또는 오류)"
         return {"messages": [AIMessage(content=friendy_msg)], "mode": "plan"}
 
-def executor_node(state: AgentState, config):
+async def executor_node(state: AgentState, config):
     intent = state.get("intent_summary") or next((m.content for m in reversed(state["messages"]) if isinstance(m, HumanMessage)), "List my events today")
     messages = state["messages"]
     messages = state["messages"]
@@ -827,10 +825,11 @@ CRITICAL: If 'intent' is 'Confirm and register all pending_calendar_events', you
     # Fetch available calendars and create a name-to-id mapping
     calendar_name_to_id_map = {}
     try:
-        service = get_calendar_service()
+        # Google API client is blocking; keep it off the event loop
+        service = await asyncio.to_thread(get_calendar_service)
         if service:
             # _get_selected_calendars returns structured data
-            calendars = _get_selected_calendars(service)
+            calendars = await asyncio.to_thread(_get_selected_calendars, service)
             for cal in calendars:
                 calendar_name_to_id_map[cal['summary']] = cal['id']
     except Exception as e:
@@ -863,7 +862,7 @@ CRITICAL: If 'intent' is 'Confirm and register all pending_calendar_events', you
     logger.info(f"Invoking Remote Executor ({executor_model}) - Prompt Length: {len(system_prompt)}")
     logger.info(f"[DEBUG] executor_node - PENDING EVENTS in prompt: {json.dumps(pending_events, ensure_ascii=False)}")
     try:
-        response = modern_llm.invoke(prompt)
+        response = await modern_llm.ainvoke(prompt)
         content = response.content
         json_str = extract_json(content)
         if not json_str:
@@ -873,7 +872,7 @@ CRITICAL: If 'intent' is 'Confirm and register all pending_calendar_events', you
             parsed = base_executor_parser.parse(json_str)
         except Exception as parse_err:
              logger.warn(f"Executor JSON parse failed: {parse_err}. Attempting fix...")
-             parsed = fix_json_with_llm(json_str, str(parse_err), base_executor_parser)
+             parsed = await fix_json_with_llm(json_str, str(parse_err), base_executor_parser)
 
         if parsed.proposed_action:
              logger.info(f"Executor Decision: {parsed.proposed_action.tool}({parsed.proposed_action.args})")
@@ -1093,6 +1092,22 @@ CRITICAL: If 'intent' is 'Confirm and register all pending_calendar_events', you
                 id=f"exec_{len(messages)}_{i}"
             ))
         
+        # Collapse several create_event calls (e.g. meeting action items) into one batched call
+        create_calls = [call for call in tool_calls if call["name"] == "create_event"]
+        if len(create_calls) > 1:
+            batch_call = ToolCall(
+                name="create_events_batch",
+                args={
+                    "events": [{k: v for k, v in call["args"].items() if k != "thread_id"} for call in create_calls],
+                    "thread_id": thread_id,
+                },
+                id=create_calls[0]["id"],
+            )
+            first = tool_calls.index(create_calls[0])
+            tool_calls = [call for call in tool_calls if call["name"] != "create_event"]
+            tool_calls.insert(first, batch_call)
+            logger.info(f"[EXECUTOR] Batched {len(create_calls)} create_event calls into create_events_batch.")
+
         logger.info(f"[EXECUTOR] Generated {len(tool_calls)} tool calls.")
             
         # If we successfully registered pending events, clear them from state
@@ -1103,6 +1118,9 @@ CRITICAL: If 'intent' is 'Confirm and register all pending_calendar_events', you
             
         return updates
 
+# Shared tool executor; ToolNode is stateless across invocations
+tool_node = ToolNode(tools)
+
 def route_after_router(state: AgentState):
     """Routes based on router's decision."""
     # Always go through planner for superior temporal reasoning and intent processing.
@@ -1137,10 +1155,10 @@ def chatbot(state: AgentState):
     response = llm_with_tools.invoke(state["messages"])
     return {"messages": [response]}
 
-def tool_with_logging(state: AgentState, config):
+async def tool_with_logging(state: AgentState, config):
     """Execution node for tools with result logging and state updates."""
-    tool_node = ToolNode(tools)
-    result = tool_node.invoke(state)
+    # Blocking tools (Google Calendar, FAISS) are run in the default executor by ToolNode.ainvoke
+    result = await tool_node.ainvoke(state, config)
     
     # 1. Iterate through ALL tool messages generated in this step
     # LangGraph result['messages'] contains the new ToolMessage objects
@@ -1197,6 +1215,30 @@ def tool_with_logging(state: AgentState, config):
             except Exception as e:
                 logger.error(f"Failed to parse create_event result: {e}")
 
+        # --- Handle create_events_batch result ---
+        elif tool_msg.name == "create_events_batch":
+            try:
+                data = json.loads(content)
+                created = []
+                for item in data.get("results", []):
+                    registration_results.append({
+                        "summary": item.get("summary", "Unknown"),
+                        "status": item.get("status", "error"),
+                        "eventId": item.get("eventId"),
+                        "calendar_id": item.get("calendar_id") or "primary",
+                        "error": item.get("error")
+                    })
+                    if item.get("status") == "success":
+                        created.append({
+                            "event_id": item["eventId"],
+                            "summary": item.get("summary", "Unknown"),
+                            "calendar_id": item.get("calendar_id") or "primary",
+                        })
+                # One transaction for the whole batch
+                context_manager.add_events(thread_id, created)
+            except Exception as e:
+                logger.error(f"Failed to parse create_events_batch result: {e}")
+
         # --- Handle verify_calendar_registrations result ---
         elif tool_msg.name == "verify_calendar_registrations":
             try:
@@ -1218,9 +1260,12 @@ def tool_with_logging(state: AgentState, config):
     
     return updates
 
-def get_graph(checkpointer=None):
-    logger.info("--- get_graph with checkpointer support loaded. ---")
-    # Define the graph
+# Compiled graph registry: id(checkpointer) -> (checkpointer, compiled graph)
+# The checkpointer reference is held so its id cannot be recycled while cached.
+_compiled_graphs: Dict[int | None, tuple] = {}
+
+def build_workflow() -> StateGraph:
+    """Builds the (uncompiled) agent workflow definition."""
     workflow = StateGraph(AgentState)
 
     workflow.add_node("router", router_node)
@@ -1235,12 +1280,35 @@ def get_graph(checkpointer=None):
     workflow.add_conditional_edges("executor", route_tools, {"tools": "tools", END: END})
     workflow.add_edge("tools", "planner") # After tool execution, go to planner for final response
 
+    return workflow
+
+def get_graph(checkpointer=None):
+    """
+    Returns the compiled graph bound to `checkpointer`.
+    The workflow is compiled once per checkpointer and reused across requests.
+    """
+    key = id(checkpointer) if checkpointer is not None else None
+    cached = _compiled_graphs.get(key)
+    if cached and cached[0] is checkpointer:
+        return cached[1]
+
+    start_t = time.time()
+    workflow = build_workflow()
     if checkpointer:
-        return workflow.compile(checkpointer=checkpointer)
+        compiled = workflow.compile(checkpointer=checkpointer)
     else:
         # Fallback for non-async contexts or when no checkpointer is provided
-        return workflow.compile()
-
-# Default compiled graph for tests and simple usage
-graph = get_graph()
-
+        compiled = workflow.compile()
+    _compiled_graphs[key] = (checkpointer, compiled)
+    logger.info(f"Compiled agent graph (checkpointer={type(checkpointer).__name__}) in {time.time()-start_t:.3f}s")
+    return compiled
+
+def clear_graph_cache():
+    """Drops all compiled graphs (e.g. when the checkpointer is closed)."""
+    _compiled_graphs.clear()
+
+def __getattr__(name: str):
+    # Default compiled graph for tests and simple usage, built lazily on first access
+    if name == "graph":
+        return get_graph()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
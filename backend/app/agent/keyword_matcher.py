@@ -0,0 +1,138 @@
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Optional, Pattern
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Builds a regex that matches any of `words`, factored as a character trie
+    so hints sharing a prefix are tried once instead of one alternative per hint.
+    Optional suffix groups are greedy, so the longest hint at a position wins.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # end-of-word marker
+
+    def emit(node: dict) -> str:
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        is_word = "" in node
+        if len(branches) == 1 and not is_word:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if is_word else group
+
+    return emit(trie)
+
+
+class KeywordMatcher:
+    """
+    Multi-pattern substring matcher for the routing hint tables.
+    All literals are compiled into a single alternation so a message is scanned once,
+    and the result is the set of feature names (table names) whose hints occur in it.
+
+    Matching is case-insensitive substring matching, i.e. equivalent to
+    `any(hint in message.lower() for hint in table)` for every table at once.
+    """
+    def __init__(
+        self,
+        tables: Dict[str, Iterable[str]],
+        patterns: Optional[Dict[str, Iterable[Pattern]]] = None,
+        cache_size: int = 1024,
+    ):
+        literal_features: Dict[str, set] = {}
+        for feature, hints in tables.items():
+            for hint in hints:
+                literal_features.setdefault(hint.lower(), set()).add(feature)
+
+        # At each position the trie pattern reports only the longest hint, so every literal
+        # also carries the features of the shorter hints it starts with ("항공편" -> "항공").
+        self._features_by_literal: Dict[str, FrozenSet[str]] = {
+            literal: frozenset().union(*(
+                literal_features[prefix] for prefix in literal_features if literal.startswith(prefix)
+            ))
+            for literal in literal_features
+        }
+        # Zero-width lookahead so overlapping hints (e.g. "일정" inside "오늘 일정") are all seen
+        self._regex = re.compile(f"(?=({_trie_pattern(literal_features)}))") if literal_features else None
+        self._patterns = [(feature, pattern) for feature, group in (patterns or {}).items() for pattern in group]
+        self.features = lru_cache(maxsize=cache_size)(self._scan)
+
+    def _scan(self, message: str) -> FrozenSet[str]:
+        """Returns the feature names present in `message`."""
+        if not message:
+            return frozenset()
+        text = message.lower()
+        found = set()
+        if self._regex is not None:
+            for literal in set(self._regex.findall(text)):
+                found |= self._features_by_literal[literal]
+        for feature, pattern in self._patterns:
+            if feature not in found and pattern.search(text):
+                found.add(feature)
+        return frozenset(found)
+
+    def has(self, message: str, feature: str) -> bool:
+        return feature in self.features(message)
+
+
+TRAVEL_ROUTER_HINTS = (
+    "osaka", "오사카", "간사이", "일본",
+    "비행", "항공", "항공편", "항공권", "항공사", "편명", "탑승", "게이트",
+    "출발", "도착", "환승", "경유", "수하물", "예약번호", "pnr",
+    "flight", "airline", "booking", "ticket", "boarding", "gate", "itinerary",
+    "여행", "여정", "숙소", "호텔", "렌터카", "투어",
+)
+TRAVEL_ROUTER_REGEX = (
+    re.compile(r"\b(kix|itm|nrt|hnd|icn|gmp)\b", re.IGNORECASE),
+    re.compile(r"\b(e-?ticket|eticket)\b", re.IGNORECASE),
+)
+CALENDAR_ONLY_HINTS = (
+    "캘린더", "calendar", "일정", "스케줄", "회의", "미팅", "약속",
+    "오늘 일정", "내일 일정", "이번 주 일정", "주간 일정", "월간 일정",
+    "today schedule", "tomorrow schedule", "weekly schedule",
+)
+CALENDAR_FORCE_HINTS = (
+    "일정", "캘린더", "스케줄", "미팅", "회의", "약속",
+    "schedule", "calendar", "meeting", "appointment",
+)
+CALENDAR_CREATE_HINTS = (
+    "추가", "등록", "만들", "잡아", "예약", "생성",
+    "add", "create", "book", "set up", "schedule",
+)
+FLIGHT_HINTS = (
+    "flight", "airline", "ticket", "boarding", "gate", "pnr",
+    "비행", "항공", "항공편", "항공권", "항공사", "편명", "탑승", "게이트", "예약번호",
+)
+# Hotel/stay questions (answered from the travel logistics document)
+LODGING_HINTS = (
+    "hotel", "check-in", "check-out", "숙소", "호텔", "체크인", "체크아웃",
+)
+# Travel words that keep travel facts in the planner context for calendar questions
+TRAVEL_FACT_HINTS = (
+    "여행", "여정", "오사카", "간사이", "항공", "비행", "호텔", "숙소",
+    "flight", "airline", "ticket", "itinerary", "osaka",
+)
+# Keywords that indicate we need complex reasoning/summary
+ROUTER_COMPLEX_HINTS = ("회의록", "녹취록", "정리", "요약", "meeting notes", "transcript", "summary", "action items")
+MEETING_NOTES_HINTS = ("회의록", "녹취록", "meeting notes", "transcript", "action items")
+
+# One precompiled matcher over every hint table; each message is scanned once per turn
+keyword_matcher = KeywordMatcher(
+    {
+        "travel": TRAVEL_ROUTER_HINTS,
+        "calendar_only": CALENDAR_ONLY_HINTS,
+        "calendar_force": CALENDAR_FORCE_HINTS,
+        "calendar_create": CALENDAR_CREATE_HINTS,
+        "flight": FLIGHT_HINTS,
+        "lodging": LODGING_HINTS,
+        "travel_fact": TRAVEL_FACT_HINTS,
+        "complex": ROUTER_COMPLEX_HINTS,
+        "meeting_notes": MEETING_NOTES_HINTS,
+    },
+    patterns={"travel": TRAVEL_ROUTER_REGEX},
+)
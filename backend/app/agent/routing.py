@@ -0,0 +1,81 @@
+import logging
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RouteDecision:
+    """A routing outcome and where it came from (rule name, 'llm' or 'llm_fallback')."""
+    mode: str
+    confidence: float
+    source: str
+
+
+@dataclass(frozen=True)
+class RoutingRule:
+    """
+    Deterministic routing rule.
+    `score` returns a confidence in [0, 1] that `mode` is the right route for the message.
+    """
+    name: str
+    mode: str
+    score: Callable[[str], float]
+
+
+class FastPathRouter:
+    """
+    Runs cheap routing rules before the LLM router.
+    The best-scoring rule wins if it clears `threshold`; otherwise the caller falls back to the LLM.
+    Every decision (rule or LLM) is recorded in a histogram so skipped LLM calls can be measured.
+    """
+    def __init__(self, rules: Iterable[RoutingRule], threshold: float = 0.85, log_every: int = 50):
+        self.rules = list(rules)
+        self.threshold = threshold
+        self.log_every = log_every
+        self._histogram: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def classify(self, message: str) -> Optional[RouteDecision]:
+        """Returns the winning rule decision, or None when the LLM router is needed."""
+        if not message:
+            return None
+        best: Optional[RouteDecision] = None
+        for rule in self.rules:
+            try:
+                confidence = rule.score(message)
+            except Exception as e:
+                logger.warning(f"Routing rule '{rule.name}' failed: {e}")
+                continue
+            if confidence >= self.threshold and (best is None or confidence > best.confidence):
+                best = RouteDecision(mode=rule.mode, confidence=confidence, source=rule.name)
+        return best
+
+    def record(self, decision: RouteDecision):
+        """Adds a decision to the routing histogram and periodically logs it."""
+        with self._lock:
+            self._histogram[(decision.source, decision.mode)] += 1
+            total = sum(self._histogram.values())
+        if self.log_every and total % self.log_every == 0:
+            logger.info(f"Routing histogram: {self._format(self.snapshot())}")
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            histogram = dict(self._histogram)
+        total = sum(histogram.values())
+        llm_calls = sum(count for (source, _), count in histogram.items() if source.startswith("llm"))
+        return {
+            "total": total,
+            "llm_router_calls": llm_calls,
+            "llm_router_calls_avoided": total - llm_calls,
+            "decisions": {f"{source}:{mode}": count for (source, mode), count in sorted(histogram.items())},
+        }
+
+    @staticmethod
+    def _format(snapshot: Dict[str, object]) -> str:
+        total = snapshot["total"] or 1
+        avoided = snapshot["llm_router_calls_avoided"]
+        return f"{avoided}/{snapshot['total']} LLM router calls avoided ({avoided / total:.0%}) {snapshot['decisions']}"
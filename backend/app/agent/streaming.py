@@ -0,0 +1,152 @@
+import re
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Graph nodes whose transitions are reported to the client
+GRAPH_NODES = ("router", "planner", "executor", "tools")
+# Only the planner's generations are user-facing text
+TOKEN_NODE = "planner"
+
+_FIELD_START_RE = re.compile(r'"assistant_message"\s*:\s*"')
+_HEX = set("0123456789abcdefABCDEF")
+
+
+class AssistantMessageExtractor:
+    """
+    Incrementally pulls the `assistant_message` string out of a streamed JSON object.
+    If the model is not producing JSON (e.g. plain-text summaries), chunks are passed through as-is.
+    """
+    def __init__(self):
+        self._mode: Optional[str] = None  # "json" | "text"
+        self._state = "seek"              # "seek" -> "string" -> "done"
+        self._buffer = ""
+        self._escape = ""
+
+    def feed(self, chunk: str) -> str:
+        """Consumes a raw model chunk and returns newly decoded message text (may be empty)."""
+        if not chunk:
+            return ""
+        if self._mode is None:
+            stripped = (self._buffer + chunk).lstrip()
+            if not stripped:
+                self._buffer += chunk
+                return ""
+            self._mode = "json" if stripped[0] in "{`" else "text"
+            chunk = self._buffer + chunk
+            self._buffer = ""
+            if self._mode == "text":
+                return chunk
+
+        if self._mode == "text":
+            return chunk
+        if self._state == "done":
+            return ""
+        if self._state == "seek":
+            self._buffer += chunk
+            match = _FIELD_START_RE.search(self._buffer)
+            if not match:
+                return ""
+            chunk = self._buffer[match.end():]
+            self._buffer = ""
+            self._state = "string"
+        return self._decode(chunk)
+
+    def _decode(self, text: str) -> str:
+        out = []
+        for ch in text:
+            if self._escape:
+                self._escape += ch
+                decoded = self._flush_escape()
+                if decoded is not None:
+                    out.append(decoded)
+                continue
+            if ch == "\\":
+                self._escape = ch
+            elif ch == '"':
+                self._state = "done"
+                break
+            else:
+                out.append(ch)
+        return "".join(out)
+
+    def _flush_escape(self) -> Optional[str]:
+        """Returns the decoded escape once complete, None while more characters are needed."""
+        esc = self._escape
+        if len(esc) < 2:
+            return None
+        if esc[1] != "u":
+            self._escape = ""
+            try:
+                return json.loads(f'"{esc}"')
+            except ValueError:
+                return esc[1]
+        if len(esc) < 6:
+            return None
+        if any(c not in _HEX for c in esc[2:6]):
+            self._escape = ""
+            return ""
+        code = int(esc[2:6], 16)
+        # High surrogate: wait for the paired low surrogate (\uXXXX\uXXXX)
+        if 0xD800 <= code <= 0xDBFF and len(esc) < 12:
+            return None
+        self._escape = ""
+        try:
+            return json.loads(f'"{esc}"')
+        except ValueError:
+            return ""
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Formats a single server-sent event frame."""
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+async def stream_chat_events(graph, inputs: Dict[str, Any], config: Dict[str, Any]) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Translates LangGraph `astream_events` into client-facing (event, data) pairs:
+      - ("node",  {"node", "status"})       node transitions
+      - ("tool",  {"name", "status", ...})  tool call notices
+      - ("token", {"text"})                 planner assistant_message deltas
+      - ("reset", {"reason"})               discard the streamed text: a later planner LLM run
+                                            (JSON repair, fallback retry, next planner pass) follows
+      - ("final", state)                    final graph state (not meant to be forwarded)
+    """
+    extractors: Dict[str, AssistantMessageExtractor] = {}
+    # LLM run whose text the client is currently showing; only the last run's text matches `done`
+    streaming_run: Optional[str] = None
+
+    async for ev in graph.astream_events(inputs, config=config, version="v2"):
+        kind = ev.get("event")
+        name = ev.get("name")
+        metadata = ev.get("metadata") or {}
+        node = metadata.get("langgraph_node")
+
+        if kind in ("on_chain_start", "on_chain_end"):
+            if not ev.get("parent_ids") and kind == "on_chain_end":
+                yield "final", (ev.get("data") or {}).get("output")
+            elif name in GRAPH_NODES and node == name:
+                yield "node", {"node": name, "status": "start" if kind == "on_chain_start" else "end"}
+
+        elif kind == "on_tool_start":
+            yield "tool", {"name": name, "status": "start", "args": (ev.get("data") or {}).get("input")}
+
+        elif kind == "on_tool_end":
+            yield "tool", {"name": name, "status": "end"}
+
+        elif kind == "on_chat_model_stream" and node == TOKEN_NODE:
+            chunk = (ev.get("data") or {}).get("chunk")
+            content = getattr(chunk, "content", "")
+            if not isinstance(content, str) or not content:
+                continue
+            run_id = ev.get("run_id", "")
+            extractor = extractors.setdefault(run_id, AssistantMessageExtractor())
+            text = extractor.feed(content)
+            if text:
+                if streaming_run is not None and run_id != streaming_run:
+                    yield "reset", {"reason": "planner_rerun"}
+                streaming_run = run_id
+                yield "token", {"text": text}
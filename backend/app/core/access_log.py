@@ -0,0 +1,89 @@
+import time
+import random
+import logging
+
+logger = logging.getLogger("app.access")
+
+
+class _BodyTap:
+    """Counts bytes flowing through and keeps at most `limit` of them for logging."""
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.size = 0
+        self.sample = bytearray()
+
+    def feed(self, chunk: bytes):
+        if not chunk:
+            return
+        self.size += len(chunk)
+        room = self.limit - len(self.sample)
+        if room > 0:
+            self.sample += chunk[:room]
+
+    def preview(self) -> str:
+        text = bytes(self.sample).decode("utf-8", errors="replace")
+        if self.size > len(self.sample):
+            text += f"...(truncated, {self.size} bytes total)"
+        return text
+
+
+class AccessLogMiddleware:
+    """
+    Pure-ASGI request/response logger.
+    Messages are passed through untouched (streaming responses keep streaming);
+    only sizes, timings and, for a sampled fraction of requests, the first
+    `max_body_bytes` of each body are recorded.
+    """
+    def __init__(self, app, body_sample_rate: float = 0.0, max_body_bytes: int = 2048):
+        self.app = app
+        self.body_sample_rate = body_sample_rate
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        method = scope.get("method", "")
+        path = scope.get("path", "")
+        sampled = self.body_sample_rate > 0 and random.random() < self.body_sample_rate
+        limit = self.max_body_bytes if sampled else 0
+        request_tap = _BodyTap(limit)
+        response_tap = _BodyTap(limit)
+        state = {"status": None, "ttfb": None}
+
+        logger.info(f">>> REQUEST: {method} {path}")
+
+        async def receive_wrapper():
+            message = await receive()
+            if message["type"] == "http.request":
+                request_tap.feed(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+                state["ttfb"] = time.perf_counter() - start
+            elif message["type"] == "http.response.body":
+                response_tap.feed(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        except Exception:
+            state["status"] = state["status"] or 500
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            ttfb = state["ttfb"] if state["ttfb"] is not None else duration
+            line = (
+                f"<<< RESPONSE: {state['status']} {method} {path} "
+                f"({duration:.2f}s, ttfb {ttfb:.2f}s) req={request_tap.size}B resp={response_tap.size}B"
+            )
+            if sampled:
+                if request_tap.size:
+                    line += f" Request Body: {request_tap.preview()}"
+                if response_tap.size:
+                    line += f" Response Body: {response_tap.preview()}"
+            logger.info(line)
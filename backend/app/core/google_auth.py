@@ -1,8 +1,12 @@
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
+from datetime import datetime, timedelta, timezone
+import httplib2
 import os
-import json
+import tempfile
+import threading
 
 # Robust path resolution
 CORE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -13,52 +17,151 @@ TOKEN_FILE = os.path.join(BACKEND_ROOT, "token.json")
 CREDENTIALS_FILE = os.path.join(BACKEND_ROOT, "credentials.json")
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
 
-def get_credentials():
-    """
-    Retrieves the Google OAuth credentials.
-    Refresh if expired.
-    """
+# Refresh this long before the access token actually expires
+REFRESH_MARGIN = timedelta(minutes=5)
+HTTP_TIMEOUT_SECONDS = 30
+# Calendar API accepts at most 50 calls per batch request
+BATCH_LIMIT = 50
+
+# Process-wide credential cache. Bumping the generation makes every thread rebuild its service.
+_creds_lock = threading.Lock()
+_UNLOADED = object()
+_creds = None
+_token_mtime = _UNLOADED  # mtime of the token.json `_creds` was loaded from
+_auth_generation = 0
+# googleapiclient/httplib2 objects are not thread-safe, so each worker thread keeps its own
+# service (and keep-alive connection) built on the shared credentials.
+_local = threading.local()
+
+
+def _token_file_mtime():
+    try:
+        return os.path.getmtime(TOKEN_FILE)
+    except OSError:
+        return None
+
+
+def _needs_refresh(creds) -> bool:
+    if not creds.token or creds.expiry is None:
+        return not creds.valid
+    # google-auth keeps `expiry` as naive UTC
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return now >= creds.expiry - REFRESH_MARGIN
+
+
+def _write_token(creds):
+    """Writes token.json atomically so a concurrent reader never sees a partial file."""
+    global _token_mtime
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(TOKEN_FILE), prefix=".token.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as token:
+            token.write(creds.to_json())
+        os.replace(tmp_path, TOKEN_FILE)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _token_mtime = _token_file_mtime()
+
+
+def _load_credentials():
+    global _creds, _token_mtime, _auth_generation
+    mtime = _token_file_mtime()
+    if mtime == _token_mtime:
+        return _creds
     creds = None
-    if os.path.exists(TOKEN_FILE):
+    if mtime is not None:
         try:
             creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
         except Exception as e:
             print(f"Error loading token.json: {e}")
-            
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
+    # token.json is new or was rewritten (e.g. by scripts/reauth.py)
+    _creds = creds
+    _token_mtime = mtime
+    _auth_generation += 1
+    return creds
+
+
+def get_credentials():
+    """
+    Retrieves the Google OAuth credentials.
+    Cached in-process; refreshed only when close to expiry.
+    """
+    with _creds_lock:
+        creds = _load_credentials()
+        if creds and not _needs_refresh(creds):
+            return creds
+
+        if creds and creds.refresh_token:
             try:
                 creds.refresh(Request())
                 # Save the refreshed creds
-                with open(TOKEN_FILE, "w") as token:
-                    token.write(creds.to_json())
+                _write_token(creds)
             except Exception as e:
                 if "invalid_grant" in str(e):
                     print("CRITICAL: Google Token is invalid (invalid_grant).")
                     print("ACTION REQUIRED: Run 'python scripts/reauth.py' to refresh your authentication.")
                 else:
                     print(f"Error refreshing token: {e}")
-                return None
-        else:
-            # We assume token.json is provided for now as per instructions.
-            print("No valid token.json found and cannot refresh.")
-            print("ACTION REQUIRED: Run 'python scripts/reauth.py' to generate a new token.")
-            return None
-            
-    return creds
+                # Still usable until it actually expires
+                return creds if creds.valid else None
+            return creds
+
+        # We assume token.json is provided for now as per instructions.
+        print("No valid token.json found and cannot refresh.")
+        print("ACTION REQUIRED: Run 'python scripts/reauth.py' to generate a new token.")
+        return None
+
+
+def get_auth_generation() -> int:
+    """Changes whenever a different token is loaded; lets caches keyed on the account invalidate."""
+    return _auth_generation
+
+
+def invalidate_calendar_service():
+    """Drops cached credentials and services; the next call reloads token.json."""
+    global _creds, _token_mtime, _auth_generation
+    with _creds_lock:
+        _creds = None
+        _token_mtime = _UNLOADED
+        _auth_generation += 1
+
 
 def get_calendar_service():
     """
     Returns an authenticated Google Calendar Service resource.
+    The resource and its keep-alive HTTP connection are reused per thread.
     """
     creds = get_credentials()
     if not creds:
         return None
-    
+
+    generation = _auth_generation
+    cached = getattr(_local, "service", None)
+    if cached is not None and cached[0] == generation:
+        return cached[1]
+
     try:
+        http = AuthorizedHttp(creds, http=httplib2.Http(timeout=HTTP_TIMEOUT_SECONDS))
         # cache_discovery=False suppresses the 'file_cache is only supported with oauth2client<4.0.0' warning
-        service = build("calendar", "v3", credentials=creds, cache_discovery=False)
+        service = build("calendar", "v3", http=http, cache_discovery=False)
+        _local.service = (generation, service)
         return service
     except Exception as e:
         print(f"Error building service: {e}")
         return None
+
+
+def execute_batch(service, requests):
+    """Runs (request_id, HttpRequest) pairs as batch HTTP requests -> {request_id: (response, exception)}."""
+    results = {}
+
+    def _callback(request_id, response, exception):
+        results[request_id] = (response, exception)
+
+    for offset in range(0, len(requests), BATCH_LIMIT):
+        batch = service.new_batch_http_request(callback=_callback)
+        for request_id, request in requests[offset:offset + BATCH_LIMIT]:
+            batch.add(request, request_id=request_id)
+        batch.execute()
+    return results
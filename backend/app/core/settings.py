@@ -22,6 +22,9 @@ class Settings(BaseSettings):
     LLM_MODEL_EXECUTOR: str | None = None
     
     LLM_KEEP_ALIVE: str = "5m" # Default to 5 minutes if not in .env
+
+    # Rule-based routes at or above this confidence skip the LLM router
+    ROUTER_FAST_PATH_THRESHOLD: float = 0.85
     
     @model_validator(mode='after')
     def set_model_defaults(self) -> Self:
@@ -37,6 +40,38 @@ class Settings(BaseSettings):
     # App
     PROJECT_NAME: str = "AI Assistant Agent"
     CHECKPOINT_DB_PATH: str = "data/checkpoints.db"
+    CHECKPOINT_BUSY_TIMEOUT_MS: int = 5000
+
+    # A resubmitted chat message_id within this window reuses the first result (identical text never does)
+    CHAT_COALESCE_WINDOW_SECONDS: float = 10.0
+
+    # Access log - fraction of requests whose bodies are logged, and how much of each body
+    ACCESS_LOG_BODY_SAMPLE_RATE: float = 1.0
+    ACCESS_LOG_BODY_MAX_BYTES: int = 2048
+
+    # Writable calendar list is reused for this long before being revalidated (ETag)
+    CALENDAR_LIST_TTL_SECONDS: float = 600.0
+    # Max calendars queried in parallel by list_events
+    CALENDAR_FETCH_CONCURRENCY: int = 8
+    # Local event mirror (syncToken incremental sync); reads older than the interval trigger a sync
+    CALENDAR_MIRROR_ENABLED: bool = True
+    CALENDAR_SYNC_INTERVAL_SECONDS: float = 60.0
+    CALENDAR_SYNC_PAST_DAYS: int = 90
+    # Post-insert verification: 'trust' (insert response only), 'async' (background re-read), 'sync'
+    CALENDAR_VERIFY_MODE: str = "async"
+    CALENDAR_VERIFY_DELAY_SECONDS: float = 5.0
+    # Max time a travel search waits for the background index warm-up
+    TRAVEL_INDEX_WAIT_SECONDS: float = 30.0
+    # User profile updates are coalesced in memory and written at most this often
+    MEMORY_PROFILE_FLUSH_DELAY_SECONDS: float = 2.0
+    # Session transcripts: 'sqlite' (indexed table) or 'jsonl' (per-thread append log, compacted when
+    # superseded lines exceed the live ones and SESSION_LOG_COMPACT_MIN_LINES)
+    SESSION_STORE_BACKEND: str = "sqlite"
+    SESSION_LOG_COMPACT_MIN_LINES: int = 200
+    # Memory analysis queue: a thread is analyzed once it has been quiet for the debounce window
+    MEMORY_ANALYSIS_DEBOUNCE_SECONDS: float = 30.0
+    MEMORY_ANALYSIS_MAX_PENDING: int = 100
+    MEMORY_ANALYSIS_MAX_ATTEMPTS: int = 3
     
     model_config = ConfigDict( # Use model_config instead of Config class
         env_file = (".env", "backend/.env"),
@@ -1,17 +1,13 @@
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.responses import Response
-from fastapi.responses import JSONResponse
-import time
-import json
+from fastapi.responses import JSONResponse, StreamingResponse
 import asyncio
 from contextlib import asynccontextmanager
 from app.core.settings import settings
 from app.core.logging import setup_logging
+from app.core.access_log import AccessLogMiddleware
 import logging
 from langchain_core.messages import HumanMessage
-import aiosqlite
-from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 
 # Setup Logging
 setup_logging()
@@ -22,12 +18,27 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     logger.info("Application starting up...")
     from app.agent.llm import init_models
+    from app.agent.graph import get_graph, clear_graph_cache
     from app.services.travel import travel_knowledge_service
+    from app.services.checkpointer import checkpointer_service
     import threading
     # Run priming in a separate thread to not block startup
     threading.Thread(target=init_models).start()
+
+    # Long-lived checkpointer; the graph is compiled once against it and reused by every request
+    app.state.checkpointer = await checkpointer_service.start()
+    get_graph(checkpointer=app.state.checkpointer)
+    # Load/sync the travel index in the background; only travel searches wait for it
+    travel_knowledge_service.warm_up()
+    from app.services.analysis_queue import analysis_queue
+    await analysis_queue.start()
     yield
     logger.info("Application shutting down...")
+    await analysis_queue.stop()
+    from app.services.memory import memory_service
+    memory_service.flush()
+    clear_graph_cache()
+    await checkpointer_service.stop()
 
 app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
 
@@ -48,47 +59,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Request/Response Logging Middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    
-    # Read request body
-    body = await request.body()
-    # Replace body in request so it can be read again by the actual route
-    async def receive():
-        return {"type": "http.request", "body": body}
-    request._receive = receive
-
-    # Log request
-    try:
-        if body:
-            parsed_body = json.loads(body)
-            logger.info(f">>> REQUEST: {request.method} {request.url.path} Body: {json.dumps(parsed_body, ensure_ascii=False)}")
-        else:
-            logger.info(f">>> REQUEST: {request.method} {request.url.path} (No Body)")
-    except Exception:
-        logger.info(f">>> REQUEST: {request.method} {request.url.path} (Body Binary/Raw: {len(body)} bytes)")
-
-    response = await call_next(request)
-    
-    # Capture response body
-    response_body = b""
-    async for chunk in response.body_iterator:
-        response_body += chunk
-    
-    # Log response
-    duration = time.time() - start_time
-    try:
-        if response_body:
-            parsed_res = json.loads(response_body)
-            logger.info(f"<<< RESPONSE: {response.status_code} ({duration:.2f}s) Body: {json.dumps(parsed_res, ensure_ascii=False)}")
-        else:
-            logger.info(f"<<< RESPONSE: {response.status_code} ({duration:.2f}s) (No Body)")
-    except Exception:
-        logger.info(f"<<< RESPONSE: {response.status_code} ({duration:.2f}s) (Body Binary/Raw: {len(response_body)} bytes)")
-
-    return Response(content=response_body, status_code=response.status_code, headers=dict(response.headers), media_type=response.media_type)
+# Request/Response Logging Middleware (pure ASGI, never buffers bodies)
+app.add_middleware(
+    AccessLogMiddleware,
+    body_sample_rate=settings.ACCESS_LOG_BODY_SAMPLE_RATE,
+    max_body_bytes=settings.ACCESS_LOG_BODY_MAX_BYTES,
+)
 
 @app.get("/")
 def read_root():
@@ -101,6 +77,14 @@ def health():
 @app.get("/status")
 def status():
     from app.agent.llm import provider_health
+    from app.agent.graph import fast_path_router
+    from app.services.turn_coordinator import turn_coordinator
+    from app.services.calendar_cache import calendar_list_cache
+    from app.services.event_store import event_store
+    from app.services.registration_verifier import registration_verifier
+    from app.services.travel import travel_knowledge_service
+    from app.services.memory import memory_service, memory_analyzer
+    from app.services.analysis_queue import analysis_queue
     health = provider_health()
 
     return {
@@ -111,18 +95,23 @@ def status():
         "llm_connected": health.ok,
         "llm_details": health.details,
         "google_api_configured": bool(settings.GOOGLE_API_KEY),
+        "chat_turns": turn_coordinator.snapshot(),
+        "router": fast_path_router.snapshot(),
+        "calendar_list_cache": calendar_list_cache.stats(),
+        "calendar_mirror": event_store.stats(),
+        "calendar_verification": registration_verifier.stats(),
+        "travel_knowledge": travel_knowledge_service.status(),
+        "sessions": memory_service.sessions.stats(),
+        "memory_analysis": analysis_queue.snapshot(),
+        "memory_analyzer": memory_analyzer.stats(),
         "version": "debug-1-check"
     }
 
-@app.post("/api/chat")
-async def chat(body: dict):
-    """
-    Chat endpoint for the Flutter app.
-    Request body: { "messages": [ ... ] } or { "message": "user input" }
-    """
-    from app.agent.graph import get_graph
-    
-    # Normalize input
+# Increase to 5 minutes to accommodate larger models/complex tasks
+CHAT_TIMEOUT_SECONDS = 300
+
+def _prepare_turn(body: dict):
+    """Normalizes a chat request body into (user_input, thread_id, graph inputs)."""
     user_input = body.get("message")
     mode = body.get("mode", "plan")
     thread_id = body.get("thread_id") # Get thread_id from client
@@ -133,53 +122,80 @@ async def chat(body: dict):
         thread_id = str(uuid.uuid4())
         logger.info(f"Generated new thread_id: {thread_id}")
 
-    if user_input:
-        inputs = {"messages": [HumanMessage(content=user_input)], "mode": mode, "needs_confirmation": False}
-    else:
+    if not user_input:
         # Should handle list of messages format too if needed
+        return user_input, thread_id, None
+    inputs = {"messages": [HumanMessage(content=user_input)], "mode": mode, "needs_confirmation": False}
+    return user_input, thread_id, inputs
+
+async def _complete_turn(thread_id: str, final_state: dict) -> dict:
+    """Persists the finished turn and builds the client response payload."""
+    # Extract the last AI message
+    ai_message = final_state["messages"][-1]
+    mode = final_state.get("mode", "plan")
+    needs_confirmation = final_state.get("needs_confirmation", False)
+
+    logger.info(f"Graph execution complete. Model Result -> Mode: {mode}, ConfReq: {needs_confirmation}")
+
+    if thread_id:
+        from app.services.memory import memory_service
+        from app.services.analysis_queue import analysis_queue
+        await asyncio.to_thread(memory_service.save_session, thread_id, final_state["messages"])
+        # Analyzed later from the saved transcript, once the thread goes quiet and no turn is running
+        analysis_queue.submit(thread_id)
+
+    # Premature unloading removed. Model will stay in memory based on LLM_KEEP_ALIVE setting.
+
+    return {
+        "response": ai_message.content,
+        "mode": mode,
+        "needs_confirmation": needs_confirmation,
+        "thread_id": thread_id,
+        "confirmation_id": final_state.get("confirmation_id")
+    }
+
+@app.post("/api/chat")
+async def chat(body: dict):
+    """
+    Chat endpoint for the Flutter app.
+    Request body: { "messages": [ ... ] } or { "message": "user input" }, optionally with "message_id"
+    """
+    from app.services.turn_coordinator import turn_coordinator
+
+    user_input, thread_id, inputs = _prepare_turn(body)
+    if inputs is None:
         return {"error": "Invalid input format. Expected 'message' field."}
-        
+
+    # One turn per thread at a time; duplicate submissions share the running turn.
+    # A client retry carrying the same message_id gets the finished result instead of a rerun.
+    return await turn_coordinator.run(
+        thread_id,
+        user_input,
+        lambda: _run_chat_turn(user_input, thread_id, inputs),
+        should_cache=lambda result: "error" not in result,
+        message_id=body.get("message_id"),
+    )
+
+async def _run_chat_turn(user_input: str, thread_id: str, inputs: dict) -> dict:
+    """Runs one graph turn with timeout and a single retry."""
+    from app.agent.graph import get_graph
+
     MAX_RETRIES = 1
-    timeout_seconds = 300 # Increase to 5 minutes to accommodate larger models/complex tasks
+    timeout_seconds = CHAT_TIMEOUT_SECONDS
     
     for attempt in range(MAX_RETRIES + 1):
         try:
             config = {"configurable": {"thread_id": thread_id}}
             logger.info(f"Invoking graph for thread_id={thread_id} (Attempt {attempt+1}). Message: {user_input[:100]}...")
             
-            async with aiosqlite.connect("./checkpoints.db") as conn:
-                if not hasattr(conn, "is_alive"):
-                    conn.is_alive = lambda: True
-                checkpointer = AsyncSqliteSaver(conn)
-                graph = get_graph(checkpointer=checkpointer)
-                
-                # Use wait_for to implement the timeout
-                final_state = await asyncio.wait_for(
-                    graph.ainvoke(inputs, config=config),
-                    timeout=timeout_seconds
-                )
-            
-            # Extract the last AI message
-            ai_message = final_state["messages"][-1]
-            mode = final_state.get("mode", "plan")
-            needs_confirmation = final_state.get("needs_confirmation", False)
-            
-            logger.info(f"Graph execution complete. Model Result -> Mode: {mode}, ConfReq: {needs_confirmation}")
-            
-            if thread_id:
-                from app.services.memory import memory_service, memory_analyzer
-                memory_service.save_session(thread_id, final_state["messages"])
-                asyncio.create_task(memory_analyzer.analyze_and_update(final_state["messages"]))
-
-            # Premature unloading removed. Model will stay in memory based on LLM_KEEP_ALIVE setting.
-
-            return {
-                "response": ai_message.content,
-                "mode": mode,
-                "needs_confirmation": needs_confirmation,
-                "thread_id": thread_id,
-                "confirmation_id": final_state.get("confirmation_id")
-            }
+            graph = get_graph(checkpointer=app.state.checkpointer)
+
+            # Use wait_for to implement the timeout
+            final_state = await asyncio.wait_for(
+                graph.ainvoke(inputs, config=config),
+                timeout=timeout_seconds
+            )
+            return await _complete_turn(thread_id, final_state)
             
         except asyncio.TimeoutError:
             logger.error(f"Graph execution TIMED OUT after {timeout_seconds}s (Attempt {attempt+1})")
@@ -202,6 +218,71 @@ async def chat(body: dict):
                 continue
             return {"error": str(e)}
 
+@app.post("/api/chat/stream")
+async def chat_stream(body: dict):
+    """
+    Server-sent-events variant of /api/chat.
+    Emits `start` (and `queued` if another turn of the thread is running), then
+    `node` / `tool` / `token` events while the graph runs (`reset` = drop the tokens streamed so far,
+    a later planner run replaces them),
+    and finally `done` with the same payload /api/chat returns (or `error`).
+    """
+    from app.agent.graph import get_graph
+    from app.agent.streaming import stream_chat_events, format_sse
+    from app.services.turn_coordinator import turn_coordinator
+
+    user_input, thread_id, inputs = _prepare_turn(body)
+    if inputs is None:
+        return {"error": "Invalid input format. Expected 'message' field."}
+
+    config = {"configurable": {"thread_id": thread_id}}
+    graph = get_graph(checkpointer=app.state.checkpointer)
+
+    async def event_source():
+        yield format_sse("start", {"thread_id": thread_id})
+        queued_behind = turn_coordinator.queue_depth(thread_id)
+        if queued_behind:
+            yield format_sse("queued", {"thread_id": thread_id, "position": queued_behind})
+        try:
+            async with turn_coordinator.turn(thread_id):
+                logger.info(f"Streaming graph for thread_id={thread_id}. Message: {user_input[:100]}...")
+                final_state = None
+                async with asyncio.timeout(CHAT_TIMEOUT_SECONDS):
+                    async for event, data in stream_chat_events(graph, inputs, config):
+                        if event == "final":
+                            final_state = data
+                            continue
+                        yield format_sse(event, data)
+                if not isinstance(final_state, dict) or not final_state.get("messages"):
+                    final_state = (await graph.aget_state(config)).values
+                payload = await _complete_turn(thread_id, final_state)
+            yield format_sse("done", payload)
+        except TimeoutError:
+            logger.error(f"Streaming graph execution TIMED OUT after {CHAT_TIMEOUT_SECONDS}s")
+            yield format_sse("error", {"error": "Response took too long. Please try again with a shorter request.", "thread_id": thread_id})
+        except Exception as e:
+            logger.exception(f"Streaming graph execution failed for thread_id={thread_id}")
+            yield format_sse("error", {"error": str(e), "thread_id": thread_id})
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.post("/api/calendars/refresh")
+async def refresh_calendars():
+    """
+    Drops the cached calendar list and fetches it again (e.g. after adding a calendar in Google).
+    """
+    from app.core.google_auth import get_calendar_service
+    from app.services.calendar_cache import calendar_list_cache
+    service = await asyncio.to_thread(get_calendar_service)
+    if not service:
+        return JSONResponse(status_code=503, content={"status": "error", "message": "Google Calendar 인증에 실패했습니다."})
+    calendars = await asyncio.to_thread(calendar_list_cache.refresh, service)
+    return {"status": "success", "calendars": calendars}
+
 @app.post("/api/unload")
 async def unload_model():
     """
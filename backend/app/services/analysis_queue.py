@@ -0,0 +1,201 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import tempfile
+from typing import Any, Callable, Dict, Optional
+from app.core.settings import settings
+from app.services.memory import memory_service, memory_analyzer
+from app.services.turn_coordinator import turn_coordinator
+
+logger = logging.getLogger(__name__)
+
+QUEUE_PATH = os.path.join(os.getcwd(), "data", "analysis_queue.json")
+
+
+class AnalysisQueue:
+    """
+    Background queue for MemoryAnalyzer runs.
+    - Debounced per thread: a thread has at most one pending job, pushed back on every new turn
+      (up to `max_wait` after its first submission); the worker analyzes the thread's latest
+      persisted transcript, so only the newest snapshot is ever sent to the LLM.
+    - Bounded: when `max_pending` threads are waiting, the oldest job is dropped.
+    - Lower priority than chat: a single worker that waits while any chat turn is running.
+    - Failed runs are retried with exponential backoff; pending jobs are persisted to
+      `queue_path` and restored on startup.
+    """
+    def __init__(self, service=memory_service, analyzer=memory_analyzer, queue_path: str = QUEUE_PATH,
+                 debounce_seconds: float = 30.0, max_wait: Optional[float] = None, max_pending: int = 100,
+                 max_attempts: int = 3, retry_base_seconds: float = 30.0, idle_poll_seconds: float = 1.0,
+                 is_busy: Optional[Callable[[], bool]] = None):
+        self.service = service
+        self.analyzer = analyzer
+        self.queue_path = queue_path
+        self.debounce_seconds = debounce_seconds
+        self.max_wait = debounce_seconds * 10 if max_wait is None else max_wait
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.idle_poll_seconds = idle_poll_seconds
+        self.is_busy = is_busy or (lambda: turn_coordinator.active_turns > 0)
+        # thread_id -> {"first_enqueued", "due", "attempts"}; wall-clock times so they survive restarts
+        self._jobs: Dict[str, Dict[str, float]] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.running: Optional[str] = None
+        self.submitted = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.processed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.retries = 0
+        self.yielded = 0
+        self.last_lag_seconds: Optional[float] = None
+
+    def submit(self, thread_id: str):
+        """Schedules (or pushes back) the analysis of `thread_id`. Call from the event loop."""
+        now = time.time()
+        self.submitted += 1
+        job = self._jobs.pop(thread_id, None)
+        if job is not None:
+            self.coalesced += 1
+            job["due"] = min(now + self.debounce_seconds, job["first_enqueued"] + self.max_wait)
+            job["attempts"] = 0
+        else:
+            job = {"first_enqueued": now, "due": now + self.debounce_seconds, "attempts": 0}
+            while len(self._jobs) >= self.max_pending:
+                oldest = min(self._jobs, key=lambda t: self._jobs[t]["first_enqueued"])
+                del self._jobs[oldest]
+                self.dropped += 1
+                logger.warning(f"Analysis queue full ({self.max_pending}); dropped pending job for {oldest}")
+        self._jobs[thread_id] = job
+        self._persist()
+        self._ensure_worker()
+
+    async def start(self):
+        """Restores persisted jobs and starts the worker."""
+        try:
+            with open(self.queue_path, "r", encoding="utf-8") as f:
+                restored = json.load(f)
+        except FileNotFoundError:
+            restored = {}
+        except Exception as e:
+            logger.error(f"Failed to restore analysis queue: {e}")
+            restored = {}
+        for thread_id, job in restored.items():
+            self._jobs.setdefault(thread_id, job)
+        if restored:
+            logger.info(f"Restored {len(restored)} pending memory analysis jobs")
+        self._ensure_worker()
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        self._persist()
+
+    def _ensure_worker(self):
+        if self._worker is not None and not self._worker.done():
+            self._wakeup.set()
+            return
+        self._wakeup = asyncio.Event()
+        self._worker = asyncio.create_task(self._run())
+
+    def _persist(self):
+        """Atomic write of the pending jobs (temp file + rename)."""
+        try:
+            os.makedirs(os.path.dirname(self.queue_path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.queue_path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._jobs, f)
+            os.replace(tmp_path, self.queue_path)
+        except Exception as e:
+            logger.error(f"Failed to persist analysis queue: {e}")
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            if not self._jobs:
+                await self._wakeup.wait()
+                continue
+            thread_id = min(self._jobs, key=lambda t: self._jobs[t]["due"])
+            delay = self._jobs[thread_id]["due"] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            if self.is_busy():
+                # Yield the LLM to interactive turns
+                self.yielded += 1
+                await asyncio.sleep(self.idle_poll_seconds)
+                continue
+            await self._process(thread_id)
+
+    async def _process(self, thread_id: str):
+        job = self._jobs.pop(thread_id)
+        self.running = thread_id
+        skipped = False
+        try:
+            messages = await asyncio.to_thread(self.service.load_session, thread_id)
+            if messages:
+                ok = await self.analyzer.analyze_and_update(messages, thread_id=thread_id)
+            else:
+                # Nothing persisted for the thread: there is nothing to analyze, so no retry
+                ok = skipped = True
+        except Exception as e:
+            logger.error(f"Memory analysis for {thread_id} crashed: {e}")
+            ok = False
+        finally:
+            self.running = None
+
+        if skipped:
+            self.skipped += 1
+        elif ok:
+            self.processed += 1
+            self.last_lag_seconds = time.time() - job["first_enqueued"]
+        elif thread_id not in self._jobs:
+            # A newer submission supersedes the retry
+            job["attempts"] += 1
+            if job["attempts"] < self.max_attempts:
+                self.retries += 1
+                job["due"] = time.time() + self.retry_base_seconds * (2 ** (job["attempts"] - 1))
+                self._jobs[thread_id] = job
+            else:
+                self.failed += 1
+                logger.error(f"Memory analysis for {thread_id} failed {job['attempts']} times; giving up")
+        self._persist()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Queue metrics for the status endpoint."""
+        now = time.time()
+        oldest = min((job["first_enqueued"] for job in self._jobs.values()), default=None)
+        return {
+            "pending": len(self._jobs),
+            "running": self.running,
+            "oldest_lag_seconds": round(now - oldest, 1) if oldest is not None else 0.0,
+            "last_lag_seconds": round(self.last_lag_seconds, 1) if self.last_lag_seconds is not None else None,
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "processed": self.processed,
+            "skipped": self.skipped,
+            "retries": self.retries,
+            "failed": self.failed,
+            "yielded_to_chat": self.yielded,
+        }
+
+
+# Singleton instance
+analysis_queue = AnalysisQueue(
+    debounce_seconds=settings.MEMORY_ANALYSIS_DEBOUNCE_SECONDS,
+    max_pending=settings.MEMORY_ANALYSIS_MAX_PENDING,
+    max_attempts=settings.MEMORY_ANALYSIS_MAX_ATTEMPTS,
+)
@@ -0,0 +1,109 @@
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+from app.core.settings import settings
+from app.core.google_auth import get_auth_generation
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_FALLBACK = [{'id': 'primary', 'summary': 'Primary'}]
+
+
+def _writable_calendars(items: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """'owner' 또는 'writer' 권한이 있는 캘린더만 필터링"""
+    calendars = [
+        {'id': item['id'], 'summary': item.get('summary', 'No Title')}
+        for item in items
+        if item.get('accessRole') in ['owner', 'writer']
+    ]
+    # 관리 가능한 캘린더가 없으면 primary를 기본값으로 사용
+    return calendars or list(PRIMARY_FALLBACK)
+
+
+class CalendarListCache:
+    """
+    Caches the user's writable calendars (calendarList.list).
+    Entries expire after `ttl_seconds`; an expired entry is revalidated with its ETag,
+    so an unchanged list costs a 304 instead of a full payload. Switching Google accounts
+    (a new auth generation) drops the entry.
+    """
+    def __init__(self, ttl_seconds: float = 600.0):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._calendars: Optional[List[Dict[str, str]]] = None
+        self._etag: Optional[str] = None
+        self._fetched_at = 0.0
+        self._generation: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.errors = 0
+
+    def get(self, service, force_refresh: bool = False) -> List[Dict[str, str]]:
+        """Returns the cached calendar list, fetching it when missing, expired or forced."""
+        generation = get_auth_generation()
+        # Fetch under the lock so concurrent misses share a single request
+        with self._lock:
+            if self._generation != generation:
+                self._reset(generation)
+            fresh = time.monotonic() - self._fetched_at < self.ttl_seconds
+            if self._calendars is not None and fresh and not force_refresh:
+                self.hits += 1
+                return list(self._calendars)
+            self.misses += 1
+            return list(self._fetch(service))
+
+    def refresh(self, service) -> List[Dict[str, str]]:
+        """Forces a fetch (ignoring TTL and ETag)."""
+        self.invalidate()
+        return self.get(service, force_refresh=True)
+
+    def invalidate(self):
+        with self._lock:
+            self._reset(self._generation)
+
+    def _reset(self, generation: Optional[int]):
+        self._calendars = None
+        self._etag = None
+        self._fetched_at = 0.0
+        self._generation = generation
+
+    def _fetch(self, service) -> List[Dict[str, str]]:
+        request = service.calendarList().list(minAccessRole='reader')
+        if self._etag and self._calendars is not None:
+            request.headers['If-None-Match'] = self._etag
+        try:
+            calendar_list = request.execute()
+        except Exception as e:
+            if getattr(getattr(e, 'resp', None), 'status', None) == 304:
+                # Unchanged since the last fetch
+                self.revalidated += 1
+                self._fetched_at = time.monotonic()
+                return self._calendars
+            self.errors += 1
+            logger.error(f"[CALENDAR] 캘린더 목록 조회 실패: {e}")
+            # Serve the stale list if we have one; never cache the fallback
+            return self._calendars if self._calendars is not None else list(PRIMARY_FALLBACK)
+
+        self._calendars = _writable_calendars(calendar_list.get('items', []))
+        self._etag = calendar_list.get('etag')
+        self._fetched_at = time.monotonic()
+        return self._calendars
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the status endpoint."""
+        with self._lock:
+            cached = self._calendars is not None
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "errors": self.errors,
+                "cached_calendars": len(self._calendars) if cached else 0,
+                "age_seconds": round(time.monotonic() - self._fetched_at, 1) if cached else None,
+            }
+
+
+# Singleton instance
+calendar_list_cache = CalendarListCache(ttl_seconds=settings.CALENDAR_LIST_TTL_SECONDS)
@@ -0,0 +1,80 @@
+import os
+import logging
+from typing import Optional
+
+import aiosqlite
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Applied once when the connection is opened.
+# WAL lets readers proceed while a checkpoint is being written; synchronous=NORMAL
+# is durable under WAL except for the last transaction on power loss.
+CHECKPOINT_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",    # ~16MB page cache
+    "PRAGMA mmap_size=134217728",  # 128MB memory-mapped reads
+)
+
+class CheckpointerService:
+    """
+    Owns the LangGraph checkpoint database for the lifetime of the app.
+    A single aiosqlite connection is shared by all requests; AsyncSqliteSaver
+    guards it with its own asyncio.Lock, so checkpoint writes are serialized
+    in-process instead of contending for SQLite's file lock.
+    """
+    def __init__(self, db_path: str = settings.CHECKPOINT_DB_PATH):
+        self.db_path = db_path
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._saver: Optional[AsyncSqliteSaver] = None
+
+    @property
+    def saver(self) -> AsyncSqliteSaver:
+        if self._saver is None:
+            raise RuntimeError("Checkpointer has not been started.")
+        return self._saver
+
+    async def start(self) -> AsyncSqliteSaver:
+        """Opens the database, applies pragmas and prepares the checkpoint tables."""
+        if self._saver is not None:
+            return self._saver
+
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        conn = await aiosqlite.connect(self.db_path)
+        # AsyncSqliteSaver probes is_alive(), which newer aiosqlite releases no longer provide
+        if not hasattr(conn, "is_alive"):
+            conn.is_alive = lambda: True
+        await conn.execute(f"PRAGMA busy_timeout={int(settings.CHECKPOINT_BUSY_TIMEOUT_MS)}")
+        for pragma in CHECKPOINT_PRAGMAS:
+            await conn.execute(pragma)
+
+        saver = AsyncSqliteSaver(conn)
+        await saver.setup()
+
+        self._conn = conn
+        self._saver = saver
+        logger.info(f"Checkpointer opened at {self.db_path} (WAL)")
+        return saver
+
+    async def stop(self):
+        """Checkpoints the WAL and closes the shared connection."""
+        if self._conn is None:
+            return
+        try:
+            await self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except Exception as e:
+            logger.warning(f"WAL checkpoint on shutdown failed: {e}")
+        await self._conn.close()
+        self._conn = None
+        self._saver = None
+        logger.info("Checkpointer closed.")
+
+# Singleton instance
+checkpointer_service = CheckpointerService()
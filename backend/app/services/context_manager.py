@@ -34,6 +34,17 @@ class ContextManager:
                         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                     )
                 """)
+                # Post-insert verification outcomes, keyed by event so a result that lands
+                # before the recent_events row is inserted is not lost
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS event_verifications (
+                        calendar_id TEXT NOT NULL,
+                        event_id TEXT NOT NULL,
+                        status TEXT NOT NULL,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (calendar_id, event_id)
+                    )
+                """)
                 conn.commit()
         except Exception as e:
             logger.error(f"Failed to init Context DB: {e}")
@@ -52,6 +63,24 @@ class ContextManager:
         except Exception as e:
             logger.error(f"Failed to add event context: {e}")
 
+    def add_events(self, thread_id: str, events: List[Dict[str, Any]]):
+        """Records several created events in a single transaction."""
+        if not events:
+            return
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany("""
+                    INSERT INTO recent_events (thread_id, event_id, summary, calendar_id)
+                    VALUES (?, ?, ?, ?)
+                """, [
+                    (thread_id, e["event_id"], e.get("summary"), e.get("calendar_id", "primary"))
+                    for e in events
+                ])
+                conn.commit()
+            logger.debug(f"Saved {len(events)} event contexts for thread {thread_id}")
+        except Exception as e:
+            logger.error(f"Failed to add event contexts: {e}")
+
     def get_recent_events(self, thread_id: str, limit: int = 5) -> List[Dict[str, Any]]:
         """Retrieves the most recent events for a thread."""
         try:
@@ -59,10 +88,12 @@ class ContextManager:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
                 cursor.execute("""
-                    SELECT event_id, summary, calendar_id, created_at 
-                    FROM recent_events 
-                    WHERE thread_id = ? 
-                    ORDER BY id DESC 
+                    SELECT r.event_id, r.summary, r.calendar_id, r.created_at, v.status AS verification
+                    FROM recent_events r
+                    LEFT JOIN event_verifications v
+                        ON v.event_id = r.event_id AND v.calendar_id = COALESCE(r.calendar_id, 'primary')
+                    WHERE r.thread_id = ?
+                    ORDER BY r.id DESC
                     LIMIT ?
                 """, (thread_id, limit))
                 
@@ -72,5 +103,19 @@ class ContextManager:
             logger.error(f"Failed to get recent events: {e}")
             return []
 
+    def set_verification(self, event_id: str, status: str, calendar_id: Optional[str] = "primary"):
+        """Records the verification outcome of a created event ('verified', 'missing', 'failed')."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("""
+                    INSERT INTO event_verifications (calendar_id, event_id, status)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT (calendar_id, event_id)
+                    DO UPDATE SET status = excluded.status, updated_at = CURRENT_TIMESTAMP
+                """, (calendar_id or "primary", event_id, status))
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to record verification for {event_id}: {e}")
+
 # Singleton instance
 context_manager = ContextManager()
@@ -0,0 +1,124 @@
+import os
+import sqlite3
+import hashlib
+import logging
+import threading
+from array import array
+from typing import Dict, List, Optional, Sequence
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+DB_PATH = os.path.join(os.getcwd(), "data", "embedding_cache.db")
+
+# SQLite caps the number of bound parameters per statement
+_LOOKUP_CHUNK = 500
+
+
+def text_key(text: str) -> str:
+    """Content address of an (already prefixed) text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Persistent, content-addressed embedding store keyed by (model, sha256(text)).
+    Vectors are stored as float32 blobs, so a 768-d embedding costs ~3KB.
+    """
+    def __init__(self, db_path: str = DB_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._init_db()
+
+    def _init_db(self):
+        """Initialize the database schema."""
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS embeddings (
+                        model TEXT NOT NULL,
+                        text_hash TEXT NOT NULL,
+                        vector BLOB NOT NULL,
+                        PRIMARY KEY (model, text_hash)
+                    ) WITHOUT ROWID
+                """)
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to init embedding cache DB: {e}")
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Cached vectors for `texts` (None where missing), in input order."""
+        keys = [text_key(text) for text in texts]
+        found: Dict[str, List[float]] = {}
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                unique = list(dict.fromkeys(keys))
+                for offset in range(0, len(unique), _LOOKUP_CHUNK):
+                    chunk = unique[offset:offset + _LOOKUP_CHUNK]
+                    rows = conn.execute(
+                        f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({','.join('?' * len(chunk))})",
+                        [model, *chunk],
+                    ).fetchall()
+                    for text_hash, blob in rows:
+                        found[text_hash] = array("f", blob).tolist()
+        except Exception as e:
+            logger.warning(f"Embedding cache lookup failed: {e}")
+        vectors = [found.get(key) for key in keys]
+        with self._lock:
+            hit = sum(1 for v in vectors if v is not None)
+            self.hits += hit
+            self.misses += len(vectors) - hit
+        return vectors
+
+    def put_many(self, model: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]):
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model, text_hash, vector) VALUES (?, ?, ?)",
+                    [(model, text_key(text), array("f", vector).tobytes()) for text, vector in zip(texts, vectors)],
+                )
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"Embedding cache write failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        with sqlite3.connect(self.db_path) as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        return {"entries": entries, "hits": self.hits, "misses": self.misses}
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that only sends cache misses to the underlying provider.
+    Shared by index builds (embed_documents) and queries (embed_query).
+    """
+    def __init__(self, base: Embeddings, model: str, cache: Optional[EmbeddingCache] = None):
+        self.base = base
+        self.model = model
+        self.cache = cache or embedding_cache
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.cache.get_many(self.model, texts)
+        # Embed each distinct missing text once
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+        if missing:
+            fresh = dict(zip(missing, self.base.embed_documents(missing)))
+            self.cache.put_many(self.model, missing, [fresh[text] for text in missing])
+            vectors = [vector if vector is not None else fresh[text] for text, vector in zip(texts, vectors)]
+            logger.info(f"Embedded {len(missing)} new texts ({len(texts) - len(missing)} served from cache)")
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = self.cache.get_many(self.model, [text])[0]
+        if vector is None:
+            vector = self.base.embed_query(text)
+            self.cache.put_many(self.model, [text], [vector])
+        return vector
+
+
+# Singleton instance
+embedding_cache = EmbeddingCache()
@@ -0,0 +1,182 @@
+import copy
+import heapq
+import bisect
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+from app.services.event_store import event_store, to_utc_iso
+
+logger = logging.getLogger(__name__)
+
+
+class IntervalIndex:
+    """
+    Interval index over one calendar's events.
+    Events are kept in an array sorted by start, augmented with a max-end segment tree,
+    so overlap queries prune every subtree that ends before the window: O((k + 1) log n).
+    Start-range queries are a plain bisect, and (summary, start) lookups are a dict hit.
+    Times are UTC strings from `to_utc_iso`, which sort chronologically.
+
+    The sorted base is immutable; `with_changes` returns a new index whose small overlay
+    (added events, deleted base ids) is merged into query results, and folds the overlay into a
+    fresh base once it outgrows `max(MIN_OVERLAY, n // 8)` entries.
+    """
+    MIN_OVERLAY = 64
+
+    def __init__(self, events: List[Tuple[str, str, Dict[str, Any]]]):
+        events = sorted(events, key=lambda e: e[0])
+        self._starts = [start for start, _, _ in events]
+        self._ends = [end for _, end, _ in events]
+        self._events = [event for _, _, event in events]
+        self._base_ids = {event.get("id") for event in self._events}
+        self._by_key: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for start, _, event in events:
+            self._by_key.setdefault((event.get("summary") or "", start), []).append(event)
+        # Overlay: base ids hidden by later changes, and events added (or replaced) since the build
+        self._deleted: Set[str] = set()
+        self._added: Dict[str, Tuple[str, str, Dict[str, Any]]] = {}
+
+        # Segment tree of max end times (1-based, leaves at [size, size + n))
+        self._size = 1
+        while self._size < max(len(events), 1):
+            self._size *= 2
+        self._max_end = [""] * (2 * self._size)
+        self._max_end[self._size:self._size + len(events)] = self._ends
+        for node in range(self._size - 1, 0, -1):
+            self._max_end[node] = max(self._max_end[2 * node], self._max_end[2 * node + 1])
+
+    def __len__(self) -> int:
+        return len(self._events) - len(self._deleted) + len(self._added)
+
+    def with_changes(self, changes: List[Tuple[str, Any]]) -> "IntervalIndex":
+        """
+        A new index with ("upsert", (start, end, event)) / ("delete", event_id) changes applied.
+        The base arrays are shared; readers of this index are not affected.
+        """
+        deleted = set(self._deleted)
+        added = dict(self._added)
+        for op, data in changes:
+            event_id = data[2].get("id") if op == "upsert" else data
+            if event_id in self._base_ids:
+                deleted.add(event_id)
+            added.pop(event_id, None)
+            if op == "upsert":
+                added[event_id] = data
+        if len(deleted) + len(added) > max(self.MIN_OVERLAY, len(self._events) // 8):
+            return IntervalIndex(self._live(deleted, added))
+        index = copy.copy(self)
+        index._deleted = deleted
+        index._added = added
+        return index
+
+    def _live(self, deleted: Set[str], added: Dict[str, Tuple[str, str, Dict[str, Any]]]) -> List[Tuple[str, str, Dict[str, Any]]]:
+        live = [
+            (start, end, event) for start, end, event in zip(self._starts, self._ends, self._events)
+            if event.get("id") not in deleted
+        ]
+        live.extend(added.values())
+        return live
+
+    def _merge(self, base: List[int], extra: List[Tuple[str, str, Dict[str, Any]]], limit: Optional[int]) -> List[Dict[str, Any]]:
+        """Base hits (minus deleted) and overlay hits, in start order."""
+        hits = [(self._starts[i], self._events[i]) for i in base if self._events[i].get("id") not in self._deleted]
+        if extra:
+            hits = list(heapq.merge(hits, sorted(((e[0], e[2]) for e in extra), key=lambda h: h[0]), key=lambda h: h[0]))
+        if limit is not None:
+            hits = hits[:limit]
+        return [event for _, event in hits]
+
+    def _base_limit(self, limit: Optional[int]) -> Optional[int]:
+        # Deleted events may take up to len(_deleted) of the first base hits
+        return None if limit is None else limit + len(self._deleted)
+
+    def overlapping(self, time_min: str, time_max: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Events with end > time_min and start < time_max, ordered by start."""
+        hi = bisect.bisect_left(self._starts, time_max) if time_max else len(self._starts)
+        hits: List[int] = []
+        self._collect(1, 0, self._size, hi, time_min, hits, self._base_limit(limit))
+        extra = [e for e in self._added.values() if e[1] > time_min and (not time_max or e[0] < time_max)]
+        return self._merge(hits, extra, limit)
+
+    def _collect(self, node: int, lo: int, hi: int, stop: int, time_min: str, hits: List[int], limit: Optional[int]):
+        # Left-to-right DFS keeps results in start order, so `limit` can stop early
+        if lo >= stop or self._max_end[node] <= time_min or (limit is not None and len(hits) >= limit):
+            return
+        if hi - lo == 1:
+            hits.append(lo)
+            return
+        mid = (lo + hi) // 2
+        self._collect(2 * node, lo, mid, stop, time_min, hits, limit)
+        self._collect(2 * node + 1, mid, hi, stop, time_min, hits, limit)
+
+    def starting_between(self, time_min: str, time_max: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Events with time_min <= start < time_max."""
+        lo = bisect.bisect_left(self._starts, time_min)
+        hi = bisect.bisect_left(self._starts, time_max)
+        base_limit = self._base_limit(limit)
+        if base_limit is not None:
+            hi = min(hi, lo + base_limit)
+        extra = [e for e in self._added.values() if time_min <= e[0] < time_max]
+        return self._merge(range(lo, hi), extra, limit)
+
+    def find_exact(self, summary: str, start: str) -> List[Dict[str, Any]]:
+        found = [e for e in self._by_key.get((summary or "", start), []) if e.get("id") not in self._deleted]
+        found.extend(e[2] for e in self._added.values() if e[0] == start and (e[2].get("summary") or "") == (summary or ""))
+        return found
+
+
+class EventIndex:
+    """
+    Per-calendar IntervalIndex cache over the local mirror (event_store).
+    When a calendar's mirror version changes, the cached index is brought up to date with the
+    store's change log (write-through and incremental sync changes); only a full resync, or a
+    gap in the log, reloads the calendar from the mirror.
+    """
+    def __init__(self, store=event_store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._indexes: Dict[str, Tuple[int, IntervalIndex]] = {}
+        self.builds = 0
+        self.updates = 0
+
+    def get(self, calendar_id: str) -> IntervalIndex:
+        version = self.store.version(calendar_id)
+        with self._lock:
+            cached = self._indexes.get(calendar_id)
+        if cached and cached[0] == version:
+            return cached[1]
+        delta = self.store.changes_since(calendar_id, cached[0]) if cached else None
+        if delta is not None:
+            version, changes = delta
+            index = cached[1].with_changes(changes)
+            with self._lock:
+                self._indexes[calendar_id] = (version, index)
+                self.updates += 1
+            return index
+        index = IntervalIndex(self.store.load_calendar(calendar_id))
+        with self._lock:
+            self._indexes[calendar_id] = (version, index)
+            self.builds += 1
+        logger.debug(f"Built interval index for {calendar_id} ({len(index)} events)")
+        return index
+
+    def overlapping(self, calendar_id: str, time_min: Any, time_max: Any = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self.get(calendar_id).overlapping(to_utc_iso(time_min), to_utc_iso(time_max) if time_max else None, limit)
+
+    def starting_between(self, calendar_id: str, time_min: Any, time_max: Any, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self.get(calendar_id).starting_between(to_utc_iso(time_min), to_utc_iso(time_max), limit)
+
+    def find_exact(self, calendar_id: str, summary: str, start: Any) -> List[Dict[str, Any]]:
+        """Events with the same title starting at the same instant (duplicate check)."""
+        return self.get(calendar_id).find_exact(summary, to_utc_iso(start))
+
+    def conflicts(self, calendar_id: str, start: Any, end: Any, exclude_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Events overlapping [start, end) on the calendar."""
+        return [
+            event for event in self.overlapping(calendar_id, start, end)
+            if event.get("id") != exclude_id
+        ]
+
+
+# Singleton instance
+event_index = EventIndex()
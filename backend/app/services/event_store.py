@@ -0,0 +1,301 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+DB_PATH = os.path.join(os.getcwd(), "data", "calendar_mirror.db")
+KST = timezone(timedelta(hours=9))
+# Versions of change history kept per calendar for incremental index updates
+CHANGE_LOG_SIZE = 256
+
+
+def to_utc_iso(value: Any) -> Optional[str]:
+    """
+    Normalizes an event time ({'dateTime'|'date': ...}, ISO string or datetime) to a sortable UTC string.
+    Naive times and all-day dates are interpreted in KST.
+    """
+    if isinstance(value, dict):
+        value = value.get("dateTime") or value.get("date")
+    if not value:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=KST)
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _http_status(error: Exception) -> Optional[int]:
+    return getattr(getattr(error, "resp", None), "status", None)
+
+
+class EventStore:
+    """
+    Local SQLite mirror of Google Calendar events.
+    Each calendar is kept current with the Events API incremental sync (syncToken):
+    the first sync pulls everything from `past_days` ago onward, later syncs pull only changes,
+    and an expired token (HTTP 410) triggers a full resync of that calendar.
+    """
+    def __init__(self, db_path: str = DB_PATH, past_days: int = 90):
+        self.db_path = db_path
+        self.past_days = past_days
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        # Bumped on every change to a calendar's rows; lets in-memory indexes detect staleness
+        self._versions: Dict[str, int] = {}
+        # calendar_id -> deque of (version, changes); changes are ("upsert", (start, end, event)) or ("delete", event_id)
+        self._changes: Dict[str, deque] = {}
+        self.full_syncs = 0
+        self.incremental_syncs = 0
+        self.sync_errors = 0
+        self._init_db()
+
+    def _init_db(self):
+        """Initialize the database schema."""
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS events (
+                        calendar_id TEXT NOT NULL,
+                        event_id TEXT NOT NULL,
+                        summary TEXT,
+                        description TEXT,
+                        start_utc TEXT,
+                        end_utc TEXT,
+                        payload TEXT NOT NULL,
+                        PRIMARY KEY (calendar_id, event_id)
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_events_range ON events (calendar_id, start_utc)")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS sync_state (
+                        calendar_id TEXT PRIMARY KEY,
+                        sync_token TEXT,
+                        window_start TEXT,
+                        synced_at REAL
+                    )
+                """)
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to init calendar mirror DB: {e}")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def version(self, calendar_id: str) -> int:
+        return self._versions.get(calendar_id, 0)
+
+    def _bump(self, calendar_id: str, changes: Optional[List[Tuple[str, Any]]] = None):
+        """New version of a calendar; `changes` None means the rows were replaced wholesale."""
+        with self._locks_guard:
+            version = self._versions.get(calendar_id, 0) + 1
+            self._versions[calendar_id] = version
+            log = self._changes.setdefault(calendar_id, deque(maxlen=CHANGE_LOG_SIZE))
+            if changes is None:
+                log.clear()
+            else:
+                log.append((version, changes))
+
+    def changes_since(self, calendar_id: str, version: int) -> Optional[Tuple[int, List[Tuple[str, Any]]]]:
+        """(current version, changes after `version`), or None if they are no longer known."""
+        with self._locks_guard:
+            current = self._versions.get(calendar_id, 0)
+            entries = [entry for entry in self._changes.get(calendar_id, ()) if entry[0] > version]
+        if len(entries) != current - version:
+            return None
+        return current, [change for _, changes in entries for change in changes]
+
+    def _calendar_lock(self, calendar_id: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(calendar_id, threading.Lock())
+
+    # --- Sync ---
+
+    def sync_state(self, calendar_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM sync_state WHERE calendar_id = ?", (calendar_id,)).fetchone()
+        return dict(row) if row else None
+
+    def is_fresh(self, calendar_id: str, max_age: float) -> bool:
+        """True if the calendar was synced within `max_age` seconds."""
+        state = self.sync_state(calendar_id)
+        return bool(state and state["sync_token"] and time.time() - (state["synced_at"] or 0) <= max_age)
+
+    def covers(self, calendar_id: str, time_min: str) -> bool:
+        """True if the mirrored window of the calendar starts at or before `time_min`."""
+        state = self.sync_state(calendar_id)
+        start = to_utc_iso(time_min)
+        return bool(state and state["window_start"] and start and state["window_start"] <= start)
+
+    def sync_calendar(self, service, calendar_id: str) -> bool:
+        """Brings one calendar up to date. Returns False if the sync failed."""
+        with self._calendar_lock(calendar_id):
+            state = self.sync_state(calendar_id)
+            token = state["sync_token"] if state else None
+            window_start = state["window_start"] if state else None
+            try:
+                full = not token
+                if token:
+                    try:
+                        items, next_token = self._pull(service, calendar_id, syncToken=token)
+                    except Exception as e:
+                        if _http_status(e) != 410:
+                            raise
+                        logger.info(f"[CALENDAR] Sync token expired for {calendar_id}; running full resync")
+                        full = True
+                if full:
+                    window_start = to_utc_iso(datetime.now(timezone.utc) - timedelta(days=self.past_days))
+                    items, next_token = self._pull(service, calendar_id, timeMin=window_start)
+            except Exception as e:
+                self.sync_errors += 1
+                logger.error(f"[CALENDAR] {calendar_id} 동기화 실패: {e}")
+                return False
+
+            self._apply(calendar_id, items, next_token, window_start, full)
+            if full:
+                self.full_syncs += 1
+            else:
+                self.incremental_syncs += 1
+            logger.debug(f"[CALENDAR] Synced {calendar_id} ({'full' if full else 'incremental'}, {len(items)} changes)")
+            return True
+
+    @staticmethod
+    def _pull(service, calendar_id: str, **params) -> Tuple[List[Dict[str, Any]], str]:
+        items: List[Dict[str, Any]] = []
+        page_token = None
+        while True:
+            response = service.events().list(
+                calendarId=calendar_id,
+                singleEvents=True,
+                showDeleted=True,
+                maxResults=2500,
+                pageToken=page_token,
+                **params,
+            ).execute()
+            items.extend(response.get("items", []))
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                break
+        next_token = response.get("nextSyncToken")
+        if not isinstance(next_token, str) or not next_token:
+            raise RuntimeError("events.list returned no nextSyncToken")
+        return items, next_token
+
+    def _apply(self, calendar_id: str, items: List[Dict[str, Any]], token: str, window_start: Optional[str], full: bool):
+        changes = []
+        with self._connect() as conn:
+            if full:
+                conn.execute("DELETE FROM events WHERE calendar_id = ?", (calendar_id,))
+            for item in items:
+                if item.get("status") == "cancelled":
+                    conn.execute("DELETE FROM events WHERE calendar_id = ? AND event_id = ?", (calendar_id, item.get("id")))
+                    changes.append(("delete", item.get("id")))
+                else:
+                    changes.append(self._upsert(conn, calendar_id, item))
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_state (calendar_id, sync_token, window_start, synced_at) VALUES (?, ?, ?, ?)",
+                (calendar_id, token, window_start, time.time()),
+            )
+            conn.commit()
+        if full or items:
+            self._bump(calendar_id, None if full else changes)
+
+    @staticmethod
+    def _upsert(conn: sqlite3.Connection, calendar_id: str, event: Dict[str, Any]) -> Tuple[str, Any]:
+        """Writes the event row and returns the matching index change."""
+        start = to_utc_iso(event.get("start"))
+        end = to_utc_iso(event.get("end")) or start
+        payload = json.dumps(event, ensure_ascii=False)
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO events (calendar_id, event_id, summary, description, start_utc, end_utc, payload)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                calendar_id,
+                event["id"],
+                event.get("summary"),
+                event.get("description"),
+                start,
+                end,
+                payload,
+            ),
+        )
+        # Rows without a start are not indexed (load_calendar skips them)
+        return ("upsert", (start, end, json.loads(payload))) if start else ("delete", event["id"])
+
+    # --- Write-through ---
+
+    def upsert_event(self, calendar_id: str, event: Dict[str, Any]):
+        """Records an event we just created/updated so reads see it before the next sync."""
+        if not event.get("id") or not to_utc_iso(event.get("start")):
+            return
+        try:
+            with self._connect() as conn:
+                change = self._upsert(conn, calendar_id, event)
+                conn.commit()
+            self._bump(calendar_id, [change])
+        except Exception as e:
+            logger.warning(f"Calendar mirror write-through failed: {e}")
+
+    def remove_event(self, calendar_id: str, event_id: str):
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM events WHERE calendar_id = ? AND event_id = ?", (calendar_id, event_id))
+                conn.commit()
+            self._bump(calendar_id, [("delete", event_id)])
+        except Exception as e:
+            logger.warning(f"Calendar mirror delete failed: {e}")
+
+    # --- Queries ---
+
+    def load_calendar(self, calendar_id: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """All mirrored events of a calendar as (start_utc, end_utc, event) tuples."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT start_utc, end_utc, payload FROM events WHERE calendar_id = ? AND start_utc IS NOT NULL",
+                (calendar_id,),
+            ).fetchall()
+        return [(row["start_utc"], row["end_utc"], json.loads(row["payload"])) for row in rows]
+
+    def search_description(self, calendar_id: str, text: str, time_min: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Events whose description contains `text` (e.g. a ThreadID tag), ending after `time_min`."""
+        sql = "SELECT payload FROM events WHERE calendar_id = ? AND instr(description, ?) > 0"
+        params: List[Any] = [calendar_id, text]
+        if time_min:
+            sql += " AND end_utc > ?"
+            params.append(to_utc_iso(time_min))
+        with self._connect() as conn:
+            rows = conn.execute(sql + " ORDER BY start_utc", params).fetchall()
+        return [json.loads(row["payload"]) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._connect() as conn:
+            events = conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+            calendars = conn.execute("SELECT COUNT(*) FROM sync_state").fetchone()[0]
+        return {
+            "calendars": calendars,
+            "events": events,
+            "full_syncs": self.full_syncs,
+            "incremental_syncs": self.incremental_syncs,
+            "sync_errors": self.sync_errors,
+        }
+
+
+# Singleton instance
+event_store = EventStore(past_days=settings.CALENDAR_SYNC_PAST_DAYS)
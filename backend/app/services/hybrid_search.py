@@ -0,0 +1,74 @@
+import re
+import math
+from collections import Counter
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+# Latin/digit runs keep codes like "ke721" or "abc123xyz" whole; Hangul runs are split further below
+_TOKEN_REGEX = re.compile(r"[0-9a-z]+|[가-힣]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercased Latin/digit words plus Hangul words and their character bigrams.
+    Bigrams let '항공편은' match '항공편' without a morphological analyzer.
+    """
+    tokens: List[str] = []
+    for word in _TOKEN_REGEX.findall(text.lower()):
+        tokens.append(word)
+        if len(word) > 2 and "가" <= word[0] <= "힣":
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class BM25Index:
+    """
+    In-process inverted index with Okapi BM25 scoring.
+    `search` can be restricted to a subset of documents (metadata prefiltering), in which case
+    only postings of allowed documents are scored.
+    """
+    def __init__(self, documents: Iterable[Tuple[Hashable, str]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_ids: List[Hashable] = []
+        self._lengths: List[int] = []
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        for doc_id, text in documents:
+            position = len(self.doc_ids)
+            counts = Counter(tokenize(text))
+            self.doc_ids.append(doc_id)
+            self._lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                self._postings.setdefault(term, []).append((position, tf))
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+        n = len(self.doc_ids)
+        self._idf = {
+            term: math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def search(self, query: str, k: int = 10, allowed: Optional[set] = None) -> List[Tuple[Hashable, float]]:
+        """Top-k (doc_id, score) for the query; `allowed` limits the candidates to those doc ids."""
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for position, tf in self._postings[term]:
+                if allowed is not None and self.doc_ids[position] not in allowed:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[position] / self._avg_length)
+                scores[position] = scores.get(position, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        top = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+        return [(self.doc_ids[position], score) for position, score in top]
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[Hashable]], k: int = 60) -> List[Tuple[Hashable, float]]:
+    """Fuses ranked id lists: score(d) = sum(1 / (k + rank)). Ties keep first-seen order."""
+    scores: Dict[Hashable, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: -item[1])
@@ -1,9 +1,17 @@
 import os
+import copy
 import json
+import orjson
+import time
+import atexit
 import logging
 import asyncio
-from typing import List, Dict, Any, Optional
+import tempfile
+import threading
+from typing import Callable, List, Dict, Any, Optional
 from app.core.datetime_utils import now_kst
+from app.core.settings import settings
+from app.services.session_store import create_session_store, encode_message
 from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
 
 logger = logging.getLogger(__name__)
@@ -13,18 +21,37 @@ SESSIONS_DIR = os.path.join(DATA_DIR, "sessions")
 USER_PROFILE_PATH = os.path.join(DATA_DIR, "user_profile.json")
 
 class MemoryService:
-    """Handles high-speed session IO and profile management."""
+    """
+    Handles high-speed session IO and profile management.
+    Sessions are kept in a session store (SQLite table or JSONL append log) that only receives each turn's new messages.
+    The user profile is served from memory: the file is re-read only when its mtime changes
+    (checked at most every `stat_interval` seconds). Updates are applied in memory and flushed
+    by a debounced write-behind (atomic temp-file rename); pending updates survive an external
+    rewrite of the file because they are replayed on reload.
+    """
     
-    def __init__(self):
-        os.makedirs(SESSIONS_DIR, exist_ok=True)
-        if not os.path.exists(USER_PROFILE_PATH):
-            with open(USER_PROFILE_PATH, "w", encoding="utf-8") as f:
-                json.dump({
-                    "user": {"name": "Unknown", "calendars": []},
-                    "patterns": [],
-                    "facts": {},
-                    "history": []
-                }, f, ensure_ascii=False, indent=2)
+    def __init__(self, profile_path: Optional[str] = None, flush_delay: Optional[float] = None, stat_interval: float = 1.0,
+                 session_store=None):
+        self.profile_path = profile_path or USER_PROFILE_PATH
+        self.flush_delay = settings.MEMORY_PROFILE_FLUSH_DELAY_SECONDS if flush_delay is None else flush_delay
+        self.stat_interval = stat_interval
+        self._profile_lock = threading.RLock()
+        self._profile: Optional[Dict[str, Any]] = None
+        self._profile_mtime: Optional[int] = None
+        self._checked_at = 0.0
+        self._pending_ops: List[Callable[[Dict[str, Any]], Any]] = []
+        self._flush_timer: Optional[threading.Timer] = None
+        self.profile_version = 0
+        self.profile_loads = 0
+        self.profile_flushes = 0
+
+        os.makedirs(DATA_DIR, exist_ok=True)
+        if not os.path.exists(self.profile_path):
+            self._write_profile(self._normalize_profile({}))
+        self.sessions = session_store or create_session_store(
+            settings.SESSION_STORE_BACKEND, DATA_DIR, settings.SESSION_LOG_COMPACT_MIN_LINES
+        )
+        self._import_legacy_sessions()
 
     def _normalize_profile(self, profile: Dict[str, Any]) -> Dict[str, Any]:
         if not isinstance(profile, dict):
@@ -36,156 +63,257 @@ class MemoryService:
         return profile
 
     def save_session(self, thread_id: str, messages: List[BaseMessage]):
-        """Saves current session messages to JSON in date-based directory."""
-        date_str = now_kst().strftime("%Y-%m-%d")
-        daily_dir = os.path.join(SESSIONS_DIR, date_str)
-        os.makedirs(daily_dir, exist_ok=True)
-        
-        path = os.path.join(daily_dir, f"{thread_id}.json")
+        """
+        Persists a thread's history, serializing only the messages added since the last save.
+        The persisted prefix is validated by its last message; a mismatch rewrites the transcript.
+        """
+        now = now_kst()
         try:
-            data = [message_to_dict(m) for m in messages]
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump({
-                    "updated_at": now_kst().isoformat(),
-                    "messages": data
-                }, f, ensure_ascii=False, indent=2)
-            logger.debug(f"Session {thread_id} saved to {date_str}.")
+            count, last = self.sessions.tail(thread_id)
+            start = 0
+            if 0 < count <= len(messages) and orjson.loads(encode_message(message_to_dict(messages[count - 1]))) == last:
+                start = count
+            written = self.sessions.append(
+                thread_id, start, [message_to_dict(m) for m in messages[start:]], now.strftime("%Y-%m-%d"), now.isoformat()
+            )
+            logger.debug(f"Session {thread_id} saved ({written} new messages).")
         except Exception as e:
             logger.error(f"Failed to save session {thread_id}: {e}")
 
     def load_session(self, thread_id: str, date_str: Optional[str] = None) -> List[BaseMessage]:
         """
-        Loads session messages from JSON.
-        If date_str is provided, look specifically in that folder.
-        Otherwise, search folders (descending) or fallback to old flat format.
+        Loads session messages by thread id (index lookup, no directory scan).
+        date_str is kept for compatibility; a thread has a single transcript regardless of date.
         """
-        # 1. Search in specific date folder if provided
-        if date_str:
-            path = os.path.join(SESSIONS_DIR, date_str, f"{thread_id}.json")
-            if os.path.exists(path):
-                return self._read_json(path)
-
-        # 2. Search in all date folders (new format)
-        if os.path.exists(SESSIONS_DIR):
-            dates = sorted([d for d in os.listdir(SESSIONS_DIR) if os.path.isdir(os.path.join(SESSIONS_DIR, d))], reverse=True)
-            for d in dates:
-                path = os.path.join(SESSIONS_DIR, d, f"{thread_id}.json")
-                if os.path.exists(path):
-                    return self._read_json(path)
-
-        # 3. Fallback to old flat format: {thread_id}_{date}.json
-        # Check files in SESSIONS_DIR directly
-        for f in os.listdir(SESSIONS_DIR):
-            if f.startswith(thread_id) and f.endswith(".json"):
-                 path = os.path.join(SESSIONS_DIR, f)
-                 if os.path.isfile(path):
-                     return self._read_json(path)
-
-        return []
-
-    def _read_json(self, path: str) -> List[BaseMessage]:
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return messages_from_dict(data.get("messages", []))
+            return messages_from_dict(self.sessions.load(thread_id))
         except Exception as e:
-            logger.error(f"Failed to load session from {path}: {e}")
+            logger.error(f"Failed to load session {thread_id}: {e}")
             return []
 
     def list_sessions_by_date(self, date_str: str) -> List[str]:
-        """Returns list of session IDs for a specific date."""
-        daily_dir = os.path.join(SESSIONS_DIR, date_str)
-        if not os.path.exists(daily_dir):
-            return []
-        
-        return [f.replace(".json", "") for f in os.listdir(daily_dir) if f.endswith(".json")]
+        """Returns list of session IDs last updated on a specific date."""
+        return self.sessions.threads_by_date(date_str)
 
     def list_all_dates(self) -> List[str]:
-        """Returns all dates that have session subdirectories."""
-        if not os.path.exists(SESSIONS_DIR):
-            return []
-        return sorted([d for d in os.listdir(SESSIONS_DIR) if os.path.isdir(os.path.join(SESSIONS_DIR, d))], reverse=True)
+        """Returns all dates that have sessions, newest first."""
+        return self.sessions.dates()
+
+    def get_analysis_state(self, thread_id: str) -> Dict[str, Any]:
+        """MemoryAnalyzer progress for a thread: {'watermark', 'summary', 'category'}."""
+        raw = self.sessions.get_meta(f"analysis:{thread_id}")
+        try:
+            return json.loads(raw) if raw else {}
+        except ValueError:
+            return {}
+
+    def set_analysis_state(self, thread_id: str, state: Dict[str, Any]):
+        self.sessions.set_meta(f"analysis:{thread_id}", json.dumps(state, ensure_ascii=False))
+
+    def _import_legacy_sessions(self):
+        """One-time import of the per-thread JSON files (sessions/<date>/<thread>.json) into the store."""
+        if self.sessions.get_meta("legacy_json_imported") or not os.path.isdir(SESSIONS_DIR):
+            return
+        imported = 0
+        # Oldest first, so the newest copy of a thread saved on several days wins
+        for entry in sorted(os.listdir(SESSIONS_DIR)):
+            entry_path = os.path.join(SESSIONS_DIR, entry)
+            if os.path.isdir(entry_path):
+                files = [(os.path.join(entry_path, f), f[:-5], entry) for f in sorted(os.listdir(entry_path)) if f.endswith(".json")]
+            elif entry.endswith(".json"):
+                # Old flat format: {thread_id}_{date}.json
+                thread_id, _, date_str = entry[:-5].rpartition("_")
+                files = [(entry_path, thread_id or date_str, date_str if thread_id else None)]
+            else:
+                continue
+            for path, thread_id, date_str in files:
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    updated_at = data.get("updated_at") or now_kst().isoformat()
+                    self.sessions.append(thread_id, 0, data.get("messages", []), date_str or updated_at[:10], updated_at)
+                    imported += 1
+                except Exception as e:
+                    logger.error(f"Failed to import legacy session {path}: {e}")
+        self.sessions.set_meta("legacy_json_imported", now_kst().isoformat())
+        if imported:
+            logger.info(f"Imported {imported} legacy JSON sessions into {self.sessions.location}")
 
     def get_user_profile(self, thread_id: Optional[str] = None) -> Dict[str, Any]:
         """Returns the long-term user profile. Optional thread_id for session context."""
+        with self._profile_lock:
+            return copy.deepcopy(self._current_profile())
+
+    def _current_profile(self) -> Dict[str, Any]:
+        """The cached profile, reloaded if the file was rewritten by someone else. Caller holds the lock."""
+        now = time.monotonic()
+        if self._profile is not None and now - self._checked_at < self.stat_interval:
+            return self._profile
+        self._checked_at = now
+        try:
+            mtime = os.stat(self.profile_path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if self._profile is None or (mtime is not None and mtime != self._profile_mtime):
+            self._load_profile(mtime)
+        return self._profile
+
+    def _load_profile(self, mtime: Optional[int]):
         try:
-            with open(USER_PROFILE_PATH, "r", encoding="utf-8") as f:
-                profile = json.load(f)
-            profile = self._normalize_profile(profile)
-            return profile
+            with open(self.profile_path, "r", encoding="utf-8") as f:
+                profile = self._normalize_profile(json.load(f))
         except Exception as e:
             logger.error(f"Failed to load user profile: {e}")
-            return {"patterns": [], "facts": {}, "history": []}
+            if self._profile is not None:
+                return
+            profile = self._normalize_profile({})
+        # Updates not yet flushed are replayed on top of the external version
+        for op in self._pending_ops:
+            op(profile)
+        self._profile = profile
+        self._profile_mtime = mtime
+        self.profile_loads += 1
+
+    def _mutate(self, op: Callable[[Dict[str, Any]], Any]):
+        """Applies `op` to the cached profile and schedules a flush (op returns False for no change)."""
+        with self._profile_lock:
+            if op(self._current_profile()) is False:
+                return
+            self._pending_ops.append(op)
+            self.profile_version += 1
+            if self._flush_timer is None:
+                # Debounce: everything changed within the window is written once
+                self._flush_timer = threading.Timer(self.flush_delay, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self):
+        """Writes pending profile updates to disk now."""
+        with self._profile_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._pending_ops:
+                return
+            # Re-check the file right before writing: an external update made since the last
+            # stat is reloaded (with the pending ops replayed) instead of being overwritten
+            self._checked_at = float("-inf")
+            try:
+                self._write_profile(self._current_profile())
+                self._pending_ops.clear()
+                self.profile_flushes += 1
+            except Exception as e:
+                logger.error(f"Failed to save user profile: {e}")
+
+    def _write_profile(self, profile: Dict[str, Any]):
+        """Atomic write (temp file + rename); a concurrent reader never sees a partial file."""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.profile_path), prefix=".user_profile.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(profile, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.profile_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._profile_mtime = os.stat(self.profile_path).st_mtime_ns
 
     def update_user_profile(self, new_facts: Dict[str, Any], thread_id: Optional[str] = None):
         """Updates the persistent user profile facts."""
-        profile = self._normalize_profile(self.get_user_profile(thread_id=thread_id))
-        profile["facts"].update(new_facts)
-        self._save_profile(profile)
+        self._mutate(lambda profile: profile["facts"].update(new_facts))
 
     def update_user_info(self, new_info: Dict[str, Any], thread_id: Optional[str] = None):
         """Updates the persistent user information (name, calendars, etc.)."""
-        profile = self._normalize_profile(self.get_user_profile(thread_id=thread_id))
-        profile["user"].update(new_info)
-        self._save_profile(profile)
+        self._mutate(lambda profile: profile["user"].update(new_info))
 
     def add_user_pattern(self, pattern: str, thread_id: Optional[str] = None):
         """Adds a new pattern entry if it does not already exist."""
         if not pattern:
             return
-        profile = self._normalize_profile(self.get_user_profile(thread_id=thread_id))
-        if pattern not in profile["patterns"]:
+
+        def op(profile):
+            if pattern in profile["patterns"]:
+                return False
             profile["patterns"].append(pattern)
-            self._save_profile(profile)
+        self._mutate(op)
 
     def add_session_summary(self, thread_id: str, category: str, summary: str):
         """Adds or updates a session summary in the user profile history."""
-        profile = self._normalize_profile(self.get_user_profile())
-        
-        # Check if thread already exists in history to update it
-        existing = next((item for item in profile["history"] if item["thread_id"] == thread_id), None)
-        if existing:
-            existing.update({
-                "category": category,
-                "summary": summary,
-                "updated_at": now_kst().isoformat()
-            })
-        else:
-            profile["history"].append({
-                "thread_id": thread_id,
-                "category": category,
-                "summary": summary,
-                "updated_at": now_kst().isoformat()
-            })
-        
-        # Keep only last 20 summaries to save tokens later
-        profile["history"] = profile["history"][-20:]
-        self._save_profile(profile)
+        updated_at = now_kst().isoformat()
 
-    def _save_profile(self, profile: Dict[str, Any]):
-        try:
-            with open(USER_PROFILE_PATH, "w", encoding="utf-8") as f:
-                json.dump(profile, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"Failed to save user profile: {e}")
+        def op(profile):
+            # Check if thread already exists in history to update it
+            existing = next((item for item in profile["history"] if item["thread_id"] == thread_id), None)
+            if existing:
+                existing.update({
+                    "category": category,
+                    "summary": summary,
+                    "updated_at": updated_at
+                })
+            else:
+                profile["history"].append({
+                    "thread_id": thread_id,
+                    "category": category,
+                    "summary": summary,
+                    "updated_at": updated_at
+                })
+            # Keep only last 20 summaries to save tokens later
+            profile["history"] = profile["history"][-20:]
+        self._mutate(op)
+
+    def profile_stats(self) -> Dict[str, Any]:
+        with self._profile_lock:
+            return {
+                "version": self.profile_version,
+                "loads": self.profile_loads,
+                "flushes": self.profile_flushes,
+                "pending_updates": len(self._pending_ops),
+            }
 
 class MemoryAnalyzer:
-    """Extracts patterns and facts from conversation history."""
+    """
+    Extracts patterns and facts from conversation history.
+    Incremental: each thread keeps a watermark (messages already analyzed) and a rolling summary,
+    so a run only sends the previous summary plus the new messages to the LLM.
+    """
     
     def __init__(self, memory_service: MemoryService):
         self.service = memory_service
+        self.runs = 0
+        self.last_prompt_chars = 0
+        self.last_new_messages = 0
+        self.last_llm_seconds = 0.0
 
-    async def analyze_and_update(self, messages: List[BaseMessage]):
+    async def analyze_and_update(self, messages: List[BaseMessage], thread_id: Optional[str] = None) -> bool:
         """
         Background task to analyze conversation for long-term facts.
+        Returns False when the analysis failed (so a queued job can be retried).
         """
         logger.info("MemoryAnalyzer: Running background analysis...")
-        
-        # 1. Prepare history text
-        history = ""
-        for m in messages:
-            role = "User" if isinstance(m, HumanMessage) else "Assistant"
-            history += f"{role}: {m.content}\n"
+
+        # Use specific thread_id if provided, else find it from the message context
+        if not thread_id:
+            thread_id = "unknown"
+            for m in reversed(messages):
+                if hasattr(m, "additional_kwargs") and "thread_id" in m.additional_kwargs:
+                    thread_id = m.additional_kwargs["thread_id"]
+                    break
+
+        # 1. Only messages after the watermark are analyzed
+        state = self.service.get_analysis_state(thread_id) if thread_id != "unknown" else {}
+        watermark = state.get("watermark", 0)
+        previous_summary = state.get("summary", "")
+        if watermark > len(messages):
+            # History was trimmed or rewritten; start over
+            watermark, previous_summary = 0, ""
+        new_messages = messages[watermark:]
+        if not new_messages:
+            logger.info(f"MemoryAnalyzer: Session [{thread_id}] has no new messages.")
+            return True
+
+        history = "".join(
+            f"{'User' if isinstance(m, HumanMessage) else 'Assistant'}: {m.content}\n" for m in new_messages
+        )
 
         # 2. Extract facts using LLM
         from app.agent.llm import get_llm
@@ -194,15 +322,26 @@ class MemoryAnalyzer:
         from langchain_core.messages import ToolMessage
         
         llm = get_llm(model=settings.LLM_MODEL_PLANNER)
+
+        if previous_summary:
+            context = f"""Summary of the conversation so far:
+{previous_summary}
+
+New messages since that summary:
+{history}"""
+            summary_rule = "A concise one-line summary of the WHOLE conversation (update the summary above with the new messages)."
+        else:
+            context = f"""Current conversation:
+{history}"""
+            summary_rule = "A concise one-line summary of the conversation."
         
         prompt = f"""You are a Fact Extractor & Conversation Summarizer. 
 Analyze the following conversation and extract:
 1. NEW, IMPORTANT facts or preferences about the user.
 2. A category for this conversation (e.g., 'Work', 'Health', 'Personal', 'General').
-3. A concise one-line summary of the conversation.
+3. {summary_rule}
 
-Current conversation:
-{history}
+{context}
 
 Respond ONLY in JSON format with the following keys:
 - 'facts': dictionary of key-value strings.
@@ -218,7 +357,12 @@ If no new facts found, 'facts' should be {{}}.
 """
         try:
             # Run LLM in thread to avoid blocking
+            started = time.perf_counter()
             response = await asyncio.to_thread(llm.invoke, prompt)
+            self.runs += 1
+            self.last_prompt_chars = len(prompt)
+            self.last_new_messages = len(new_messages)
+            self.last_llm_seconds = time.perf_counter() - started
             json_str = extract_json(response.content)
             data = json.loads(json_str)
             
@@ -242,29 +386,33 @@ If no new facts found, 'facts' should be {{}}.
                     )
                 new_facts = {k: v for k, v in new_facts.items() if not is_travel_key(k)}
             
-            # Use specific thread_id if available from message context or pass as arg
-            # For background tasks, we usually have a way to know which thread it was.
-            # We'll assume the caller of analyze_and_update can provide it or we find it.
-            # For now, let's add an optional thread_id to the method. (Refactoring for this below)
-            # Find the thread_id from the last AI message if possible
-            thread_id = "unknown"
-            for m in reversed(messages):
-                if hasattr(m, "additional_kwargs") and "thread_id" in m.additional_kwargs:
-                    thread_id = m.additional_kwargs["thread_id"]
-                    break
-            
             if new_facts:
                 logger.info(f"MemoryAnalyzer: Discovered new facts: {new_facts}")
                 self.service.update_user_profile(new_facts)
             
             # Save session-specific metadata
             self.service.add_session_summary(thread_id, category, summary)
-            logger.info(f"MemoryAnalyzer: Session [{thread_id}] summarized: {category} - {summary}")
-            
+            if thread_id != "unknown":
+                self.service.set_analysis_state(thread_id, {"watermark": len(messages), "summary": summary, "category": category})
+            logger.info(f"MemoryAnalyzer: Session [{thread_id}] summarized: {category} - {summary} "
+                        f"({len(new_messages)} new messages, prompt {len(prompt)} chars, LLM {self.last_llm_seconds:.1f}s)")
+            return True
+
         except Exception as e:
             logger.error(f"MemoryAnalyzer: Analysis failed: {e}")
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "last_new_messages": self.last_new_messages,
+            "last_prompt_chars": self.last_prompt_chars,
+            "last_llm_seconds": round(self.last_llm_seconds, 2),
+        }
 
 from langchain_core.messages import HumanMessage, AIMessage, BaseMessage, message_to_dict, messages_from_dict
 
 memory_service = MemoryService()
+# Don't lose debounced profile updates on interpreter exit (scripts, tests)
+atexit.register(memory_service.flush)
 memory_analyzer = MemoryAnalyzer(memory_service)
@@ -0,0 +1,169 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from app.core.settings import settings
+from app.core.google_auth import get_calendar_service, execute_batch
+from app.services.context_manager import context_manager
+
+logger = logging.getLogger(__name__)
+
+VERIFY_MODES = ("trust", "async", "sync")
+
+
+class RegistrationVerifier:
+    """
+    Post-insert verification policy for created calendar events.
+    - trust: the insert response (which carries the new event id) is the confirmation; no extra calls.
+    - async: events are re-read in the background `delay_seconds` later, in one batch request,
+      and the outcome is recorded in context_manager (and kept here for verify_calendar_registrations).
+    - sync: events are re-read in one batch request before the tool returns.
+    """
+    def __init__(self, mode: str = "async", delay_seconds: float = 5.0, max_attempts: int = 3,
+                 reporter=context_manager, max_results: int = 1000):
+        if mode not in VERIFY_MODES:
+            logger.warning(f"Unknown calendar verify mode '{mode}', using 'async'")
+            mode = "async"
+        self.mode = mode
+        self.delay_seconds = delay_seconds
+        self.max_attempts = max_attempts
+        self.reporter = reporter
+        self.max_results = max_results
+        self._cond = threading.Condition()
+        self._pending: List[Dict[str, Any]] = []
+        self._results: "OrderedDict[str, str]" = OrderedDict()
+        self._worker: Optional[threading.Thread] = None
+        self.verified = 0
+        self.missing = 0
+        self.failed = 0
+
+    def after_insert(self, service, created: List[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        Applies the policy to freshly inserted events ({'calendar_id', 'event_id'} dicts).
+        Returns {event_id: 'trusted' | 'pending' | 'verified' | 'missing' | 'failed'}.
+        """
+        created = [item for item in created if item.get("event_id")]
+        if not created:
+            return {}
+        if self.mode == "trust":
+            return {item["event_id"]: "trusted" for item in created}
+        if self.mode == "sync":
+            outcome = self._check(service, created)
+            self._record(created, outcome)
+            return outcome
+        self.submit(created)
+        return {item["event_id"]: "pending" for item in created}
+
+    def submit(self, created: List[Dict[str, Any]]):
+        """Queues events for background verification."""
+        due = time.monotonic() + self.delay_seconds
+        with self._cond:
+            for item in created:
+                self._pending.append({**item, "due": due, "attempts": 0})
+                self._results[item["event_id"]] = "pending"
+            self._trim()
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="calendar-verify", daemon=True)
+                self._worker.start()
+            self._cond.notify()
+
+    def status(self, event_id: str) -> Optional[str]:
+        with self._cond:
+            return self._results.get(event_id)
+
+    def _trim(self):
+        while len(self._results) > self.max_results:
+            self._results.popitem(last=False)
+
+    def _check(self, service, items: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Re-reads the events in one batch request."""
+        responses = execute_batch(service, [
+            (str(i), service.events().get(calendarId=item["calendar_id"], eventId=item["event_id"]))
+            for i, item in enumerate(items)
+        ])
+        outcome = {}
+        for i, item in enumerate(items):
+            response, error = responses.get(str(i), (None, RuntimeError("batch returned no response")))
+            status_code = getattr(getattr(error, "resp", None), "status", None)
+            if response and not error and response.get("status") != "cancelled":
+                outcome[item["event_id"]] = "verified"
+            elif status_code in (404, 410) or (response and response.get("status") == "cancelled"):
+                outcome[item["event_id"]] = "missing"
+            else:
+                outcome[item["event_id"]] = "failed"
+        return outcome
+
+    def _record(self, items: List[Dict[str, Any]], outcome: Dict[str, str]):
+        with self._cond:
+            for event_id, status in outcome.items():
+                self._results[event_id] = status
+                self._results.move_to_end(event_id)
+            self._trim()
+        for item in items:
+            status = outcome.get(item["event_id"])
+            if status == "verified":
+                self.verified += 1
+            elif status == "missing":
+                self.missing += 1
+                logger.warning(f"[CALENDAR] 생성된 일정이 서버에서 확인되지 않음: {item['event_id']} ({item['calendar_id']})")
+            elif status == "failed":
+                self.failed += 1
+            if status:
+                self.reporter.set_verification(item["event_id"], status, calendar_id=item["calendar_id"])
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    ready = [item for item in self._pending if item["due"] <= now]
+                    if ready:
+                        self._pending = [item for item in self._pending if item["due"] > now]
+                        break
+                    timeout = min((item["due"] for item in self._pending), default=now + 60.0) - now
+                    self._cond.wait(timeout=timeout)
+            self._verify_ready(ready)
+
+    def _verify_ready(self, ready: List[Dict[str, Any]]):
+        try:
+            service = get_calendar_service()
+            if not service:
+                raise RuntimeError("Google Calendar 인증에 실패했습니다.")
+            outcome = self._check(service, ready)
+        except Exception as e:
+            logger.warning(f"Background verification failed: {e}")
+            outcome = {item["event_id"]: "failed" for item in ready}
+
+        # Transient failures are retried; only the final attempt is recorded as 'failed'
+        retry = [
+            dict(item, attempts=item["attempts"] + 1) for item in ready
+            if outcome.get(item["event_id"]) == "failed" and item["attempts"] + 1 < self.max_attempts
+        ]
+        retry_ids = {item["event_id"] for item in retry}
+        self._record(ready, {eid: status for eid, status in outcome.items() if eid not in retry_ids})
+        if retry:
+            # Each item backs off according to its own attempt count
+            now = time.monotonic()
+            with self._cond:
+                self._pending.extend(
+                    dict(item, due=now + self.delay_seconds * (2 ** item["attempts"])) for item in retry
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            pending = len(self._pending)
+        return {
+            "mode": self.mode,
+            "pending": pending,
+            "verified": self.verified,
+            "missing": self.missing,
+            "failed": self.failed,
+        }
+
+
+# Singleton instance
+registration_verifier = RegistrationVerifier(
+    mode=settings.CALENDAR_VERIFY_MODE,
+    delay_seconds=settings.CALENDAR_VERIFY_DELAY_SECONDS,
+)
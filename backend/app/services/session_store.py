@@ -0,0 +1,345 @@
+import os
+import sqlite3
+import logging
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# message_to_dict output may carry non-string keys in metadata (json.dump used to coerce them)
+_DUMP_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    return orjson.dumps(message, option=_DUMP_OPTIONS)
+
+
+class SessionStore:
+    """
+    SQLite store for conversation transcripts.
+    Messages live in a (thread_id, seq) table and each save appends only the messages past the
+    persisted count; `sessions` indexes threads by id and date. Payloads are orjson-encoded blobs.
+    """
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.appended = 0
+        self.rewrites = 0
+        self._init_db()
+
+    def _init_db(self):
+        """Initialize the database schema."""
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS sessions (
+                        thread_id TEXT PRIMARY KEY,
+                        date TEXT NOT NULL,
+                        message_count INTEGER NOT NULL,
+                        updated_at TEXT NOT NULL
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_date ON sessions (date)")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS messages (
+                        thread_id TEXT NOT NULL,
+                        seq INTEGER NOT NULL,
+                        payload BLOB NOT NULL,
+                        PRIMARY KEY (thread_id, seq)
+                    ) WITHOUT ROWID
+                """)
+                conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to init session store DB: {e}")
+
+    @property
+    def location(self) -> str:
+        """Where the transcripts live (for logs and messages)."""
+        return self.db_path
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path)
+
+    def tail(self, thread_id: str) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """(persisted message count, last persisted message)."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT message_count FROM sessions WHERE thread_id = ?", (thread_id,)).fetchone()
+            if not row or not row[0]:
+                return 0, None
+            last = conn.execute(
+                "SELECT payload FROM messages WHERE thread_id = ? AND seq = ?", (thread_id, row[0] - 1)
+            ).fetchone()
+        return row[0], (orjson.loads(last[0]) if last else None)
+
+    def append(self, thread_id: str, start: int, messages: List[Dict[str, Any]], date: str, updated_at: str) -> int:
+        """
+        Writes `messages` at positions start.. and drops anything persisted beyond them
+        (start below the persisted count means the history was rewritten). Returns rows written.
+        """
+        rows = [(thread_id, start + i, encode_message(m)) for i, m in enumerate(messages)]
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT message_count FROM sessions WHERE thread_id = ?", (thread_id,)).fetchone()
+            if row and start < row[0]:
+                conn.execute("DELETE FROM messages WHERE thread_id = ? AND seq >= ?", (thread_id, start))
+                self.rewrites += 1
+            conn.executemany("INSERT OR REPLACE INTO messages (thread_id, seq, payload) VALUES (?, ?, ?)", rows)
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (thread_id, date, message_count, updated_at) VALUES (?, ?, ?, ?)",
+                (thread_id, date, start + len(rows), updated_at),
+            )
+            conn.commit()
+            self.appended += len(rows)
+        return len(rows)
+
+    def load(self, thread_id: str) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT payload FROM messages WHERE thread_id = ? ORDER BY seq", (thread_id,)
+            ).fetchall()
+        return [orjson.loads(row[0]) for row in rows]
+
+    def session_date(self, thread_id: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT date FROM sessions WHERE thread_id = ?", (thread_id,)).fetchone()
+        return row[0] if row else None
+
+    def threads_by_date(self, date: str) -> List[str]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT thread_id FROM sessions WHERE date = ? ORDER BY updated_at", (date,)).fetchall()
+        return [row[0] for row in rows]
+
+    def dates(self) -> List[str]:
+        """All dates with sessions, newest first."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT DISTINCT date FROM sessions ORDER BY date DESC").fetchall()
+        return [row[0] for row in rows]
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+            conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._connect() as conn:
+            threads = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        return {"backend": "sqlite", "threads": threads, "appended_messages": self.appended, "rewrites": self.rewrites}
+
+
+class JsonlSessionStore:
+    """
+    Append-log store: one `<thread_id>.jsonl` per thread, each line `[seq, message]`.
+    Replaying a line with seq below the current length truncates first, so a rewritten history is
+    just appended (`[seq, null]` marks a bare truncation). A thread's log is compacted to its live
+    lines once superseded lines outnumber them (and exceed `compact_min_lines`).
+    The index (per-thread date and counts, plus meta) is an index.json snapshot and an index.log
+    of `[section, key, value]` updates on top of it; each save appends one line, and the snapshot is
+    rewritten (and the log emptied) only once the log outgrows it.
+    """
+    def __init__(self, root_dir: str, compact_min_lines: int = 200):
+        self.root_dir = root_dir
+        self.compact_min_lines = compact_min_lines
+        self.index_path = os.path.join(root_dir, "index.json")
+        self.index_log_path = os.path.join(root_dir, "index.log")
+        self._index_log_lines = 0
+        self._lock = threading.Lock()
+        self.appended = 0
+        self.rewrites = 0
+        self.compactions = 0
+        os.makedirs(root_dir, exist_ok=True)
+        self._index: Dict[str, Any] = {"threads": {}, "meta": {}}
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "rb") as f:
+                    self._index = orjson.loads(f.read())
+            except Exception as e:
+                logger.error(f"Failed to load session log index: {e}")
+        try:
+            with open(self.index_log_path, "rb") as f:
+                for line in f:
+                    try:
+                        section, key, value = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        # Torn write from a crash
+                        continue
+                    self._index[section][key] = value
+                    self._index_log_lines += 1
+        except FileNotFoundError:
+            pass
+
+    @property
+    def location(self) -> str:
+        """Where the transcripts live (for logs and messages)."""
+        return self.root_dir
+
+    def _path(self, thread_id: str) -> str:
+        return os.path.join(self.root_dir, f"{thread_id.replace(os.sep, '_')}.jsonl")
+
+    def _write_atomic(self, path: str, data: bytes):
+        fd, tmp_path = tempfile.mkstemp(dir=self.root_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _save_index(self):
+        """Rewrites the snapshot and empties the log it now covers. Caller holds the lock."""
+        self._write_atomic(self.index_path, orjson.dumps(self._index))
+        open(self.index_log_path, "wb").close()
+        self._index_log_lines = 0
+
+    def _update_index(self, section: str, key: str, value: Any):
+        """Records one index change as a log line. Caller holds the lock."""
+        self._index[section][key] = value
+        with open(self.index_log_path, "ab") as f:
+            f.write(orjson.dumps([section, key, value]) + b"\n")
+        self._index_log_lines += 1
+        size = len(self._index["threads"]) + len(self._index["meta"])
+        if self._index_log_lines > max(size, self.compact_min_lines):
+            self._save_index()
+
+    def _replay(self, thread_id: str) -> List[Dict[str, Any]]:
+        messages: List[Dict[str, Any]] = []
+        try:
+            with open(self._path(thread_id), "rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    seq, message = orjson.loads(line)
+                    del messages[seq:]
+                    if message is not None:
+                        messages.append(message)
+        except FileNotFoundError:
+            pass
+        return messages
+
+    def _last_line(self, thread_id: str) -> Optional[bytes]:
+        """Last line of the log, read backwards from the end of the file."""
+        try:
+            with open(self._path(thread_id), "rb") as f:
+                f.seek(0, os.SEEK_END)
+                end = f.tell()
+                buf = b""
+                while end > 0:
+                    step = min(65536, end)
+                    end -= step
+                    f.seek(end)
+                    buf = f.read(step) + buf
+                    lines = buf.rstrip(b"\n").rsplit(b"\n", 1)
+                    if len(lines) == 2 or end == 0:
+                        return lines[-1]
+        except FileNotFoundError:
+            pass
+        return None
+
+    def tail(self, thread_id: str) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """(persisted message count, last persisted message)."""
+        entry = self._index["threads"].get(thread_id)
+        if not entry or not entry["message_count"]:
+            return 0, None
+        count = entry["message_count"]
+        line = self._last_line(thread_id)
+        if line:
+            seq, message = orjson.loads(line)
+            if seq == count - 1 and message is not None:
+                return count, message
+        # Log ends with a truncation: replay it
+        messages = self._replay(thread_id)
+        return len(messages), (messages[-1] if messages else None)
+
+    def append(self, thread_id: str, start: int, messages: List[Dict[str, Any]], date: str, updated_at: str) -> int:
+        """Appends `messages` at positions start.. (start below the persisted count rewrites the tail)."""
+        lines = [orjson.dumps([start + i, m], option=_DUMP_OPTIONS) + b"\n" for i, m in enumerate(messages)]
+        with self._lock:
+            entry = self._index["threads"].get(thread_id) or {"message_count": 0, "lines": 0}
+            if start < entry["message_count"]:
+                self.rewrites += 1
+                if not lines:
+                    lines = [orjson.dumps([start, None]) + b"\n"]
+            if lines:
+                with open(self._path(thread_id), "ab") as f:
+                    f.write(b"".join(lines))
+            entry.update({
+                "date": date,
+                "updated_at": updated_at,
+                "message_count": start + len(messages),
+                "lines": entry["lines"] + len(lines),
+            })
+            dead = entry["lines"] - entry["message_count"]
+            if dead > entry["message_count"] and dead > self.compact_min_lines:
+                self._compact(thread_id, entry)
+            self._update_index("threads", thread_id, entry)
+            self.appended += len(messages)
+        return len(messages)
+
+    def _compact(self, thread_id: str, entry: Dict[str, Any]):
+        """Rewrites a thread's log with only its live lines. Caller holds the lock."""
+        live = self._replay(thread_id)
+        self._write_atomic(self._path(thread_id), b"".join(
+            orjson.dumps([seq, m], option=_DUMP_OPTIONS) + b"\n" for seq, m in enumerate(live)
+        ))
+        entry["lines"] = entry["message_count"] = len(live)
+        self.compactions += 1
+        logger.debug(f"Compacted session log {thread_id} ({len(live)} live lines)")
+
+    def compact(self, thread_id: str):
+        with self._lock:
+            entry = self._index["threads"].get(thread_id)
+            if entry:
+                self._compact(thread_id, entry)
+                self._update_index("threads", thread_id, entry)
+
+    def load(self, thread_id: str) -> List[Dict[str, Any]]:
+        if thread_id not in self._index["threads"]:
+            return []
+        return self._replay(thread_id)
+
+    def session_date(self, thread_id: str) -> Optional[str]:
+        entry = self._index["threads"].get(thread_id)
+        return entry["date"] if entry else None
+
+    def threads_by_date(self, date: str) -> List[str]:
+        threads = [(e["updated_at"], t) for t, e in self._index["threads"].items() if e["date"] == date]
+        return [t for _, t in sorted(threads)]
+
+    def dates(self) -> List[str]:
+        """All dates with sessions, newest first."""
+        return sorted({e["date"] for e in self._index["threads"].values()}, reverse=True)
+
+    def get_meta(self, key: str) -> Optional[str]:
+        return self._index["meta"].get(key)
+
+    def set_meta(self, key: str, value: str):
+        with self._lock:
+            self._update_index("meta", key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "jsonl",
+            "threads": len(self._index["threads"]),
+            "appended_messages": self.appended,
+            "rewrites": self.rewrites,
+            "compactions": self.compactions,
+        }
+
+
+def create_session_store(backend: str, data_dir: str, compact_min_lines: int = 200):
+    """Session store for the configured backend ('sqlite' or 'jsonl')."""
+    if backend == "jsonl":
+        return JsonlSessionStore(os.path.join(data_dir, "session_logs"), compact_min_lines=compact_min_lines)
+    if backend != "sqlite":
+        logger.warning(f"Unknown session store backend '{backend}', using sqlite")
+    return SessionStore(os.path.join(data_dir, "sessions.db"))
@@ -1,145 +1,295 @@
 import os
+import json
+import time
+import heapq
+import shutil
 import logging
+import threading
 from typing import List, Dict, Any
-from langchain_community.document_loaders import DirectoryLoader, UnstructuredMarkdownLoader, TextLoader
+import numpy as np
+from langchain_core.documents import Document
+from langchain_community.document_loaders import TextLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import FAISS
 from app.core.settings import settings
 from app.agent.llm import get_embeddings
+from app.agent.keyword_matcher import keyword_matcher
+from app.services.embedding_cache import CachedEmbeddings
+from app.services.hybrid_search import BM25Index, reciprocal_rank_fusion
 
 logger = logging.getLogger(__name__)
 
 KNOWLEDGE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "knowledge", "travel")
 VECTOR_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "travel_index")
 
-HASH_FILE_PATH = os.path.join(VECTOR_DB_PATH, "hash.txt")
+MANIFEST_PATH = os.path.join(VECTOR_DB_PATH, "manifest.json")
+PARTITIONS_DIR = os.path.join(VECTOR_DB_PATH, "partitions")
+MANIFEST_VERSION = 2
+
+# Queries with these keyword_matcher features go only to the matching partition (relative knowledge file path)
+PARTITION_HINTS = {
+    "logistics.md": ("flight", "lodging"),
+}
 
 class TravelKnowledgeService:
+    """
+    FAISS-backed travel knowledge search, partitioned into one FAISS index per knowledge file.
+    Filtered queries search only the relevant partitions and merge their top-k, and a changed
+    file only rebuilds its own partition.
+    Construction is free; the partitions are loaded/synced by `warm_up` in a background thread
+    (started from the app lifespan or by the first search), so importing the app never
+    waits on hashing, index builds or the embedding provider.
+    """
     def __init__(self):
-        self.embeddings = get_embeddings(settings.LLM_EMBEDDING_MODEL)
-        self.vector_db = None
-        self._sync_index()
+        self.embeddings = None
+        self.text_splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
+        self.state = "idle"  # idle -> warming -> ready | failed
+        self.error: str | None = None
+        self.warmup_seconds: float | None = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._warmup_thread: threading.Thread | None = None
+        self._partitions: Dict[str, FAISS] = {}
+        self._chunks: Dict[str, tuple] = {}  # chunk id -> (partition, Document)
+        self._bm25 = BM25Index([])
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def warm_up(self) -> threading.Thread:
+        """Starts loading/syncing the index in the background (once; retried after a failure)."""
+        with self._lock:
+            if self._warmup_thread is None or (self.state == "failed" and not self._warmup_thread.is_alive()):
+                self.state = "warming"
+                self.error = None
+                self._warmup_thread = threading.Thread(target=self._initialize, name="travel-warmup", daemon=True)
+                self._warmup_thread.start()
+            return self._warmup_thread
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """Starts warm-up if needed and waits up to `timeout` seconds for it."""
+        if not self.is_ready:
+            self.warm_up()
+            self._ready.wait(timeout)
+        return self.is_ready
+
+    def _initialize(self):
+        started = time.perf_counter()
+        try:
+            self._sync_index()
+            if not self._partitions:
+                raise RuntimeError("travel index is empty")
+            self._build_lexical_index()
+            self.state = "ready"
+            self._ready.set()
+            logger.info(f"Travel knowledge ready in {time.perf_counter() - started:.2f}s ({len(self._partitions)} partitions)")
+        except Exception as e:
+            self.state = "failed"
+            self.error = str(e)
+            logger.error(f"Travel knowledge warm-up failed: {e}")
+        self.warmup_seconds = round(time.perf_counter() - started, 2)
 
-    def _calculate_knowledge_hash(self) -> str:
-        """Calculates a hash based on the content of all files in KNOWLEDGE_DIR."""
+    def _ensure_embeddings(self):
+        if self.embeddings is None:
+            # Query and chunk embeddings are served from the persistent cache when the text was seen before
+            self.embeddings = CachedEmbeddings(get_embeddings(settings.LLM_EMBEDDING_MODEL), settings.LLM_EMBEDDING_MODEL)
+        return self.embeddings
+
+    def status(self) -> Dict[str, Any]:
+        """Readiness for the status endpoint."""
+        return {
+            "state": self.state,
+            "ready": self.is_ready,
+            "partitions": {path: db.index.ntotal for path, db in self._partitions.items()},
+            "warmup_seconds": self.warmup_seconds,
+            "error": self.error,
+        }
+
+    def _file_hashes(self) -> Dict[str, str]:
+        """MD5 of every markdown file in KNOWLEDGE_DIR, keyed by path relative to it."""
         import hashlib
+        hashes = {}
         if not os.path.exists(KNOWLEDGE_DIR):
-            return ""
-        
-        hasher = hashlib.md5()
-        # Sort files to ensure deterministic hash
-        for root, _, files in sorted(os.walk(KNOWLEDGE_DIR)):
-            for file in sorted(files):
+            return hashes
+        for root, _, files in os.walk(KNOWLEDGE_DIR):
+            for file in files:
                 if file.endswith(".md"):
                     file_path = os.path.join(root, file)
+                    hasher = hashlib.md5()
                     with open(file_path, "rb") as f:
-                        # Include file path and content in hash
-                        hasher.update(file.encode())
                         while chunk := f.read(8192):
                             hasher.update(chunk)
-        return hasher.hexdigest()
-
-    def _get_stored_hash(self) -> str:
-        """Reads the stored hash from disk."""
-        if os.path.exists(HASH_FILE_PATH):
-            try:
-                with open(HASH_FILE_PATH, "r") as f:
-                    return f.read().strip()
-            except Exception:
-                pass
-        return ""
-
-    def _save_hash(self, current_hash: str):
-        """Saves the current hash to disk."""
-        os.makedirs(os.path.dirname(HASH_FILE_PATH), exist_ok=True)
-        with open(HASH_FILE_PATH, "w") as f:
-            f.write(current_hash)
-
-    def _sync_index(self):
-        """Synchronizes the vector index if documents have changed or index is missing."""
-        current_hash = self._calculate_knowledge_hash()
-        stored_hash = self._get_stored_hash()
-        index_exists = os.path.exists(VECTOR_DB_PATH)
-
-        if not index_exists or current_hash != stored_hash:
-            logger.info("Changes detected or index missing, rebuilding travel index...")
-            self.build_index()
-            self._save_hash(current_hash)
+                    hashes[os.path.relpath(file_path, KNOWLEDGE_DIR)] = hasher.hexdigest()
+        return hashes
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        """Reads {relative path: {'hash', 'chunk_ids'}} from disk; {} if missing or outdated."""
+        try:
+            with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION:
+                return manifest["files"]
+        except (OSError, ValueError, KeyError):
+            pass
+        return {}
+
+    def _save_manifest(self, files: Dict[str, Any]):
+        tmp_path = MANIFEST_PATH + ".tmp"
+        os.makedirs(VECTOR_DB_PATH, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "files": files}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, MANIFEST_PATH)
+
+    @staticmethod
+    def _partition_dir(relative_path: str) -> str:
+        return os.path.join(PARTITIONS_DIR, relative_path.replace(os.sep, "__"))
+
+    def _load_partition(self, relative_path: str) -> FAISS | None:
+        partition_dir = self._partition_dir(relative_path)
+        if not os.path.exists(os.path.join(partition_dir, "index.faiss")):
+            return None
+        try:
+            return FAISS.load_local(
+                partition_dir,
+                self.embeddings,
+                allow_dangerous_deserialization=True # Local file, trusted
+            )
+        except Exception as e:
+            logger.error(f"Failed to load travel partition {relative_path}: {e}")
+            return None
+
+    def _sync_index(self, rebuild: bool = False):
+        """Brings the partitions in line with KNOWLEDGE_DIR, re-embedding only files that changed."""
+        self._ensure_embeddings()
+        current = self._file_hashes()
+        files = {} if rebuild else self._load_manifest()
+        partitions: Dict[str, FAISS] = {}
+        changed = []
+        for path, digest in sorted(current.items()):
+            db = self._load_partition(path) if files.get(path, {}).get("hash") == digest else None
+            if db is None:
+                changed.append(path)
+            else:
+                partitions[path] = db
+        removed = [path for path in files if path not in current]
+
+        for path in changed:
+            chunks = self._load_chunks(path)
+            chunk_ids = [f"{path}::{i}" for i in range(len(chunks))]
+            files[path] = {"hash": current[path], "chunk_ids": chunk_ids}
+            if not chunks:
+                # Emptied file: drop its old vectors so they are not reloaded on the next start
+                shutil.rmtree(self._partition_dir(path), ignore_errors=True)
+                continue
+            # Unchanged chunks are served from the embedding cache
+            db = FAISS.from_documents(chunks, self.embeddings, ids=chunk_ids)
+            db.save_local(self._partition_dir(path))
+            partitions[path] = db
+        for path in removed:
+            files.pop(path, None)
+            shutil.rmtree(self._partition_dir(path), ignore_errors=True)
+
+        self._partitions = partitions
+        if changed or removed:
+            self._save_manifest(files)
+            logger.info(f"Travel knowledge synced: {len(changed)} partitions rebuilt, {len(removed)} removed, {len(partitions) - len(changed)} reused")
         else:
-            logger.info("No changes detected in knowledge base, loading existing travel index.")
-            self._load_vector_db()
-
-    def _load_vector_db(self):
-        """Loads the vector database from disk if it exists."""
-        if os.path.exists(VECTOR_DB_PATH):
-            try:
-                self.vector_db = FAISS.load_local(
-                    VECTOR_DB_PATH, 
-                    self.embeddings,
-                    allow_dangerous_deserialization=True # Local file, trusted
-                )
-                logger.info("Travel vector DB loaded from disk.")
-            except Exception as e:
-                logger.error(f"Failed to load travel vector DB: {e}")
-                self.vector_db = None
+            logger.info("No changes detected in knowledge base, loaded existing travel partitions.")
+
+    def _load_chunks(self, relative_path: str) -> List[Document]:
+        """Loads and splits one knowledge file into prefixed chunks."""
+        file_path = os.path.normpath(os.path.join(KNOWLEDGE_DIR, relative_path))
+        documents = TextLoader(file_path, encoding="utf-8").load()
+        for doc in documents:
+            doc.metadata["source"] = file_path
+        chunks = self.text_splitter.split_documents(documents)
+        # Add prefix for nomic-embed-text
+        for chunk in chunks:
+            chunk.page_content = f"search_document: {chunk.page_content}"
+        return chunks
 
     def build_index(self):
-        """Builds the vector index from documents in KNOWLEDGE_DIR."""
+        """Rebuilds every partition from the documents in KNOWLEDGE_DIR."""
         if not os.path.exists(KNOWLEDGE_DIR):
             logger.warning(f"Knowledge directory {KNOWLEDGE_DIR} does not exist.")
             return
-
         logger.info(f"Building travel index from {KNOWLEDGE_DIR}...")
-        
-        # Load markdown files
-        loader = DirectoryLoader(
-            KNOWLEDGE_DIR,
-            glob="**/*.md",
-            loader_cls=TextLoader,  # Using TextLoader for simplicity with MD
-            loader_kwargs={"encoding": "utf-8"},
-            show_progress=True,
+        self._sync_index(rebuild=True)
+        self._build_lexical_index()
+
+    def _build_lexical_index(self):
+        """Mirrors the partitions' docstores into one BM25 index."""
+        self._chunks = {}
+        for path, db in self._partitions.items():
+            for chunk_id in db.index_to_docstore_id.values():
+                doc = db.docstore.search(chunk_id)
+                if isinstance(doc, Document):
+                    self._chunks[chunk_id] = (path, doc)
+        self._bm25 = BM25Index(
+            (chunk_id, doc.page_content.removeprefix("search_document: "))
+            for chunk_id, (_, doc) in self._chunks.items()
         )
-        documents = loader.load()
-        
-        if not documents:
-            logger.warning("No documents found to index.")
-            return
 
-        # Split documents
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
-        chunks = text_splitter.split_documents(documents)
-        
+    def route(self, query: str) -> List[str] | None:
+        """Partitions a query should be limited to, or None to search all of them."""
+        features = keyword_matcher.features(query or "")
+        matched = [path for path, wanted in PARTITION_HINTS.items() if features.intersection(wanted)]
+        return matched or None
+
+    def _partitions_for(self, source_filter: str | None, partitions: List[str] | None) -> List[str]:
+        if source_filter:
+            partitions = [os.path.relpath(os.path.normpath(source_filter), KNOWLEDGE_DIR)]
+        if partitions is None:
+            return list(self._partitions)
+        return [path for path in partitions if path in self._partitions]
+
+    def _vector_ranking(self, query: str, n: int, partitions: List[str]) -> List[str]:
+        """Chunk ids by L2 distance, merged across the searched partitions."""
         # Add prefix for nomic-embed-text
-        for chunk in chunks:
-            chunk.page_content = f"search_document: {chunk.page_content}"
-        
-        # Create vector DB
-        self.vector_db = FAISS.from_documents(chunks, self.embeddings)
-        
-        # Save to disk
-        os.makedirs(os.path.dirname(VECTOR_DB_PATH), exist_ok=True)
-        self.vector_db.save_local(VECTOR_DB_PATH)
-        logger.info(f"Travel index built and saved with {len(chunks)} chunks.")
-
-    def search(self, query: str, k: int = 3, source_filter: str | None = None) -> List[Dict[str, Any]]:
-        """Searches the vector DB for relevant travel information."""
-        if not self.vector_db:
-            logger.warning("Travel vector DB not initialized.")
+        vector = np.array([self.embeddings.embed_query(f"search_query: {query}")], dtype=np.float32)
+        hits = []
+        for path in partitions:
+            db = self._partitions[path]
+            distances, positions = db.index.search(vector, min(n, db.index.ntotal))
+            id_map = db.index_to_docstore_id
+            hits.extend((float(d), id_map[p]) for d, p in zip(distances[0], positions[0]) if p != -1)
+        return [chunk_id for _, chunk_id in heapq.nsmallest(n, hits)]
+
+    def search(
+        self,
+        query: str,
+        k: int = 3,
+        source_filter: str | None = None,
+        mode: str = "hybrid",
+        partitions: List[str] | None = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Searches the travel knowledge base.
+        mode: 'hybrid' fuses BM25 and vector rankings with reciprocal rank fusion; 'vector' / 'bm25' use one side.
+        source_filter (absolute file path) or partitions (relative paths) limit the search to those partitions.
+        """
+        if not self.wait_ready(settings.TRAVEL_INDEX_WAIT_SECONDS):
+            logger.warning(f"Travel knowledge not ready (state: {self.state}).")
             return []
-            
-        # Add prefix for nomic-embed-text
-        formatted_query = f"search_query: {query}"
-        if source_filter:
-            results = self.vector_db.similarity_search_with_score(
-                formatted_query,
-                k=k,
-                filter={"source": source_filter},
-            )
-        else:
-            results = self.vector_db.similarity_search_with_score(formatted_query, k=k)
-        
+
+        selected = self._partitions_for(source_filter, partitions)
+        if not selected:
+            return []
+        allowed = None
+        if len(selected) < len(self._partitions):
+            allowed = {cid for cid, (path, _) in self._chunks.items() if path in selected}
+        # Each side contributes a deeper candidate list than k so fusion can reorder
+        depth = max(k * 4, 20)
+        rankings = []
+        if mode in ("hybrid", "bm25"):
+            rankings.append([cid for cid, _ in self._bm25.search(query, depth, allowed=allowed)])
+        if mode in ("hybrid", "vector"):
+            rankings.append(self._vector_ranking(query, depth, selected))
+
         formatted_results = []
-        for doc, score in results:
+        for chunk_id, score in reciprocal_rank_fusion(rankings)[:k]:
+            doc = self._chunks[chunk_id][1]
             formatted_results.append({
                 "content": doc.page_content,
                 "metadata": doc.metadata,
@@ -148,4 +298,5 @@ class TravelKnowledgeService:
             
         return formatted_results
 
+# Singleton instance (cheap; call warm_up() to load the index)
 travel_knowledge_service = TravelKnowledgeService()
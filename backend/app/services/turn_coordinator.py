@@ -0,0 +1,130 @@
+import time
+import asyncio
+import hashlib
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TurnCoordinator:
+    """
+    Serializes chat turns within a thread while letting different threads run in parallel.
+    Identical submissions for the same thread (e.g. a double-tap) are coalesced onto the turn
+    already in flight. Finished turns are only replayed for a client-supplied message id (a retry
+    of the same message), never by text: repeating "네" is a new turn.
+    """
+    def __init__(self, coalesce_window: float = 10.0):
+        self.coalesce_window = coalesce_window
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._depth: Dict[str, int] = {}  # turns holding or waiting for each thread's lock
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._recent: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._active = 0
+        self.turns_total = 0
+        self.coalesced_total = 0
+
+    @staticmethod
+    def _fingerprint(message: str) -> str:
+        return hashlib.sha1((message or "").strip().encode("utf-8")).hexdigest()
+
+    @property
+    def active_turns(self) -> int:
+        return self._active
+
+    def queue_depth(self, thread_id: str) -> int:
+        """Number of turns currently running or waiting on `thread_id`."""
+        return self._depth.get(thread_id, 0)
+
+    @asynccontextmanager
+    async def turn(self, thread_id: str):
+        """Holds the thread's turn lock for the duration of the block."""
+        lock = self._locks.setdefault(thread_id, asyncio.Lock())
+        self._depth[thread_id] = self._depth.get(thread_id, 0) + 1
+        try:
+            async with lock:
+                self._active += 1
+                self.turns_total += 1
+                try:
+                    yield
+                finally:
+                    self._active -= 1
+        finally:
+            self._depth[thread_id] -= 1
+            if self._depth[thread_id] == 0:
+                # Nobody else holds or awaits this lock, so it can be dropped
+                del self._depth[thread_id]
+                self._locks.pop(thread_id, None)
+
+    async def run(
+        self,
+        thread_id: str,
+        message: str,
+        factory: Callable[[], Awaitable[Any]],
+        should_cache: Optional[Callable[[Any], bool]] = None,
+        message_id: Optional[str] = None,
+    ) -> Any:
+        """
+        Runs `factory()` as the next turn of `thread_id`.
+        Duplicate submissions share the in-flight result: matched by `message_id` when the client
+        sends one, else by message text. Only `message_id` submissions reuse a finished result
+        (for `coalesce_window` seconds).
+        """
+        key = (thread_id, f"id:{message_id}" if message_id else self._fingerprint(message))
+        now = time.monotonic()
+        self._prune(now)
+
+        cached = self._recent.get(key) if message_id else None
+        if cached is not None:
+            self.coalesced_total += 1
+            logger.info(f"Coalesced duplicate turn for thread_id={thread_id} (recent result)")
+            return cached[1]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced_total += 1
+            logger.info(f"Coalesced duplicate turn for thread_id={thread_id} (in flight)")
+            return await asyncio.shield(task)
+
+        async def _turn():
+            async with self.turn(thread_id):
+                return await factory()
+
+        # Run detached from this caller so a disconnecting client does not cancel duplicates
+        task = asyncio.create_task(_turn())
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._on_turn_done(key, t, should_cache, remember=bool(message_id)))
+        return await asyncio.shield(task)
+
+    def _on_turn_done(self, key: Tuple[str, str], task: asyncio.Task,
+                      should_cache: Optional[Callable[[Any], bool]], remember: bool):
+        self._inflight.pop(key, None)
+        if not remember or task.cancelled() or task.exception() is not None:
+            return
+        result = task.result()
+        if should_cache is None or should_cache(result):
+            self._recent[key] = (time.monotonic(), result)
+
+    def _prune(self, now: float):
+        expired = [k for k, (ts, _) in self._recent.items() if now - ts > self.coalesce_window]
+        for k in expired:
+            del self._recent[k]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Queue metrics for the status endpoint."""
+        total = sum(self._depth.values())
+        return {
+            "active_turns": self._active,
+            "queued_turns": total - self._active,
+            "busy_threads": len(self._depth),
+            "max_thread_queue_depth": max(self._depth.values(), default=0),
+            "inflight_unique_turns": len(self._inflight),
+            "turns_total": self.turns_total,
+            "coalesced_total": self.coalesced_total,
+        }
+
+
+# Singleton instance
+turn_coordinator = TurnCoordinator(coalesce_window=settings.CHAT_COALESCE_WINDOW_SECONDS)
@@ -1,69 +1,133 @@
 from langchain_core.tools import tool
-from app.core.google_auth import get_calendar_service
+from app.core.google_auth import get_calendar_service, execute_batch
 from datetime import datetime, timedelta, timezone
 import json
+import heapq
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from app.core.datetime_utils import now_utc
+from app.services.calendar_cache import calendar_list_cache
+from app.core.settings import settings
+from app.services.event_store import event_store, to_utc_iso
+from app.services.event_index import event_index
+from app.services.registration_verifier import registration_verifier
+from app.services.context_manager import context_manager
 
 logger = logging.getLogger(__name__)
 
-def _get_selected_calendars(service) -> List[Dict[str, str]]:
-    """사용자가 관리(쓰기 이상)할 수 있는 캘린더 목록을 반환합니다."""
-    try:
-        calendar_list = service.calendarList().list(minAccessRole='reader').execute()
-        owned_and_writer_calendars = []
-        for item in calendar_list.get('items', []):
-            # 'owner' 또는 'writer' 권한이 있는 캘린더만 필터링
-            if item.get('accessRole') in ['owner', 'writer']:
-                owned_and_writer_calendars.append({
-                    'id': item['id'],
-                    'summary': item.get('summary', 'No Title')
-                })
-        
-        # 관리 가능한 캘린더가 없으면 primary를 기본값으로 사용
-        return owned_and_writer_calendars if owned_and_writer_calendars else [{'id': 'primary', 'summary': 'Primary'}]
-    except Exception as e:
-        logger.error(f"[CALENDAR] 캘린더 목록 조회 실패: {e}")
-        return [{'id': 'primary', 'summary': 'Primary'}]
+# Shared pool for per-calendar requests; long-lived so each worker keeps its service and connection
+_fetch_pool = ThreadPoolExecutor(max_workers=settings.CALENDAR_FETCH_CONCURRENCY, thread_name_prefix="calendar-fetch")
+
+def _get_selected_calendars(service, force_refresh: bool = False) -> List[Dict[str, str]]:
+    """사용자가 관리(쓰기 이상)할 수 있는 캘린더 목록을 반환합니다. (TTL/ETag 캐시 사용)"""
+    return calendar_list_cache.get(service, force_refresh=force_refresh)
+
+def _event_sort_key(event: Dict[str, Any]) -> str:
+    return event.get("start", {}).get("dateTime") or event.get("start", {}).get("date") or ""
+
+def _fetch_calendar_events(cal: Dict[str, str], list_kwargs: Dict[str, Any], service=None) -> List[Dict[str, Any]]:
+    """단일 캘린더 일정 조회 (워커 스레드에서는 스레드별 service 사용)"""
+    service = service or get_calendar_service()
+    if not service:
+        raise RuntimeError("Google Calendar 인증에 실패했습니다.")
+    items = service.events().list(calendarId=cal['id'], **list_kwargs).execute().get("items", [])
+    # 각 이벤트에 캘린더 정보 추가
+    for item in items:
+        item["_calendarName"] = cal['summary']
+    # orderBy=startTime already sorts by instant; re-sort by the merge key (nearly free on sorted input)
+    items.sort(key=_event_sort_key)
+    return items
+
+def _sync_calendar(calendar_id: str) -> bool:
+    service = get_calendar_service()
+    return bool(service) and event_store.sync_calendar(service, calendar_id)
+
+def _mirrored_calendars(calendar_ids: List[str], max_age: Optional[float] = None) -> set:
+    """
+    로컬 미러(event_store)에서 응답할 수 있는 캘린더 ID 집합.
+    Calendars not synced within `max_age` seconds get an incremental sync first (in parallel).
+    """
+    if not settings.CALENDAR_MIRROR_ENABLED:
+        return set()
+    if max_age is None:
+        max_age = settings.CALENDAR_SYNC_INTERVAL_SECONDS
+    ready = {cid for cid in calendar_ids if max_age > 0 and event_store.is_fresh(cid, max_age)}
+    stale = [cid for cid in calendar_ids if cid not in ready]
+    if len(stale) == 1:
+        if _sync_calendar(stale[0]):
+            ready.add(stale[0])
+    elif stale:
+        futures = [(cid, _fetch_pool.submit(_sync_calendar, cid)) for cid in stale]
+        ready.update(cid for cid, future in futures if future.result())
+    return ready
 
 def _fetch_events_from_calendars(
     service,
     calendars: List[Dict[str, str]],
     time_min: str,
     time_max: Optional[str] = None,
-    max_results: int = 250
+    max_results: int = 250,
+    starts_within: bool = False
 ) -> List[Dict[str, Any]]:
-    """여러 캘린더에서 일정을 조회하고 병합"""
-    all_events = []
-    
+    """
+    여러 캘린더에서 일정을 조회하고 시간순으로 병합 (로컬 미러 우선, 없으면 병렬 API 조회)
+    starts_within=True limits mirrored results to events starting inside the range.
+    """
+    mirrored = _mirrored_calendars([cal['id'] for cal in calendars])
+    per_calendar = []
+    remote = []
     for cal in calendars:
+        if cal['id'] in mirrored and event_store.covers(cal['id'], time_min):
+            if starts_within and time_max:
+                found = event_index.starting_between(cal['id'], time_min, time_max, max_results)
+            else:
+                found = event_index.overlapping(cal['id'], time_min, time_max, max_results)
+            # Copies: indexed events are shared across requests
+            items = [dict(item, _calendarName=cal['summary']) for item in found]
+            items.sort(key=_event_sort_key)
+            per_calendar.append(items)
+        else:
+            remote.append(cal)
+    if remote:
+        per_calendar.extend(_fetch_remote_events(service, remote, time_min, time_max, max_results))
+
+    # 시간순 병합 (k-way merge of already sorted per-calendar lists)
+    return list(heapq.merge(*per_calendar, key=_event_sort_key))
+
+def _fetch_remote_events(
+    service,
+    calendars: List[Dict[str, str]],
+    time_min: str,
+    time_max: Optional[str],
+    max_results: int
+) -> List[List[Dict[str, Any]]]:
+    """Google API에서 캘린더별 일정을 병렬로 조회 (캘린더별 정렬된 목록 반환)"""
+    list_kwargs = {
+        "timeMin": time_min,
+        "singleEvents": True,
+        "orderBy": "startTime",
+        "maxResults": max_results,
+    }
+    if time_max:
+        list_kwargs["timeMax"] = time_max
+
+    if len(calendars) == 1:
+        # No fan-out needed; reuse the caller's service
+        pending = [(calendars[0], lambda: _fetch_calendar_events(calendars[0], list_kwargs, service))]
+    else:
+        # googleapiclient/httplib2 are not thread-safe: workers use their own (cached) service
+        pending = [(cal, _fetch_pool.submit(_fetch_calendar_events, cal, list_kwargs).result) for cal in calendars]
+
+    per_calendar = []
+    for cal, result in pending:
         try:
-            kwargs = {
-                "calendarId": cal['id'],
-                "timeMin": time_min,
-                "singleEvents": True,
-                "orderBy": "startTime",
-                "maxResults": max_results,
-            }
-            if time_max:
-                kwargs["timeMax"] = time_max
-                
-            events_result = service.events().list(**kwargs).execute()
-            items = events_result.get("items", [])
-            
-            # 각 이벤트에 캘린더 정보 추가
-            for item in items:
-                item["_calendarName"] = cal['summary']
-                
-            all_events.extend(items)
+            per_calendar.append(result())
         except Exception as e:
+            # One failing calendar must not hide the others
             logger.error(f"[CALENDAR] {cal['summary']} 조회 실패: {e}")
             continue
-
-    # 시간순 정렬
-    all_events.sort(key=lambda x: x.get("start", {}).get("dateTime") or x.get("start", {}).get("date") or "")
-    return all_events
+    return per_calendar
 
 def _format_events(events: List[Dict[str, Any]], empty_message: str, label: Optional[str] = None) -> str:
     """이벤트 목록을 보기 좋은 문자열로 변환"""
@@ -155,14 +219,6 @@ def list_events(
     except Exception:
         return "날짜 형식이 올바르지 않습니다. 'YYYY-MM-DD' 형식으로 입력해주세요."
     
-    events = _fetch_events_from_calendars(
-        service=service,
-        calendars=calendars,
-        time_min=start.isoformat(),
-        time_max=end.isoformat(),
-        max_results=max_results
-    )
-    
     # FILTERING: If it's a single day request (end_date = start_date + 1 day),
     # explicitly filter list items to match the starting date to avoid edge-case leakage.
     is_single_day = False
@@ -172,6 +228,16 @@ def list_events(
     except:
         pass
 
+    events = _fetch_events_from_calendars(
+        service=service,
+        calendars=calendars,
+        time_min=start.isoformat(),
+        time_max=end.isoformat(),
+        max_results=max_results,
+        # Mirrored calendars answer "starts on this day" straight from the interval index
+        starts_within=is_single_day
+    )
+
     if is_single_day:
         filtered_events = []
         for ev in events:
@@ -190,6 +256,19 @@ def list_events(
     
     return _format_events(events, empty_msg, label)
 
+def _conflict_report(conflicts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """겹치는 기존 일정 요약 (없으면 빈 dict)"""
+    if not conflicts:
+        return {}
+    return {"conflicts": [
+        {
+            "summary": ev.get("summary", "(제목 없음)"),
+            "start": ev.get("start", {}).get("dateTime") or ev.get("start", {}).get("date"),
+            "eventId": ev.get("id"),
+        }
+        for ev in conflicts
+    ]}
+
 @tool
 def create_event(
     summary: str,
@@ -227,6 +306,7 @@ def create_event(
             except ValueError:
                 return f"❌ 시작 시간({start_time}) 형식이 잘못되었습니다. ISO 형식을 사용해주세요."
 
+        conflicts = []
         # Expert Recommendation: Check for duplicates before creation
         # Look for events with same summary and start time on the target calendar
         try:
@@ -243,21 +323,31 @@ def create_event(
             if check_start.endswith("+00:00"): check_start = check_start.replace("+00:00", "Z")
             if check_end.endswith("+00:00"): check_end = check_end.replace("+00:00", "Z")
 
-            existing_events = service.events().list(
-                calendarId=calendar_id,
-                timeMin=check_start,
-                timeMax=check_end,
-                singleEvents=True,
-                q=summary
-            ).execute().get('items', [])
-            
-            for e in existing_events:
-                if e.get('summary') == summary:
-                    e_start = e.get('start', {}).get('dateTime') or e.get('start', {}).get('date')
-                    # Simple check: string match or logic match
-                    if e_start and (e_start.startswith(start_time) or start_time in e_start):
-                         logger.info(f"Duplicate event detected: '{summary}' at {start_time} already exists on {calendar_id}.")
-                         return f"⚠️ 이미 동일한 일정('{summary}')이 해당 시간대에 존재합니다. 중복 등록을 방지했습니다."
+            if calendar_id in _mirrored_calendars([calendar_id]):
+                # Local index lookup; same title at the same instant counts as a duplicate
+                is_duplicate = bool(event_index.find_exact(calendar_id, summary, start_dt))
+                conflicts = event_index.conflicts(calendar_id, start_dt, end_time)
+            else:
+                existing_events = service.events().list(
+                    calendarId=calendar_id,
+                    timeMin=check_start,
+                    timeMax=check_end,
+                    singleEvents=True,
+                    q=summary
+                ).execute().get('items', [])
+
+                is_duplicate = False
+                for e in existing_events:
+                    if e.get('summary') == summary:
+                        e_start = e.get('start', {}).get('dateTime') or e.get('start', {}).get('date')
+                        # Simple check: string match or logic match
+                        if e_start and (e_start.startswith(start_time) or start_time in e_start):
+                            is_duplicate = True
+                            break
+
+            if is_duplicate:
+                logger.info(f"Duplicate event detected: '{summary}' at {start_time} already exists on {calendar_id}.")
+                return f"⚠️ 이미 동일한 일정('{summary}')이 해당 시간대에 존재합니다. 중복 등록을 방지했습니다."
         except Exception as e:
             logger.warning(f"Duplicate check failed (Safe Fail): {e}")
             # Proceed to create event even if check fails
@@ -272,54 +362,182 @@ def create_event(
         
         created_event = service.events().insert(calendarId=calendar_id, body=event).execute()
         event_id = created_event.get('id')
+        # Write-through so list/duplicate checks see it before the next sync
+        event_store.upsert_event(calendar_id, created_event)
         
-        # Immediate verification call to ensure it's on Google server
-        try:
-            # 1. Direct ID verification
-            verified_event = service.events().get(calendarId=calendar_id, eventId=event_id).execute()
-            
-            # 2. Deep verification: Search for the thread_id tag in recent events to ensure sync
-            is_deep_verified = False
-            if thread_id and verified_event:
-                # Search specifically for the tag in the last hour's events
-                time_min = (now_utc() - timedelta(hours=1)).isoformat().replace("+00:00", "Z")
-                search_res = service.events().list(
-                    calendarId=calendar_id, 
-                    q=thread_id, 
-                    timeMin=time_min,
-                    singleEvents=True
-                ).execute()
-                
-                found_events = search_res.get('items', [])
-                if any(e.get('id') == event_id for e in found_events):
-                    is_deep_verified = True
-                    logger.info(f"Deep Verified: Event {event_id} found in search with ThreadID tag.")
-
-            if verified_event:
-                logger.info(f"Verified event '{summary}' (ID: {event_id}) on calendar '{calendar_id}'")
-                return json.dumps({
-                    "status": "success", 
-                    "verified": True,
-                    "deep_verified": is_deep_verified,
-                    "summary": summary, 
-                    "calendar_id": calendar_id,
-                    "htmlLink": created_event.get('htmlLink'), 
-                    "eventId": event_id
-                }, ensure_ascii=False)
-        except Exception as v_err:
-            logger.warning(f"Immediate verification failed for event {event_id}: {v_err}")
-
+        # The insert response already carries the server-assigned id; any re-read follows the verify policy
+        verification = registration_verifier.after_insert(service, [{"calendar_id": calendar_id, "event_id": event_id}])
+        logger.info(f"Created event '{summary}' (ID: {event_id}) on calendar '{calendar_id}'")
         return json.dumps({
-            "status": "success", 
-            "verified": False,
-            "summary": summary, 
+            "status": "success",
+            "verification": verification.get(event_id, "trusted"),
+            "summary": summary,
             "calendar_id": calendar_id,
-            "htmlLink": created_event.get('htmlLink'), 
-            "eventId": event_id
+            "htmlLink": created_event.get('htmlLink'),
+            "eventId": event_id,
+            **_conflict_report(conflicts)
         }, ensure_ascii=False)
     except Exception as e:
         return f"❌ 일정 생성 중 오류 발생: {str(e)}"
 
+def _event_body(item: Dict[str, Any], thread_id: Optional[str]) -> Dict[str, Any]:
+    """create_event와 동일한 규칙으로 insert 본문 생성 (종료 시간 기본 1시간, ThreadID 태그)"""
+    summary = item.get("summary") or "(제목 없음)"
+    start_time = item.get("start_time")
+    if not start_time:
+        raise ValueError("start_time이 필요합니다.")
+    try:
+        start_dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f"시작 시간({start_time}) 형식이 잘못되었습니다. ISO 형식을 사용해주세요.")
+    end_time = item.get("end_time") or (start_dt + timedelta(hours=1)).isoformat()
+
+    description = item.get("description") or ""
+    if thread_id:
+        description = (description + f"\n\n[ThreadID: {thread_id}]").strip()
+    body = {
+        'summary': summary,
+        'start': {'dateTime': start_time, 'timeZone': 'Asia/Seoul'},
+        'end': {'dateTime': end_time, 'timeZone': 'Asia/Seoul'},
+    }
+    if description: body['description'] = description
+    if item.get("location"): body['location'] = item["location"]
+    return body
+
+def create_events(
+    service,
+    events: List[Dict[str, Any]],
+    calendar_id: str = "primary",
+    thread_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    여러 일정을 일괄 생성합니다.
+    Duplicates are checked with one range query per calendar (or the local index), inserts go out
+    as batched HTTP requests, and verification follows registration_verifier's policy.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(events)
+    pending = []
+    for i, item in enumerate(events):
+        cal_id = item.get("calendar_id") or calendar_id
+        try:
+            body = _event_body(item, thread_id)
+        except ValueError as e:
+            results[i] = {"summary": item.get("summary"), "status": "error", "calendar_id": cal_id, "error": str(e)}
+            continue
+        pending.append({
+            "index": i,
+            "calendar_id": cal_id,
+            "body": body,
+            "key": (cal_id, body['summary'], to_utc_iso(body['start'])),
+        })
+
+    # 1. Duplicate check: local index for mirrored calendars, one ranged list per other calendar
+    by_calendar: Dict[str, List[Dict[str, Any]]] = {}
+    for p in pending:
+        by_calendar.setdefault(p["calendar_id"], []).append(p)
+    mirrored = _mirrored_calendars(list(by_calendar))
+    existing = set()
+    range_requests = []
+    for cal_id, items in by_calendar.items():
+        if cal_id in mirrored:
+            existing.update(p["key"] for p in items if event_index.find_exact(cal_id, p["key"][1], p["key"][2]))
+            continue
+        starts = sorted(p["key"][2] for p in items if p["key"][2])
+        if not starts:
+            continue
+        time_min = datetime.fromisoformat(starts[0].replace('Z', '+00:00')) - timedelta(minutes=1)
+        time_max = datetime.fromisoformat(starts[-1].replace('Z', '+00:00')) + timedelta(minutes=1)
+        range_requests.append((cal_id, service.events().list(
+            calendarId=cal_id,
+            timeMin=time_min.isoformat().replace("+00:00", "Z"),
+            timeMax=time_max.isoformat().replace("+00:00", "Z"),
+            singleEvents=True,
+            maxResults=2500
+        )))
+    if range_requests:
+        for cal_id, (response, error) in execute_batch(service, range_requests).items():
+            if error:
+                # Safe fail: proceed without a duplicate check for this calendar
+                logger.warning(f"Duplicate check failed for {cal_id} (Safe Fail): {error}")
+                continue
+            for e in response.get('items', []):
+                existing.add((cal_id, e.get('summary'), to_utc_iso(e.get('start'))))
+
+    to_insert = []
+    seen = set()
+    for p in pending:
+        if p["key"] in existing or p["key"] in seen:
+            logger.info(f"Duplicate event detected: '{p['body']['summary']}' at {p['body']['start']['dateTime']} on {p['calendar_id']}.")
+            results[p["index"]] = {"summary": p["body"]['summary'], "status": "duplicate", "calendar_id": p["calendar_id"]}
+            continue
+        seen.add(p["key"])
+        if p["calendar_id"] in mirrored:
+            p["conflicts"] = event_index.conflicts(p["calendar_id"], p["body"]['start'], p["body"]['end'])
+        to_insert.append(p)
+
+    # 2. Batched inserts
+    inserted = execute_batch(service, [
+        (str(p["index"]), service.events().insert(calendarId=p["calendar_id"], body=p["body"]))
+        for p in to_insert
+    ])
+    created = []
+    for p in to_insert:
+        response, error = inserted.get(str(p["index"]), (None, RuntimeError("batch returned no response")))
+        if error or not response:
+            results[p["index"]] = {"summary": p["body"]['summary'], "status": "error", "calendar_id": p["calendar_id"], "error": str(error)}
+            continue
+        # Write-through so list/duplicate checks see it before the next sync
+        event_store.upsert_event(p["calendar_id"], response)
+        created.append((p, response))
+
+    # 3. Verification per policy (one batched re-read at most, never a tag search)
+    verification = registration_verifier.after_insert(service, [
+        {"calendar_id": p["calendar_id"], "event_id": response.get('id')} for p, response in created
+    ])
+
+    for p, response in created:
+        event_id = response.get('id')
+        results[p["index"]] = {
+            "summary": p["body"]['summary'],
+            "status": "success",
+            "verification": verification.get(event_id, "trusted"),
+            "calendar_id": p["calendar_id"],
+            "htmlLink": response.get('htmlLink'),
+            "eventId": event_id,
+            **_conflict_report(p.get("conflicts") or [])
+        }
+
+    failed = sum(1 for r in results if r["status"] == "error")
+    succeeded = sum(1 for r in results if r["status"] == "success")
+    logger.info(f"Batch create: {succeeded} created, {len(results) - succeeded - failed} duplicates, {failed} failed")
+    return {
+        "status": "error" if failed and not succeeded else ("partial" if failed else "success"),
+        "created": succeeded,
+        "failed": failed,
+        "results": results,
+    }
+
+@tool
+def create_events_batch(
+    events: List[Dict[str, Any]],
+    calendar_id: str = "primary",
+    thread_id: Optional[str] = None
+) -> str:
+    """
+    여러 일정을 한 번에 생성합니다. (회의 액션 아이템 일괄 등록 등)
+    Args:
+        events: 일정 목록. 각 항목은 'summary', 'start_time' 필수, 'end_time', 'calendar_id', 'description', 'location' 선택.
+        calendar_id: 항목에 calendar_id가 없을 때 사용할 캘린더 ID (기본 'primary')
+        thread_id: 세션 추적용 ID (옵션)
+    """
+    service = get_calendar_service()
+    if not service: return "Google Calendar 인증에 실패했습니다."
+
+    try:
+        return json.dumps(create_events(service, events, calendar_id, thread_id), ensure_ascii=False)
+    except Exception as e:
+        return f"❌ 일정 일괄 생성 중 오류 발생: {str(e)}"
+
 @tool
 def delete_event(
     event_id: Optional[str] = None, 
@@ -410,6 +628,7 @@ def delete_event(
     try:
         logging.info(f"캘린더({calendar_id})에서 이벤트({event_id}) 삭제 시도...")
         service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
+        event_store.remove_event(calendar_id, event_id)
         return f"✓ 일정(ID: {event_id})이 성공적으로 삭제되었습니다."
     except Exception as e:
         logging.error(f"일정 삭제({event_id}) 실패: {e}")
@@ -456,23 +675,52 @@ def verify_calendar_registrations(thread_id: str) -> str:
     
     calendars = _get_selected_calendars(service)
     results = []
-    
+
+    # Events this thread registered; ones already checked by the verifier need no further lookups
+    recorded = context_manager.get_recent_events(thread_id, limit=100)
+    names = {cal['id']: cal.get('summary', 'Unknown') for cal in calendars}
+    settled = set()
+    for ev in recorded:
+        status = registration_verifier.status(ev["event_id"]) or ev.get("verification")
+        if status == "verified":
+            settled.add(ev["event_id"])
+            results.append({
+                "summary": ev.get("summary"),
+                "calendar": names.get(ev.get("calendar_id"), ev.get("calendar_id") or 'Unknown'),
+                "status": "Deep Verified",
+                "id": ev["event_id"]
+            })
+    if recorded and len(settled) == len(recorded):
+        return json.dumps({"status": "success", "results": results}, ensure_ascii=False)
+    # Only search the calendars the thread actually wrote to (all of them if nothing was recorded)
+    target_ids = {ev.get("calendar_id") for ev in recorded if ev["event_id"] not in settled}
+    if target_ids:
+        calendars = [cal for cal in calendars if cal['id'] in target_ids] or [{'id': cid, 'summary': cid} for cid in target_ids]
+
     # 최근 1시간 내의 일정을 검색 (ThreadID 태그 포함)
     kst = timezone(timedelta(hours=9))
     time_min = (datetime.now(kst) - timedelta(hours=1)).isoformat()
     query = f"[ThreadID: {thread_id}]"
     
+    # Force an incremental sync so the mirror reflects what Google has right now
+    mirrored = _mirrored_calendars([cal['id'] for cal in calendars], max_age=0)
+
     for cal in calendars:
         try:
-            res = service.events().list(
-                calendarId=cal['id'],
-                q=query,
-                timeMin=time_min,
-                singleEvents=True
-            ).execute()
-            
-            items = res.get('items', [])
+            if cal['id'] in mirrored:
+                items = event_store.search_description(cal['id'], query, time_min=time_min)
+            else:
+                res = service.events().list(
+                    calendarId=cal['id'],
+                    q=query,
+                    timeMin=time_min,
+                    singleEvents=True
+                ).execute()
+                items = res.get('items', [])
+
             for item in items:
+                if item.get('id') in settled:
+                    continue
                 results.append({
                     "summary": item.get('summary'),
                     "calendar": cal.get('summary', 'Unknown'),
@@ -0,0 +1,81 @@
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+import statistics
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langgraph.checkpoint.memory import MemorySaver
+from app.agent.graph import build_workflow, get_graph, clear_graph_cache
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger("BenchGraphCompile")
+
+
+def _summarize(label: str, samples: list[float]) -> None:
+    samples_ms = sorted(s * 1000 for s in samples)
+    p99 = samples_ms[min(len(samples_ms) - 1, int(len(samples_ms) * 0.99))]
+    print(
+        f"{label:<28} n={len(samples_ms):<5} mean={statistics.mean(samples_ms):8.3f}ms "
+        f"p50={statistics.median(samples_ms):8.3f}ms p99={p99:8.3f}ms"
+    )
+
+
+def bench_recompile(checkpointer, iterations: int) -> list[float]:
+    """Old behaviour: build and compile the workflow on every request."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        build_workflow().compile(checkpointer=checkpointer)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_registry(checkpointer, iterations: int) -> list[float]:
+    """New behaviour: look up the graph compiled once at startup."""
+    clear_graph_cache()
+    get_graph(checkpointer=checkpointer)  # startup warm-up
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        get_graph(checkpointer=checkpointer)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def bench_concurrent(checkpointer, concurrency: int, use_registry: bool) -> float:
+    """Wall time for `concurrency` simultaneous requests obtaining their graph."""
+    async def one_request():
+        if use_registry:
+            get_graph(checkpointer=checkpointer)
+        else:
+            build_workflow().compile(checkpointer=checkpointer)
+        await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_request() for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-request graph compile overhead.")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    checkpointer = MemorySaver()
+
+    _summarize("before (compile per request)", bench_recompile(checkpointer, args.iterations))
+    _summarize("after (compiled registry)", bench_registry(checkpointer, args.iterations))
+
+    before = asyncio.run(bench_concurrent(checkpointer, args.concurrency, use_registry=False))
+    after = asyncio.run(bench_concurrent(checkpointer, args.concurrency, use_registry=True))
+    print(f"{args.concurrency} concurrent requests: before={before*1000:.1f}ms after={after*1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import os
+import sys
+import time
+import argparse
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.agent import keyword_matcher as km
+
+CORPUS = [
+    "안녕하세요!",
+    "오늘 일정 알려줘",
+    "내일 오후 3시에 치과 예약 일정 추가해줘",
+    "이번 주 회의 스케줄 보여줘",
+    "오사카 항공편 시간 알려줘",
+    "KIX 도착하면 호텔까지 어떻게 가?",
+    "e-ticket 예약번호 확인해줘",
+    "간사이 공항 수하물 규정이 뭐야?",
+    "회의록 정리해서 액션 아이템 뽑아줘",
+    "Can you add a meeting with Alex tomorrow at 10am?",
+    "What's on my calendar this week?",
+    "When does my flight to Osaka board and which gate?",
+    "Summarize this transcript and list the action items.",
+    "thanks, that's all",
+    "다음 주 월요일 팀 미팅 잡아줘. 장소는 3층 회의실",
+    "여행 일정 중에 렌터카 반납 시간이 언제였지?",
+]
+
+
+def _naive_scan(message: str) -> dict:
+    """The pre-matcher behaviour: every heuristic lowercases and scans its own table."""
+    text = message.lower()
+    return {
+        "travel": any(h in text for h in km.TRAVEL_ROUTER_HINTS) or any(p.search(text) for p in km.TRAVEL_ROUTER_REGEX),
+        "calendar_only": any(h in text for h in km.CALENDAR_ONLY_HINTS),
+        "calendar_force": any(h in text for h in km.CALENDAR_FORCE_HINTS),
+        "calendar_create": any(h in text for h in km.CALENDAR_CREATE_HINTS),
+        "flight": any(h in text for h in km.FLIGHT_HINTS),
+        "lodging": any(h in text for h in km.LODGING_HINTS),
+        "travel_fact": any(h in text for h in km.TRAVEL_FACT_HINTS),
+        "complex": any(h in text for h in km.ROUTER_COMPLEX_HINTS),
+        "meeting_notes": any(h in text for h in km.MEETING_NOTES_HINTS),
+    }
+
+
+def _bench(label: str, fn, messages, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for message in messages:
+            fn(message)
+    elapsed = time.perf_counter() - start
+    per_call = elapsed / (rounds * len(messages)) * 1e6
+    print(f"{label:<28} {per_call:>8.2f} us/message")
+    return per_call
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Router keyword matching micro-benchmark.")
+    parser.add_argument("--rounds", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=1, help="Repeat each prompt N times to simulate long messages")
+    args = parser.parse_args()
+
+    messages = [" ".join([m] * args.repeat) for m in CORPUS]
+
+    # Sanity check: the matcher must agree with the per-table scans
+    for message in messages:
+        expected = {name for name, hit in _naive_scan(message).items() if hit}
+        actual = set(km.keyword_matcher.features(message))
+        assert expected == actual, f"{message!r}: {expected} != {actual}"
+
+    naive = _bench("per-table any() scans", _naive_scan, messages, args.rounds)
+    uncached = _bench("trie regex (uncached)", km.keyword_matcher._scan, messages, args.rounds)
+    cached = _bench("trie regex (cached)", km.keyword_matcher.features, messages, args.rounds)
+    print(f"speedup: {naive / uncached:.1f}x uncached, {naive / cached:.1f}x cached")
+
+
+if __name__ == "__main__":
+    main()
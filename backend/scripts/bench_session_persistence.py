@@ -0,0 +1,70 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import logging
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langchain_core.messages import AIMessage, HumanMessage, message_to_dict
+import app.services.memory as memory_module
+from app.services.memory import MemoryService
+from app.services.session_store import create_session_store
+
+logging.basicConfig(level=logging.WARNING)
+
+# A meeting-transcript sized turn
+TRANSCRIPT_LINE = "[10:02] 김민수: 다음 분기 로드맵 초안은 금요일까지 공유하고, 디자인 리뷰는 화요일 오후로 잡겠습니다. "
+
+
+def _legacy_save(root: str, thread_id: str, messages):
+    """The pre-store behaviour: the whole history re-serialized into one JSON file per turn."""
+    path = os.path.join(root, f"{thread_id}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"messages": [message_to_dict(m) for m in messages]}, f, ensure_ascii=False, indent=2)
+
+
+def run(modes, turns: int, checkpoints, line_repeat: int):
+    print(f"Turn latency (ms) vs thread length, {turns} turns, ~{len(TRANSCRIPT_LINE) * line_repeat} chars per user message")
+    print(f"{'mode':<8} " + " ".join(f"{n:>8}" for n in checkpoints) + f" {'total s':>9}")
+    for mode in modes:
+        with tempfile.TemporaryDirectory() as tmp:
+            if mode == "json":
+                save = lambda thread_id, messages: _legacy_save(tmp, thread_id, messages)
+            else:
+                # Keep the one-time legacy import away from the real data directory
+                memory_module.SESSIONS_DIR = os.path.join(tmp, "sessions")
+                service = MemoryService(
+                    profile_path=os.path.join(tmp, "user_profile.json"),
+                    session_store=create_session_store(mode, tmp),
+                )
+                save = service.save_session
+
+            history = []
+            latencies = {}
+            started = time.perf_counter()
+            for turn in range(1, turns + 1):
+                history.append(HumanMessage(content=TRANSCRIPT_LINE * line_repeat))
+                history.append(AIMessage(content=f"회의록 {turn} 정리 완료: 액션 아이템 3개"))
+                start = time.perf_counter()
+                save("bench-thread", history)
+                elapsed = (time.perf_counter() - start) * 1000
+                if len(history) in checkpoints:
+                    latencies[len(history)] = elapsed
+            total = time.perf_counter() - started
+        row = " ".join(f"{latencies[n]:>8.2f}" if n in latencies else f"{'-':>8}" for n in checkpoints)
+        print(f"{mode:<8} {row} {total:>9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Session save latency as a thread grows: full JSON rewrite vs incremental stores")
+    parser.add_argument("--modes", nargs="+", default=["json", "sqlite", "jsonl"], choices=["json", "sqlite", "jsonl"])
+    parser.add_argument("--turns", type=int, default=500)
+    parser.add_argument("--checkpoints", type=int, nargs="+", default=[10, 100, 250, 500, 1000],
+                        help="thread lengths (messages) at which the turn latency is reported")
+    parser.add_argument("--line-repeat", type=int, default=20, help="transcript lines per user message")
+    args = parser.parse_args()
+    run(args.modes, args.turns, sorted(set(args.checkpoints)), args.line_repeat)
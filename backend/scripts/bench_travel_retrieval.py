@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+import argparse
+import logging
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.travel import travel_knowledge_service
+
+logging.basicConfig(level=logging.WARNING)
+
+# (question, source file, text the relevant chunk must contain)
+LABELED_QUESTIONS = [
+    ("KE721 출발 시간이 언제야?", "logistics.md", "KE721"),
+    ("예약 번호 알려줘", "logistics.md", "ABC123XYZ"),
+    ("PNR ABC123XYZ 항공편 정보", "logistics.md", "ABC123XYZ"),
+    ("수하물 몇 kg까지 돼?", "logistics.md", "23kg"),
+    ("호텔 주소가 어디야?", "logistics.md", "Nishi-Shinsaibashi"),
+    ("호텔 체크아웃 몇 시야?", "logistics.md", "Check-out"),
+    ("What is the hotel phone number?", "logistics.md", "6244-1111"),
+    ("When do we go to Universal Studios?", "itinerary.md", "USJ"),
+    ("오사카성은 몇 일차에 가?", "itinerary.md", "Osaka Castle"),
+    ("마지막 날 공항 가는 방법", "itinerary.md", "Haruka Express"),
+    ("구로몬 시장에서 뭐 먹어?", "restaurants.md", "Kuromon"),
+    ("Where can I get takoyaki?", "restaurants.md", "Takoyaki"),
+    ("551 Horai pork buns", "restaurants.md", "551 Horai"),
+    ("오코노미야키 맛집 추천", "restaurants.md", "Okonomiyaki"),
+]
+
+
+def _hit(results, source, needle) -> bool:
+    return any(
+        os.path.basename(r["metadata"].get("source", "")) == source and needle in r["content"]
+        for r in results
+    )
+
+
+def run(modes, k: int, repeat: int, routed: bool):
+    print(f"Warming up travel index ({len(LABELED_QUESTIONS)} labeled questions, k={k})...")
+    if not travel_knowledge_service.wait_ready(timeout=300):
+        print(f"Travel index not ready: {travel_knowledge_service.status()}")
+        return
+
+    print(f"{'mode':<8} {'recall@' + str(k):>9} {'mrr':>6} {'p50 ms':>8} {'p95 ms':>8}")
+    for mode in modes:
+        hits = 0
+        reciprocal_ranks = 0.0
+        latencies = []
+        for question, source, needle in LABELED_QUESTIONS:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                partitions = travel_knowledge_service.route(question) if routed else None
+                results = travel_knowledge_service.search(question, k=k, mode=mode, partitions=partitions)
+                latencies.append((time.perf_counter() - start) * 1000)
+            if _hit(results, source, needle):
+                hits += 1
+            for rank, result in enumerate(results, start=1):
+                if _hit([result], source, needle):
+                    reciprocal_ranks += 1 / rank
+                    break
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2]
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        n = len(LABELED_QUESTIONS)
+        print(f"{mode:<8} {hits / n:>9.2f} {reciprocal_ranks / n:>6.2f} {p50:>8.2f} {p95:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recall/latency of travel retrieval modes over a labeled question set")
+    parser.add_argument("--modes", nargs="+", default=["bm25", "vector", "hybrid"], choices=["bm25", "vector", "hybrid"])
+    parser.add_argument("-k", type=int, default=3)
+    parser.add_argument("--routed", action="store_true", help="limit each question to its routed partitions, as search_travel_info does")
+    parser.add_argument("--repeat", type=int, default=5, help="searches per question (query embeddings are cached after the first)")
+    args = parser.parse_args()
+    run(args.modes, args.k, args.repeat, args.routed)
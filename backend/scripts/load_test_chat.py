@@ -0,0 +1,103 @@
+import os
+import sys
+import time
+import uuid
+import asyncio
+import logging
+import argparse
+from unittest.mock import patch
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger("LoadTestChat")
+
+ROUTER_JSON = '{"mode": "answer", "reasoning": "small talk"}'
+PLANNER_JSON = '{"mode": "plan", "assistant_message": "안녕하세요!", "language": "ko", "needs_confirmation": false}'
+
+
+class SimulatedLLM:
+    """Stands in for the Ollama model: every generation takes `latency` seconds."""
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def with_fallbacks(self, fallbacks):
+        return self
+
+    def _respond(self, prompt) -> AIMessage:
+        first = prompt[0].content if isinstance(prompt, list) else str(prompt)
+        return AIMessage(content=ROUTER_JSON if "ROUTER" in first else PLANNER_JSON)
+
+    def invoke(self, prompt, *args, **kwargs):
+        time.sleep(self.latency)
+        return self._respond(prompt)
+
+    async def ainvoke(self, prompt, *args, **kwargs):
+        await asyncio.sleep(self.latency)
+        return self._respond(prompt)
+
+
+async def run_in_process(concurrency: int, turns: int, latency: float) -> float:
+    """Drives the compiled graph directly with a simulated LLM. Returns turns/sec."""
+    from app.agent.graph import get_graph
+
+    graph = get_graph()
+    llm = SimulatedLLM(latency)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_turn():
+        async with semaphore:
+            config = {"configurable": {"thread_id": f"load-{uuid.uuid4()}"}}
+            await graph.ainvoke({"messages": [HumanMessage(content="안녕, 반가워!")]}, config=config)
+
+    with patch("app.agent.graph.get_llm", return_value=llm), \
+         patch("app.agent.graph.memory_service.get_user_profile", return_value={"facts": {}, "history": []}):
+        start = time.perf_counter()
+        await asyncio.gather(*(one_turn() for _ in range(turns)))
+        elapsed = time.perf_counter() - start
+    return turns / elapsed
+
+
+async def run_http(url: str, concurrency: int, turns: int) -> float:
+    """Drives a running server's /api/chat endpoint. Returns turns/sec."""
+    import httpx
+
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=600) as client:
+        async def one_turn():
+            async with semaphore:
+                response = await client.post("/api/chat", json={"message": "안녕, 반가워!", "thread_id": f"load-{uuid.uuid4()}"})
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one_turn() for _ in range(turns)))
+        elapsed = time.perf_counter() - start
+    return turns / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chat throughput vs. concurrency.")
+    parser.add_argument("--url", help="Base URL of a running backend. Omit to test the graph in-process.")
+    parser.add_argument("--levels", default="1,2,4,8,16,32,64", help="Comma separated concurrency levels")
+    parser.add_argument("--turns-per-level", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.5, help="Simulated seconds per LLM call (in-process only)")
+    args = parser.parse_args()
+
+    levels = [int(x) for x in args.levels.split(",")]
+    baseline = None
+    print(f"{'concurrency':>11} {'turns/s':>9} {'speedup':>8}")
+    for level in levels:
+        turns = max(args.turns_per_level, level)
+        if args.url:
+            throughput = asyncio.run(run_http(args.url, level, turns))
+        else:
+            throughput = asyncio.run(run_in_process(level, turns, args.latency))
+        baseline = baseline or throughput
+        print(f"{level:>11} {throughput:>9.2f} {throughput / baseline:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,7 @@ os.environ["LLM_BASE_URL"] = "http://localhost:11434"
 os.environ["GOOGLE_API_KEY"] = "dummy"
 
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 import logging
 import shutil
 import json
@@ -69,7 +69,7 @@ class TestMeetingSummaryIntegration(unittest.IsolatedAsyncioTestCase):
         mock_get_llm.return_value = mock_llm
         
         # 1. Router Mock
-        mock_llm.invoke.side_effect = [
+        mock_llm.ainvoke = AsyncMock(side_effect=[
             # Router Response
             MagicMock(content='{"mode": "complex", "reasoning": "Meeting summary is complex"}'),
             # Planner Response (Execute summarize_meeting_notes)
@@ -78,7 +78,7 @@ class TestMeetingSummaryIntegration(unittest.IsolatedAsyncioTestCase):
             MagicMock(content='{"proposed_action": {"tool": "summarize_meeting_notes", "args": {"meeting_notes": "test note"}}}'),
             # Second Planner Response (After tool result) - this is the one that sets needs_confirmation
             # Note: The actual graph logic uses json.loads(last_tool_msg.content), so we need to mock tool output too.
-        ]
+        ])
         
         # We need to mock the tool execution result for the planner to pick up
         # In a real graph run, the tool node executes the tool.
@@ -123,7 +123,7 @@ class TestMeetingSummaryIntegration(unittest.IsolatedAsyncioTestCase):
         
         # Invoke planner node directly to verify logic
         from app.agent.graph import planner
-        result = planner(state)
+        result = await planner(state, config)
         
         self.assertTrue(result["needs_confirmation"])
         self.assertIn("등록하시겠습니까?", result["messages"][0].content)
@@ -137,13 +137,12 @@ class TestMeetingSummaryIntegration(unittest.IsolatedAsyncioTestCase):
         mock_get_llm.return_value = mock_llm
         
         # Router & Planner Mocks for the 'Yes' turn
-        # Reset the mock to ensure fresh side_effects
-        mock_llm.invoke = MagicMock() # Changed from self.mock_provider.invoke to mock_llm.invoke
-        mock_llm.invoke.side_effect = [ # Changed from self.mock_provider.invoke to mock_llm.invoke
+        # Reset the mock to ensure fresh side_effects; the executor calls the fallback-wrapped runnable
+        mock_llm.with_fallbacks.return_value.ainvoke = AsyncMock(side_effect=[
             # Executor is the ONLY node that calls LLM here 
             # (Router and Planner skip LLM during confirmation flow)
             MagicMock(content='{"proposed_actions": [{"tool": "create_event", "args": {"summary": "테스트 미팅", "start_time": "2026-01-20T10:00:00"}}]}')
-        ]
+        ])
         
         from app.agent.state import AgentState
         state = AgentState(
@@ -161,7 +160,7 @@ class TestMeetingSummaryIntegration(unittest.IsolatedAsyncioTestCase):
         from app.agent.graph import executor_node
         # Note: executor_node takes (state, config)
         config = {"configurable": {"thread_id": "test"}}
-        result = executor_node(state, config)
+        result = await executor_node(state, config)
         
         tool_calls = result["messages"][0].tool_calls
         self.assertEqual(len(tool_calls), 1)
@@ -1,4 +1,5 @@
 import os
+import asyncio
 import pytest
 from langchain_core.messages import HumanMessage
 
@@ -15,6 +16,6 @@ def _state_with_user_message(text: str):
 )
 def test_router_travel_query_live():
     state = _state_with_user_message("osaka flight time")
-    result = router_node(state)
+    result = asyncio.run(router_node(state, {}))
 
     assert result["router_mode"] == "complex"
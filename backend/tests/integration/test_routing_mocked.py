@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from unittest.mock import patch
 from langchain_core.messages import HumanMessage
@@ -17,6 +18,9 @@ class DummyLLM:
     def invoke(self, prompt):
         return DummyResponse(self._content)
 
+    async def ainvoke(self, prompt):
+        return self.invoke(prompt)
+
 
 def _state_with_user_message(text: str):
     return {"messages": [HumanMessage(content=text)]}
@@ -35,7 +39,7 @@ def test_router_overrides_answer_for_travel(mock_get_llm, _mock_profile):
     mock_get_llm.return_value = DummyLLM('{"mode":"answer","reasoning":"chat"}')
 
     state = _state_with_user_message("osaka flight time")
-    result = router_node(state)
+    result = asyncio.run(router_node(state, {}))
 
     assert result["router_mode"] == "complex"
 
@@ -46,6 +50,22 @@ def test_router_keeps_answer_for_non_travel(mock_get_llm, _mock_profile):
     mock_get_llm.return_value = DummyLLM('{"mode":"answer","reasoning":"chat"}')
 
     state = _state_with_user_message("hello there")
-    result = router_node(state)
+    result = asyncio.run(router_node(state, {}))
 
     assert result["router_mode"] == "answer"
+
+
+@patch("app.agent.graph.memory_service.get_user_profile", return_value={})
+@patch("app.agent.graph.get_llm")
+def test_router_fast_path_skips_llm(mock_get_llm, mock_profile):
+    for text, expected in [
+        ("안녕하세요!", "answer"),
+        ("내일 오후 3시에 치과 일정 추가해줘", "simple"),
+        ("오사카 항공편 시간 알려줘", "complex"),
+        ("회의록 정리해서 액션 아이템 뽑아줘", "complex"),
+    ]:
+        result = asyncio.run(router_node(_state_with_user_message(text), {}))
+        assert result["router_mode"] == expected, text
+
+    mock_get_llm.assert_not_called()
+    mock_profile.assert_not_called()
@@ -19,6 +19,9 @@ class DummyLLM:
     def invoke(self, prompt):
         return DummyResponse(self._content)
 
+    async def ainvoke(self, prompt):
+        return self.invoke(prompt)
+
 
 @patch("app.tools.travel_tools.travel_knowledge_service.search")
 @patch(
@@ -1,5 +1,6 @@
+import asyncio
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from app.agent.graph import executor_node
 from app.agent.state import AgentState
 from app.agent.schemas import ExecutorResponse, ProposedAction
@@ -27,9 +28,9 @@ def test_executor_node_prevents_duplicates():
          patch("app.agent.graph.get_calendar_service") as mock_get_service, \
          patch("app.agent.graph._get_selected_calendars") as mock_get_cals:
         
-        # Mock LLM invoke
+        # Mock LLM invoke (the node calls the fallback-wrapped runnable)
         mock_llm = MagicMock()
-        mock_llm.invoke.return_value = mock_response
+        mock_llm.with_fallbacks.return_value.ainvoke = AsyncMock(return_value=mock_response)
         mock_get_llm.return_value = mock_llm
         
         # Mock calendar mapping
@@ -38,7 +39,7 @@ def test_executor_node_prevents_duplicates():
         # Execute node
         # Note: We need to pass a mock config as well
         config = {"configurable": {"thread_id": "test_thread"}}
-        result = executor_node(state, config)
+        result = asyncio.run(executor_node(state, config))
         
         tool_calls = result["messages"][0].tool_calls
         
@@ -53,5 +54,40 @@ def test_executor_node_prevents_duplicates():
         assert tool_calls[0]["args"]["summary"] == "Original"
         assert tool_calls[0]["args"]["calendar_id"] == "ws_id" # Case-insensitive check verified here too
 
+def test_executor_node_batches_multiple_creates():
+    state = {
+        "messages": [HumanMessage(content="응, 등록해줘")],
+        "intent_summary": "Confirm and register all pending_calendar_events",
+        "pending_calendar_events": [{"suggested_calendar_title": "A"}, {"suggested_calendar_title": "B"}]
+    }
+    mock_response = MagicMock()
+    mock_response.content = """
+    {
+        "proposed_actions": [
+            {"tool": "create_event", "args": {"summary": "A", "start_time": "2026-01-20T10:00:00"}},
+            {"tool": "create_event", "args": {"summary": "B", "start_time": "2026-01-21T14:00:00"}}
+        ],
+        "reasoning": "Register action items"
+    }
+    """
+
+    with patch("app.agent.graph.get_llm") as mock_get_llm, \
+         patch("app.agent.graph.get_calendar_service"), \
+         patch("app.agent.graph._get_selected_calendars") as mock_get_cals:
+        mock_llm = MagicMock()
+        mock_llm.with_fallbacks.return_value.ainvoke = AsyncMock(return_value=mock_response)
+        mock_get_llm.return_value = mock_llm
+        mock_get_cals.return_value = [{"summary": "[WS] Inc.", "id": "ws_id"}]
+
+        config = {"configurable": {"thread_id": "test_thread"}}
+        result = asyncio.run(executor_node(state, config))
+
+    tool_calls = result["messages"][0].tool_calls
+    assert len(tool_calls) == 1
+    assert tool_calls[0]["name"] == "create_events_batch"
+    assert tool_calls[0]["args"]["thread_id"] == "test_thread"
+    assert [e["summary"] for e in tool_calls[0]["args"]["events"]] == ["A", "B"]
+    assert all(e["calendar_id"] == "ws_id" for e in tool_calls[0]["args"]["events"])
+
 if __name__ == "__main__":
     pytest.main([__file__])
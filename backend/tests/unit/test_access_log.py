@@ -0,0 +1,57 @@
+import asyncio
+import logging
+
+from app.core.access_log import AccessLogMiddleware
+
+
+async def streaming_app(scope, receive, send):
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            break
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    for part in (b"data: one\n\n", b"data: two\n\n"):
+        await send({"type": "http.response.body", "body": part, "more_body": True})
+    await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def _run(middleware, request_chunks):
+    scope = {"type": "http", "method": "POST", "path": "/api/chat/stream"}
+    incoming = [{"type": "http.request", "body": c, "more_body": i < len(request_chunks) - 1} for i, c in enumerate(request_chunks)]
+    sent = []
+
+    async def receive():
+        return incoming.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(middleware(scope, receive, send))
+    return sent
+
+
+def test_messages_pass_through_unbuffered(caplog):
+    middleware = AccessLogMiddleware(streaming_app, body_sample_rate=0.0)
+
+    with caplog.at_level(logging.INFO, logger="app.access"):
+        sent = _run(middleware, [b'{"message": ', b'"hi"}'])
+
+    # Each body chunk is forwarded as its own message
+    assert [m.get("body") for m in sent[1:]] == [b"data: one\n\n", b"data: two\n\n", b""]
+    response_line = caplog.records[-1].getMessage()
+    assert "200 POST /api/chat/stream" in response_line
+    assert "req=17B resp=22B" in response_line
+    assert "Body" not in response_line
+
+
+def test_sampled_bodies_are_truncated(caplog):
+    middleware = AccessLogMiddleware(streaming_app, body_sample_rate=1.0, max_body_bytes=8)
+
+    with caplog.at_level(logging.INFO, logger="app.access"):
+        _run(middleware, [b'{"message": "hello"}'])
+
+    response_line = caplog.records[-1].getMessage()
+    assert 'Request Body: {"messag...(truncated, 20 bytes total)' in response_line
+    assert "Response Body: data: on...(truncated, 22 bytes total)" in response_line
@@ -0,0 +1,101 @@
+import os
+import json
+import asyncio
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.analysis_queue import AnalysisQueue
+
+
+class TestAnalysisQueue(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.queue_path = os.path.join(self.tmpdir.name, "analysis_queue.json")
+        self.service = MagicMock()
+        self.service.load_session.side_effect = lambda thread_id: [f"{thread_id}-latest"]
+        self.analyzer = MagicMock()
+        self.analyzer.analyze_and_update = AsyncMock(return_value=True)
+        self.busy = False
+        self.queue = self._make_queue()
+
+    async def asyncTearDown(self):
+        await self.queue.stop()
+        self.tmpdir.cleanup()
+
+    def _make_queue(self, **kwargs):
+        options = dict(service=self.service, analyzer=self.analyzer, queue_path=self.queue_path,
+                       debounce_seconds=0.05, max_pending=2, retry_base_seconds=0.01,
+                       idle_poll_seconds=0.01, is_busy=lambda: self.busy)
+        options.update(kwargs)
+        return AnalysisQueue(**options)
+
+    async def _drain(self, timeout: float = 2.0):
+        deadline = asyncio.get_running_loop().time() + timeout
+        while (self.queue._jobs or self.queue.running) and asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(0.01)
+
+    async def test_burst_of_turns_is_analyzed_once(self):
+        for _ in range(5):
+            self.queue.submit("t1")
+        await self._drain()
+
+        self.analyzer.analyze_and_update.assert_awaited_once_with(["t1-latest"], thread_id="t1")
+        stats = self.queue.snapshot()
+        self.assertEqual((stats["processed"], stats["coalesced"], stats["pending"]), (1, 4, 0))
+
+    async def test_queue_is_bounded(self):
+        for thread_id in ("a", "b", "c"):
+            self.queue.submit(thread_id)
+        self.assertEqual(set(self.queue._jobs), {"b", "c"})
+        self.assertEqual(self.queue.snapshot()["dropped"], 1)
+
+    async def test_waits_for_active_chat_turns(self):
+        self.busy = True
+        self.queue.submit("t1")
+        await asyncio.sleep(0.15)
+        self.analyzer.analyze_and_update.assert_not_awaited()
+        self.assertGreater(self.queue.snapshot()["yielded_to_chat"], 0)
+
+        self.busy = False
+        await self._drain()
+        self.analyzer.analyze_and_update.assert_awaited_once()
+
+    async def test_failed_analysis_is_retried_then_dropped(self):
+        self.analyzer.analyze_and_update.return_value = False
+        self.queue.submit("t1")
+        await self._drain()
+
+        self.assertEqual(self.analyzer.analyze_and_update.await_count, 3)
+        stats = self.queue.snapshot()
+        self.assertEqual((stats["retries"], stats["failed"], stats["processed"]), (2, 1, 0))
+
+    async def test_empty_transcript_is_not_retried(self):
+        self.service.load_session.side_effect = lambda thread_id: []
+        self.queue.submit("t1")
+        await self._drain()
+
+        self.analyzer.analyze_and_update.assert_not_awaited()
+        self.assertEqual(self.service.load_session.call_count, 1)
+        stats = self.queue.snapshot()
+        self.assertEqual((stats["skipped"], stats["retries"], stats["failed"], stats["pending"]), (1, 0, 0, 0))
+
+    async def test_pending_jobs_survive_restart(self):
+        self.queue = self._make_queue(debounce_seconds=60)
+        self.queue.submit("t1")
+        await self.queue.stop()
+        with open(self.queue_path, encoding="utf-8") as f:
+            self.assertIn("t1", json.load(f))
+
+        self.queue = self._make_queue(debounce_seconds=60)
+        await self.queue.start()
+        self.assertEqual(self.queue.snapshot()["pending"], 1)
+        # Restored jobs keep their original due time; make it due now
+        self.queue._jobs["t1"]["due"] = 0
+        self.queue._wakeup.set()
+        await self._drain()
+        self.analyzer.analyze_and_update.assert_awaited_once_with(["t1-latest"], thread_id="t1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from app.services.context_manager import ContextManager
+from app.services.registration_verifier import RegistrationVerifier
+from app.tools.calendar import create_events
+
+
+class Request:
+    def __init__(self, kind, **kwargs):
+        self.kind = kind
+        self.kwargs = kwargs
+
+
+class FakeBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        self.service.batches.append([r.kind for _, r in self.requests])
+        for request_id, request in self.requests:
+            try:
+                self.callback(request_id, self.service.handle(request), None)
+            except Exception as e:
+                self.callback(request_id, None, e)
+
+
+class FakeService:
+    """Calendar service stand-in: every call must go through a batch."""
+    def __init__(self, existing=None, fail_summaries=()):
+        self.existing = existing or []
+        self.fail_summaries = set(fail_summaries)
+        self.created = {}
+        self.batches = []
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+    def events(self):
+        return self
+
+    def list(self, **kwargs):
+        return Request("list", **kwargs)
+
+    def insert(self, **kwargs):
+        return Request("insert", **kwargs)
+
+    def get(self, **kwargs):
+        return Request("get", **kwargs)
+
+    def handle(self, request):
+        if request.kind == "list":
+            return {"items": self.existing}
+        if request.kind == "insert":
+            body = request.kwargs["body"]
+            if body["summary"] in self.fail_summaries:
+                raise RuntimeError("rate limited")
+            event_id = f"id-{len(self.created)}"
+            self.created[event_id] = dict(body, id=event_id)
+            return self.created[event_id]
+        return self.created[request.kwargs["eventId"]]
+
+
+@patch("app.tools.calendar._mirrored_calendars", return_value=set())
+@patch("app.tools.calendar.event_store")
+class TestCreateEventsBatch(unittest.TestCase):
+    def setUp(self):
+        verifier = RegistrationVerifier(mode="sync", reporter=MagicMock())
+        self.verifier_patch = patch("app.tools.calendar.registration_verifier", verifier)
+        self.verifier_patch.start()
+
+    def tearDown(self):
+        self.verifier_patch.stop()
+
+    def test_dedupes_inserts_and_verifies_in_batches(self, _store, _mirror):
+        service = FakeService(existing=[
+            {"id": "old", "summary": "Kickoff", "start": {"dateTime": "2026-01-20T10:00:00+09:00"}},
+        ])
+        events = [
+            {"summary": "Kickoff", "start_time": "2026-01-20T10:00:00"},
+            {"summary": "Design review", "start_time": "2026-01-21T14:00:00", "end_time": "2026-01-21T15:00:00"},
+            {"summary": "Design review", "start_time": "2026-01-21T14:00:00"},
+            {"summary": "Retro", "start_time": "2026-01-22T16:00:00", "calendar_id": "team"},
+            {"summary": "Broken", "start_time": "not-a-date"},
+        ]
+
+        result = create_events(service, events, calendar_id="primary", thread_id="t-1")
+
+        statuses = [r["status"] for r in result["results"]]
+        self.assertEqual(statuses, ["duplicate", "success", "duplicate", "success", "error"])
+        self.assertEqual(result["status"], "partial")
+        self.assertEqual(result["created"], 2)
+        self.assertTrue(all(r["verification"] == "verified" for r in result["results"] if r["status"] == "success"))
+        self.assertEqual(result["results"][3]["calendar_id"], "team")
+        self.assertIn("[ThreadID: t-1]", service.created["id-0"]["description"])
+        # dedupe lists, inserts, verification gets: three batched round trips
+        self.assertEqual(len(service.batches), 3)
+        self.assertEqual(service.batches[1], ["insert", "insert"])
+
+    def test_insert_failures_are_reported_per_item(self, _store, _mirror):
+        service = FakeService(fail_summaries={"B"})
+        result = create_events(service, [
+            {"summary": "A", "start_time": "2026-01-20T10:00:00"},
+            {"summary": "B", "start_time": "2026-01-20T11:00:00"},
+        ])
+        self.assertEqual([r["status"] for r in result["results"]], ["success", "error"])
+        self.assertIn("rate limited", result["results"][1]["error"])
+
+
+class TestContextManagerAddEvents(unittest.TestCase):
+    def test_add_events_in_one_call(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manager = ContextManager(db_path=os.path.join(tmpdir, "context.db"))
+            manager.add_events("t-1", [
+                {"event_id": "a", "summary": "A", "calendar_id": "primary"},
+                {"event_id": "b", "summary": "B", "calendar_id": "team"},
+            ])
+            recent = manager.get_recent_events("t-1")
+            self.assertEqual([e["event_id"] for e in recent], ["b", "a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
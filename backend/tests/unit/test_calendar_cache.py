@@ -0,0 +1,99 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from app.services.calendar_cache import CalendarListCache
+
+
+class NotModified(Exception):
+    def __init__(self):
+        super().__init__("304 Not Modified")
+        self.resp = MagicMock(status=304)
+
+
+def _service(*responses):
+    """Fake Calendar service whose calendarList().list().execute() yields `responses` in order."""
+    service = MagicMock()
+    requests = []
+
+    def make_request(**kwargs):
+        request = MagicMock()
+        request.headers = {}
+        outcome = responses[len(requests)]
+        if isinstance(outcome, Exception):
+            request.execute.side_effect = outcome
+        else:
+            request.execute.return_value = outcome
+        requests.append(request)
+        return request
+
+    service.calendarList.return_value.list.side_effect = make_request
+    return service, requests
+
+
+LISTING = {
+    "etag": '"v1"',
+    "items": [
+        {"id": "me@example.com", "summary": "Me", "accessRole": "owner"},
+        {"id": "team", "summary": "Team", "accessRole": "writer"},
+        {"id": "holidays", "summary": "Holidays", "accessRole": "reader"},
+    ],
+}
+
+
+@patch("app.services.calendar_cache.get_auth_generation", return_value=1)
+class TestCalendarListCache(unittest.TestCase):
+    def test_hit_within_ttl(self, _gen):
+        cache = CalendarListCache(ttl_seconds=60)
+        service, requests = _service(LISTING)
+
+        first = cache.get(service)
+        second = cache.get(service)
+
+        self.assertEqual(first, [{"id": "me@example.com", "summary": "Me"}, {"id": "team", "summary": "Team"}])
+        self.assertEqual(first, second)
+        self.assertEqual(len(requests), 1)
+        self.assertEqual((cache.stats()["hits"], cache.stats()["misses"]), (1, 1))
+
+    def test_expired_entry_revalidates_with_etag(self, _gen):
+        cache = CalendarListCache(ttl_seconds=0)
+        service, requests = _service(LISTING, NotModified())
+
+        first = cache.get(service)
+        second = cache.get(service)
+
+        self.assertEqual(first, second)
+        self.assertEqual(requests[1].headers["If-None-Match"], '"v1"')
+        self.assertEqual(cache.stats()["revalidated"], 1)
+
+    def test_auth_change_drops_entry(self, gen):
+        cache = CalendarListCache(ttl_seconds=60)
+        service, requests = _service(LISTING, {"items": []})
+
+        cache.get(service)
+        gen.return_value = 2
+        calendars = cache.get(service)
+
+        self.assertEqual(calendars, [{"id": "primary", "summary": "Primary"}])
+        self.assertNotIn("If-None-Match", requests[1].headers)
+
+    def test_error_falls_back_without_caching(self, _gen):
+        cache = CalendarListCache(ttl_seconds=60)
+        service, requests = _service(RuntimeError("boom"), LISTING)
+
+        self.assertEqual(cache.get(service), [{"id": "primary", "summary": "Primary"}])
+        self.assertEqual(len(cache.get(service)), 2)
+        self.assertEqual(cache.stats()["errors"], 1)
+
+    def test_refresh_forces_fetch(self, _gen):
+        cache = CalendarListCache(ttl_seconds=60)
+        service, requests = _service(LISTING, LISTING)
+
+        cache.get(service)
+        cache.refresh(service)
+
+        self.assertEqual(len(requests), 2)
+        self.assertNotIn("If-None-Match", requests[1].headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from app.tools.calendar import _fetch_events_from_calendars
+
+
+class FakeRequest:
+    def __init__(self, result, delay):
+        self.result = result
+        self.delay = delay
+
+    def execute(self):
+        time.sleep(self.delay)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class FakeEvents:
+    def __init__(self, by_calendar, delay):
+        self.by_calendar = by_calendar
+        self.delay = delay
+
+    def list(self, calendarId, **kwargs):
+        return FakeRequest(self.by_calendar[calendarId], self.delay)
+
+
+class FakeService:
+    def __init__(self, by_calendar, delay=0.0):
+        self._events = FakeEvents(by_calendar, delay)
+
+    def events(self):
+        return self._events
+
+
+def _event(summary, start):
+    key = "date" if len(start) == 10 else "dateTime"
+    return {"summary": summary, "start": {key: start}}
+
+
+@patch("app.tools.calendar._mirrored_calendars", return_value=set())
+class TestParallelCalendarFetch(unittest.TestCase):
+    def test_fetches_concurrently_and_merges_in_order(self, _mirror):
+        by_calendar = {
+            "work": {"items": [_event("standup", "2025-12-24T09:00:00+09:00"), _event("review", "2025-12-24T15:00:00+09:00")]},
+            "home": {"items": [_event("holiday", "2025-12-24"), _event("dinner", "2025-12-24T19:00:00+09:00")]},
+            "team": {"items": [_event("sync", "2025-12-24T11:00:00+09:00")]},
+            "broken": RuntimeError("403 forbidden"),
+        }
+        service = FakeService(by_calendar, delay=0.2)
+        calendars = [{"id": cid, "summary": cid.title()} for cid in by_calendar]
+
+        with patch("app.tools.calendar.get_calendar_service", return_value=service):
+            start = time.perf_counter()
+            events = _fetch_events_from_calendars(service, calendars, time_min="2025-12-24T00:00:00+09:00")
+            elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual([e["summary"] for e in events], ["holiday", "standup", "sync", "review", "dinner"])
+        self.assertEqual(events[0]["_calendarName"], "Home")
+
+    def test_single_calendar_uses_callers_service(self, _mirror):
+        service = FakeService({"primary": {"items": [_event("solo", "2025-12-24T10:00:00+09:00")]}})
+        with patch("app.tools.calendar.get_calendar_service", side_effect=AssertionError("not needed")):
+            events = _fetch_events_from_calendars(service, [{"id": "primary", "summary": "Primary"}], time_min="x")
+        self.assertEqual([e["summary"] for e in events], ["solo"])
+
+
+class TestMirroredCalendarFetch(unittest.TestCase):
+    def test_mirrored_calendars_are_read_locally(self):
+        service = FakeService({"remote": {"items": [_event("remote", "2025-12-24T10:00:00+09:00")]}})
+        calendars = [{"id": "local", "summary": "Local"}, {"id": "remote", "summary": "Remote"}]
+
+        with patch("app.tools.calendar._mirrored_calendars", return_value={"local"}), \
+             patch("app.tools.calendar.event_store") as store, \
+             patch("app.tools.calendar.event_index") as index:
+            store.covers.return_value = True
+            index.overlapping.return_value = [_event("mirrored", "2025-12-24T09:00:00+09:00")]
+            events = _fetch_events_from_calendars(service, calendars, time_min="2025-12-24T00:00:00+09:00")
+
+        index.overlapping.assert_called_once_with("local", "2025-12-24T00:00:00+09:00", None, 250)
+        self.assertNotIn("_calendarName", index.overlapping.return_value[0])
+        self.assertEqual([(e["summary"], e["_calendarName"]) for e in events], [("mirrored", "Local"), ("remote", "Remote")])
+
+
+if __name__ == "__main__":
+    unittest.main()
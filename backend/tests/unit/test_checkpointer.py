@@ -0,0 +1,24 @@
+import asyncio
+import os
+
+from app.services.checkpointer import CheckpointerService
+
+
+def test_checkpointer_opens_single_wal_connection(tmp_path):
+    db_path = os.path.join(tmp_path, "nested", "checkpoints.db")
+    service = CheckpointerService(db_path=db_path)
+
+    async def scenario():
+        saver = await service.start()
+        # Starting twice must reuse the same connection
+        assert await service.start() is saver
+
+        async with saver.conn.execute("PRAGMA journal_mode") as cursor:
+            row = await cursor.fetchone()
+        await service.stop()
+        return row[0]
+
+    journal_mode = asyncio.run(scenario())
+
+    assert journal_mode.lower() == "wal"
+    assert os.path.exists(db_path)
@@ -0,0 +1,39 @@
+import os
+import tempfile
+import unittest
+
+from app.services.context_manager import ContextManager
+
+
+class TestContextManager(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.manager = ContextManager(db_path=os.path.join(self.tmpdir.name, "context.db"))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_verification_recorded_before_the_event_row_is_kept(self):
+        # The background verifier can finish before the tool logs the created event
+        self.manager.set_verification("e1", "verified", calendar_id="work")
+        self.manager.add_events("t1", [{"event_id": "e1", "summary": "Standup", "calendar_id": "work"}])
+
+        events = self.manager.get_recent_events("t1")
+        self.assertEqual([(e["event_id"], e["verification"]) for e in events], [("e1", "verified")])
+
+    def test_verification_is_updated_per_calendar(self):
+        self.manager.add_event("t1", "e1", "Standup")
+        self.manager.add_event("t1", "e1", "Standup", calendar_id="work")
+        self.assertIsNone(self.manager.get_recent_events("t1")[0]["verification"])
+
+        self.manager.set_verification("e1", "failed")
+        self.manager.set_verification("e1", "missing")
+        self.manager.set_verification("e1", "verified", calendar_id="work")
+
+        events = self.manager.get_recent_events("t1")
+        self.assertEqual([(e["calendar_id"], e["verification"]) for e in events],
+                         [("work", "verified"), ("primary", "missing")])
+
+
+if __name__ == "__main__":
+    unittest.main()
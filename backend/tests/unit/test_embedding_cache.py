@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from app.services.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+
+def _fake_base():
+    base = MagicMock()
+    base.embed_documents.side_effect = lambda texts: [[float(len(t)), 0.5, -1.25] for t in texts]
+    base.embed_query.side_effect = lambda text: [float(len(text)), 1.0, 2.0]
+    return base
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = EmbeddingCache(db_path=os.path.join(self.tmpdir.name, "embeddings.db"))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_reindexing_unchanged_chunks_costs_no_calls(self):
+        base = _fake_base()
+        embeddings = CachedEmbeddings(base, "nomic", cache=self.cache)
+        texts = ["search_document: a", "search_document: bb", "search_document: a"]
+
+        first = embeddings.embed_documents(texts)
+        self.assertEqual(base.embed_documents.call_args[0][0], ["search_document: a", "search_document: bb"])
+
+        # A fresh wrapper over the same store (e.g. after a restart) embeds only the new chunk
+        embeddings = CachedEmbeddings(base, "nomic", cache=EmbeddingCache(self.cache.db_path))
+        second = embeddings.embed_documents(texts + ["search_document: ccc"])
+        self.assertEqual(base.embed_documents.call_count, 2)
+        self.assertEqual(base.embed_documents.call_args[0][0], ["search_document: ccc"])
+        self.assertEqual(second[:3], first)
+
+    def test_repeated_query_is_cached_per_model(self):
+        base = _fake_base()
+        embeddings = CachedEmbeddings(base, "nomic", cache=self.cache)
+        self.assertEqual(embeddings.embed_query("search_query: 도쿄"), embeddings.embed_query("search_query: 도쿄"))
+        self.assertEqual(base.embed_query.call_count, 1)
+
+        CachedEmbeddings(base, "other-model", cache=self.cache).embed_query("search_query: 도쿄")
+        self.assertEqual(base.embed_query.call_count, 2)
+
+    def test_vectors_round_trip_as_float32(self):
+        self.cache.put_many("m", ["x"], [[0.1, 2.0, -3.5]])
+        vector = self.cache.get_many("m", ["x", "y"])
+        self.assertAlmostEqual(vector[0][0], 0.1, places=6)
+        self.assertEqual(vector[0][1:], [2.0, -3.5])
+        self.assertIsNone(vector[1])
+        self.assertEqual(self.cache.stats()["entries"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
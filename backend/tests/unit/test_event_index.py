@@ -0,0 +1,93 @@
+import random
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from app.services.event_index import IntervalIndex
+
+
+def _iso(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _random_events(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    base = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    events = []
+    for i in range(count):
+        start = base + timedelta(minutes=30 * rng.randrange(0, 2000))
+        # Mostly short meetings, some multi-day events
+        duration = timedelta(minutes=30 * rng.randrange(1, 5)) if rng.random() < 0.9 else timedelta(days=rng.randrange(1, 4))
+        events.append((_iso(start), _iso(start + duration), {"id": f"e{i}", "summary": f"event {i % 17}"}))
+    return events
+
+
+class TestIntervalIndex(unittest.TestCase):
+    def test_overlap_matches_brute_force(self):
+        events = _random_events(500)
+        index = IntervalIndex(events)
+        rng = random.Random(1)
+        base = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        for _ in range(200):
+            lo = base + timedelta(hours=rng.randrange(0, 1000))
+            hi = lo + timedelta(hours=rng.randrange(1, 48))
+            expected = sorted(
+                (e for e in events if e[1] > _iso(lo) and e[0] < _iso(hi)),
+                key=lambda e: e[0],
+            )
+            actual = index.overlapping(_iso(lo), _iso(hi))
+            self.assertEqual(sorted(e["id"] for e in actual), sorted(e[2]["id"] for e in expected))
+            self.assertEqual([e["id"] for e in index.overlapping(_iso(lo), _iso(hi), limit=3)], [e["id"] for e in actual[:3]])
+
+    def test_open_ended_and_start_range_queries(self):
+        events = [
+            ("2030-01-01T00:00:00Z", "2030-01-03T00:00:00Z", {"id": "trip", "summary": "Trip"}),
+            ("2030-01-02T01:00:00Z", "2030-01-02T02:00:00Z", {"id": "call", "summary": "Call"}),
+            ("2030-01-05T01:00:00Z", "2030-01-05T02:00:00Z", {"id": "later", "summary": "Later"}),
+        ]
+        index = IntervalIndex(events)
+
+        self.assertEqual([e["id"] for e in index.overlapping("2030-01-02T00:00:00Z")], ["trip", "call", "later"])
+        self.assertEqual([e["id"] for e in index.starting_between("2030-01-02T00:00:00Z", "2030-01-03T00:00:00Z")], ["call"])
+        self.assertEqual([e["id"] for e in index.find_exact("Call", "2030-01-02T01:00:00Z")], ["call"])
+        self.assertEqual(index.find_exact("Call", "2030-01-02T01:30:00Z"), [])
+
+    def test_incremental_changes_match_a_fresh_build(self):
+        events = {e[2]["id"]: e for e in _random_events(300)}
+        index = IntervalIndex(list(events.values()))
+        rng = random.Random(3)
+        fresh_events = _random_events(200, seed=11)
+        for step in range(150):
+            changes = []
+            for _ in range(rng.randrange(1, 4)):
+                if rng.random() < 0.4 and events:
+                    event_id = rng.choice(sorted(events))
+                    del events[event_id]
+                    changes.append(("delete", event_id))
+                else:
+                    start, end, event = rng.choice(fresh_events)
+                    event = {**event, "id": rng.choice([event["id"], f"e{rng.randrange(300)}"])}
+                    events[event["id"]] = (start, end, event)
+                    changes.append(("upsert", (start, end, event)))
+            previous = index
+            index = index.with_changes(changes)
+            expected = IntervalIndex(list(events.values()))
+            self.assertEqual(len(index), len(expected))
+            for lo, hi in (("2030-01-05T00:00:00Z", "2030-01-12T00:00:00Z"), ("2030-02-01T00:00:00Z", None)):
+                self.assertEqual(sorted(e["id"] for e in index.overlapping(lo, hi)), sorted(e["id"] for e in expected.overlapping(lo, hi)))
+                limited = [e["id"] for e in index.overlapping(lo, hi, limit=5)]
+                self.assertEqual(len(limited), len(expected.overlapping(lo, hi, limit=5)))
+            self.assertEqual(
+                sorted(e["id"] for e in index.starting_between("2030-01-03T00:00:00Z", "2030-01-20T00:00:00Z", limit=10)),
+                sorted(e["id"] for e in expected.starting_between("2030-01-03T00:00:00Z", "2030-01-20T00:00:00Z", limit=10)),
+            )
+        # Earlier snapshots are untouched by later changes
+        self.assertIsNot(previous, index)
+
+    def test_empty_index(self):
+        index = IntervalIndex([])
+        self.assertEqual(index.overlapping("2030-01-01T00:00:00Z"), [])
+        self.assertEqual(index.starting_between("2030-01-01T00:00:00Z", "2030-01-02T00:00:00Z"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import os
+import tempfile
+import unittest
+
+from app.services.event_index import EventIndex
+from app.services.event_store import EventStore, to_utc_iso
+
+
+class Gone(Exception):
+    def __init__(self):
+        super().__init__("410 Gone")
+        self.resp = type("Resp", (), {"status": 410})()
+
+
+class FakeRequest:
+    def __init__(self, outcome):
+        self.outcome = outcome
+
+    def execute(self):
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return self.outcome
+
+
+class FakeService:
+    """events().list() returns queued responses and records the kwargs of each call."""
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def events(self):
+        return self
+
+    def list(self, **kwargs):
+        self.calls.append(kwargs)
+        return FakeRequest(self.responses.pop(0))
+
+
+def _event(event_id, summary, start, end, description="", status="confirmed"):
+    return {
+        "id": event_id,
+        "summary": summary,
+        "description": description,
+        "status": status,
+        "start": {"dateTime": start},
+        "end": {"dateTime": end},
+    }
+
+
+STANDUP = _event("e1", "Standup", "2030-01-10T09:00:00+09:00", "2030-01-10T09:30:00+09:00")
+LUNCH = _event("e2", "Lunch", "2030-01-10T12:00:00+09:00", "2030-01-10T13:00:00+09:00", "[ThreadID: t-1]")
+
+
+class TestEventStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = EventStore(db_path=os.path.join(self.tmpdir.name, "mirror.db"), past_days=30)
+        self.index = EventIndex(self.store)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_full_then_incremental_sync(self):
+        service = FakeService(
+            {"items": [STANDUP, LUNCH], "nextSyncToken": "tok-1"},
+            {"items": [{"id": "e1", "status": "cancelled"}], "nextSyncToken": "tok-2"},
+        )
+        self.assertTrue(self.store.sync_calendar(service, "primary"))
+        self.assertIn("timeMin", service.calls[0])
+        self.assertEqual(len(self.index.overlapping("primary", "2030-01-10T00:00:00+09:00", "2030-01-11T00:00:00+09:00")), 2)
+
+        self.assertTrue(self.store.sync_calendar(service, "primary"))
+        self.assertEqual(service.calls[1]["syncToken"], "tok-1")
+        self.assertNotIn("timeMin", service.calls[1])
+        remaining = self.index.overlapping("primary", "2030-01-10T00:00:00+09:00")
+        self.assertEqual([e["id"] for e in remaining], ["e2"])
+        self.assertEqual(self.store.stats()["incremental_syncs"], 1)
+
+    def test_expired_token_triggers_full_resync(self):
+        service = FakeService(
+            {"items": [STANDUP], "nextSyncToken": "tok-1"},
+            Gone(),
+            {"items": [LUNCH], "nextSyncToken": "tok-2"},
+        )
+        self.store.sync_calendar(service, "primary")
+        self.assertTrue(self.store.sync_calendar(service, "primary"))
+
+        events = self.index.overlapping("primary", "2030-01-01T00:00:00Z")
+        self.assertEqual([e["id"] for e in events], ["e2"])
+        self.assertEqual(self.store.sync_state("primary")["sync_token"], "tok-2")
+        self.assertEqual(self.store.stats()["full_syncs"], 2)
+
+    def test_failed_sync_is_reported(self):
+        service = FakeService(RuntimeError("network down"))
+        self.assertFalse(self.store.sync_calendar(service, "primary"))
+        self.assertFalse(self.store.is_fresh("primary", 60))
+
+    def test_range_duplicate_and_description_queries(self):
+        self.store.sync_calendar(FakeService({"items": [STANDUP, LUNCH], "nextSyncToken": "tok"}), "primary")
+
+        # Overlap semantics: an event ending exactly at time_min is excluded
+        window = self.index.overlapping("primary", "2030-01-10T09:30:00+09:00", "2030-01-10T12:30:00+09:00")
+        self.assertEqual([e["id"] for e in window], ["e2"])
+
+        self.assertEqual(len(self.index.find_exact("primary", "Standup", "2030-01-10T00:00:00Z")), 1)
+        self.assertEqual(self.index.find_exact("primary", "Standup", "2030-01-10T10:00:00+09:00"), [])
+        self.assertEqual([e["id"] for e in self.store.search_description("primary", "[ThreadID: t-1]")], ["e2"])
+
+    def test_write_through(self):
+        self.store.sync_calendar(FakeService({"items": [], "nextSyncToken": "tok"}), "primary")
+        self.store.upsert_event("primary", STANDUP)
+        self.assertEqual(len(self.index.overlapping("primary", "2030-01-10T00:00:00+09:00")), 1)
+        self.store.remove_event("primary", "e1")
+        self.assertEqual(self.index.overlapping("primary", "2030-01-10T00:00:00+09:00"), [])
+
+    def test_writes_update_the_index_without_reloading(self):
+        service = FakeService(
+            {"items": [STANDUP], "nextSyncToken": "tok-1"},
+            {"items": [{"id": "e1", "status": "cancelled"}], "nextSyncToken": "tok-2"},
+        )
+        self.store.sync_calendar(service, "primary")
+        self.index.overlapping("primary", "2030-01-10T00:00:00+09:00")
+        self.assertEqual(self.index.builds, 1)
+
+        self.store.upsert_event("primary", LUNCH)
+        self.store.upsert_event("primary", {**STANDUP, "summary": "Standup (moved)"})
+        found = self.index.overlapping("primary", "2030-01-10T00:00:00+09:00")
+        self.assertEqual([(e["id"], e["summary"]) for e in found], [("e1", "Standup (moved)"), ("e2", "Lunch")])
+        self.assertEqual(self.index.find_exact("primary", "Standup", "2030-01-10T00:00:00Z"), [])
+
+        self.store.sync_calendar(service, "primary")
+        self.assertEqual([e["id"] for e in self.index.overlapping("primary", "2030-01-10T00:00:00+09:00")], ["e2"])
+        self.assertEqual((self.index.builds, self.index.updates), (1, 2))
+
+    def test_to_utc_iso(self):
+        self.assertEqual(to_utc_iso({"dateTime": "2030-01-10T09:00:00+09:00"}), "2030-01-10T00:00:00Z")
+        self.assertEqual(to_utc_iso({"date": "2030-01-10"}), "2030-01-09T15:00:00Z")
+        self.assertEqual(to_utc_iso("2030-01-10T09:00:00"), "2030-01-10T00:00:00Z")
+        self.assertIsNone(to_utc_iso(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+from app.agent.routing import FastPathRouter, RouteDecision, RoutingRule
+
+
+def _keyword_rule(name, mode, keyword, confidence):
+    return RoutingRule(name, mode, lambda message: confidence if keyword in message else 0.0)
+
+
+class TestFastPathRouter(unittest.TestCase):
+    def setUp(self):
+        self.router = FastPathRouter(
+            [
+                _keyword_rule("calendar", "simple", "일정", 0.9),
+                _keyword_rule("notes", "complex", "회의록", 0.95),
+                _keyword_rule("weak", "answer", "hi", 0.5),
+            ],
+            threshold=0.85,
+            log_every=0,
+        )
+
+    def test_highest_confidence_rule_wins(self):
+        decision = self.router.classify("회의록 보고 일정 잡아줘")
+        self.assertEqual(decision, RouteDecision("complex", 0.95, "notes"))
+
+    def test_below_threshold_falls_back_to_llm(self):
+        self.assertIsNone(self.router.classify("hi there"))
+        self.assertIsNone(self.router.classify(""))
+
+    def test_failing_rule_is_skipped(self):
+        def boom(message):
+            raise ValueError("bad rule")
+
+        router = FastPathRouter([RoutingRule("boom", "answer", boom), _keyword_rule("calendar", "simple", "일정", 0.9)])
+        self.assertEqual(router.classify("일정").source, "calendar")
+
+    def test_snapshot_counts_avoided_llm_calls(self):
+        self.router.record(RouteDecision("simple", 0.9, "calendar"))
+        self.router.record(RouteDecision("simple", 0.9, "calendar"))
+        self.router.record(RouteDecision("answer", 1.0, "llm"))
+        self.router.record(RouteDecision("complex", 0.0, "llm_fallback"))
+
+        snapshot = self.router.snapshot()
+        self.assertEqual(snapshot["total"], 4)
+        self.assertEqual(snapshot["llm_router_calls"], 2)
+        self.assertEqual(snapshot["llm_router_calls_avoided"], 2)
+        self.assertEqual(snapshot["decisions"]["calendar:simple"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
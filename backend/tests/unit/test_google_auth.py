@@ -0,0 +1,84 @@
+import os
+import json
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from app.core import google_auth
+
+
+def _fake_creds(expires_in: timedelta, refresh_token="refresh"):
+    creds = MagicMock()
+    creds.token = "access"
+    creds.refresh_token = refresh_token
+    creds.expiry = datetime.utcnow() + expires_in
+    creds.valid = expires_in > timedelta(0)
+    creds.to_json.return_value = json.dumps({"token": "new"})
+    return creds
+
+
+class TestGoogleAuthCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.token_file = os.path.join(self.tmpdir.name, "token.json")
+        with open(self.token_file, "w") as f:
+            f.write("{}")
+        self.patches = [
+            patch.object(google_auth, "TOKEN_FILE", self.token_file),
+            patch.object(google_auth, "build", side_effect=lambda *a, **k: MagicMock()),
+            patch.object(google_auth, "AuthorizedHttp"),
+        ]
+        for p in self.patches:
+            p.start()
+        google_auth.invalidate_calendar_service()
+        google_auth._local = threading.local()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        google_auth.invalidate_calendar_service()
+        self.tmpdir.cleanup()
+
+    def test_valid_token_is_loaded_once_and_service_reused(self):
+        creds = _fake_creds(timedelta(hours=1))
+        with patch.object(google_auth.Credentials, "from_authorized_user_file", return_value=creds) as load:
+            first = google_auth.get_calendar_service()
+            second = google_auth.get_calendar_service()
+
+        self.assertIs(first, second)
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(google_auth.build.call_count, 1)
+        creds.refresh.assert_not_called()
+
+    def test_refreshes_near_expiry_and_writes_atomically(self):
+        creds = _fake_creds(timedelta(minutes=1))
+        with patch.object(google_auth.Credentials, "from_authorized_user_file", return_value=creds):
+            self.assertIs(google_auth.get_credentials(), creds)
+
+        creds.refresh.assert_called_once()
+        with open(self.token_file) as f:
+            self.assertEqual(json.load(f), {"token": "new"})
+        self.assertEqual([n for n in os.listdir(self.tmpdir.name) if n.endswith(".tmp")], [])
+
+    def test_rewritten_token_file_rebuilds_service(self):
+        creds = _fake_creds(timedelta(hours=1))
+        with patch.object(google_auth.Credentials, "from_authorized_user_file", return_value=creds):
+            generation = google_auth.get_auth_generation()
+            google_auth.get_calendar_service()
+            # Simulate scripts/reauth.py writing a new token
+            stat = os.stat(self.token_file)
+            os.utime(self.token_file, (stat.st_atime, stat.st_mtime + 10))
+            google_auth.get_calendar_service()
+
+        self.assertGreater(google_auth.get_auth_generation(), generation)
+        self.assertEqual(google_auth.build.call_count, 2)
+
+    def test_missing_token_returns_none(self):
+        os.remove(self.token_file)
+        self.assertIsNone(google_auth.get_calendar_service())
+
+
+if __name__ == "__main__":
+    unittest.main()
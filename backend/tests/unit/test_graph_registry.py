@@ -0,0 +1,24 @@
+from langgraph.checkpoint.memory import MemorySaver
+
+from app.agent.graph import get_graph, clear_graph_cache
+
+
+def test_get_graph_reuses_compiled_graph():
+    clear_graph_cache()
+    checkpointer = MemorySaver()
+
+    first = get_graph(checkpointer=checkpointer)
+    second = get_graph(checkpointer=checkpointer)
+
+    assert first is second
+
+
+def test_get_graph_compiles_per_checkpointer():
+    clear_graph_cache()
+
+    with_saver = get_graph(checkpointer=MemorySaver())
+    other_saver = get_graph(checkpointer=MemorySaver())
+    without_saver = get_graph()
+
+    assert with_saver is not other_saver
+    assert without_saver is get_graph()
@@ -0,0 +1,49 @@
+import unittest
+
+from app.services.hybrid_search import BM25Index, reciprocal_rank_fusion, tokenize
+
+DOCS = [
+    ("logistics::0", "Flight: Korean Air (대한항공 KE721 / KE722) Booking Reference (예약 번호): ABC123XYZ"),
+    ("logistics::1", "Hotel Nikko Osaka (호텔 닛코 오사카) Address (주소): 1-3-3 Nishi-Shinsaibashi"),
+    ("itinerary::0", "Day 1 도톤보리 산책, 오사카성 방문. 저녁은 호텔 근처에서"),
+    ("restaurants::0", "Ichiran Ramen 도톤보리점, 오코노미야키 맛집 추천"),
+]
+
+
+class TestTokenize(unittest.TestCase):
+    def test_codes_stay_whole_and_hangul_gets_bigrams(self):
+        tokens = tokenize("KE721 항공편은?")
+        self.assertIn("ke721", tokens)
+        self.assertIn("항공편은", tokens)
+        self.assertIn("항공", tokens)
+        self.assertIn("공편", tokens)
+
+
+class TestBM25Index(unittest.TestCase):
+    def setUp(self):
+        self.index = BM25Index(DOCS)
+
+    def test_exact_tokens_rank_first(self):
+        self.assertEqual(self.index.search("예약번호 ABC123XYZ 알려줘", k=1)[0][0], "logistics::0")
+        self.assertEqual(self.index.search("KE722 편명", k=1)[0][0], "logistics::0")
+        self.assertEqual(self.index.search("호텔 주소가 어디야?", k=1)[0][0], "logistics::1")
+
+    def test_allowed_prefilters_candidates(self):
+        hits = self.index.search("도톤보리", k=5, allowed={"restaurants::0"})
+        self.assertEqual([doc_id for doc_id, _ in hits], ["restaurants::0"])
+        self.assertEqual(self.index.search("도톤보리", k=5, allowed=set()), [])
+
+    def test_unknown_terms_return_nothing(self):
+        self.assertEqual(self.index.search("zzz"), [])
+        self.assertEqual(BM25Index([]).search("호텔"), [])
+
+
+class TestReciprocalRankFusion(unittest.TestCase):
+    def test_documents_ranked_well_by_both_lists_win(self):
+        fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "c", "a"]])
+        self.assertEqual([doc_id for doc_id, _ in fused], ["b", "a", "c"])
+        self.assertAlmostEqual(fused[0][1], 1 / 62 + 1 / 61)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import re
+import unittest
+
+from app.agent import keyword_matcher as km
+from app.agent.keyword_matcher import KeywordMatcher
+
+
+class TestKeywordMatcher(unittest.TestCase):
+    def test_overlapping_and_prefix_hints(self):
+        matcher = KeywordMatcher({"short": ["항공", "일정"], "long": ["항공편", "오늘 일정"]})
+        self.assertEqual(matcher.features("항공편 알려줘"), {"short", "long"})
+        self.assertEqual(matcher.features("오늘 일정"), {"short", "long"})
+        self.assertEqual(matcher.features("내일 일정"), {"short"})
+        self.assertEqual(matcher.features(""), frozenset())
+
+    def test_case_insensitive_and_patterns(self):
+        matcher = KeywordMatcher(
+            {"flight": ["flight"]},
+            patterns={"code": [re.compile(r"\b(kix|icn)\b", re.IGNORECASE)]},
+        )
+        self.assertEqual(matcher.features("FLIGHT to KIX"), {"flight", "code"})
+        self.assertEqual(matcher.features("kixx"), frozenset())
+
+    def test_matches_per_table_scans(self):
+        tables = {
+            "travel": km.TRAVEL_ROUTER_HINTS,
+            "calendar_only": km.CALENDAR_ONLY_HINTS,
+            "calendar_force": km.CALENDAR_FORCE_HINTS,
+            "calendar_create": km.CALENDAR_CREATE_HINTS,
+            "flight": km.FLIGHT_HINTS,
+            "lodging": km.LODGING_HINTS,
+            "travel_fact": km.TRAVEL_FACT_HINTS,
+            "complex": km.ROUTER_COMPLEX_HINTS,
+            "meeting_notes": km.MEETING_NOTES_HINTS,
+        }
+        messages = [
+            "오늘 일정 알려줘",
+            "내일 오후 3시에 치과 예약 일정 추가해줘",
+            "오사카 항공편 시간 알려줘",
+            "호텔 체크인 몇 시야?",
+            "e-ticket 예약번호 확인해줘",
+            "회의록 정리해서 액션 아이템 뽑아줘",
+            "Can you set up a meeting tomorrow?",
+            "Summarize this transcript and list the action items.",
+            "안녕하세요!",
+        ]
+        for message in messages:
+            text = message.lower()
+            expected = {name for name, hints in tables.items() if any(h in text for h in hints)}
+            if any(p.search(text) for p in km.TRAVEL_ROUTER_REGEX):
+                expected.add("travel")
+            self.assertEqual(set(km.keyword_matcher.features(message)), expected, message)
+
+
+if __name__ == "__main__":
+    unittest.main()
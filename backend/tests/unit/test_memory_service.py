@@ -2,7 +2,9 @@ import unittest
 import os
 import json
 import shutil
+import time
 from app.services.memory import MemoryService
+from app.services.session_store import JsonlSessionStore, SessionStore
 
 class TestMemoryService(unittest.TestCase):
     def setUp(self):
@@ -24,6 +26,8 @@ class TestMemoryService(unittest.TestCase):
         self.service = MemoryService()
 
     def tearDown(self):
+        # Write (and stop the debounce timer) before the directory goes away
+        self.service.flush()
         # Restore original constants if needed (though they are pointers)
         import app.services.memory
         app.services.memory.DATA_DIR = self.original_data_dir
@@ -82,5 +86,158 @@ class TestMemoryService(unittest.TestCase):
         self.assertEqual(profile["history"][-1]["thread_id"], "thread_24")
         self.assertEqual(profile["history"][0]["thread_id"], "thread_5")
 
+    def _read_file(self):
+        with open(os.path.join(self.test_dir, "user_profile.json"), encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_profile_reads_are_served_from_memory(self):
+        self.service.get_user_profile()
+        loads = self.service.profile_loads
+        for _ in range(10):
+            self.service.get_user_profile()
+        self.assertEqual(self.service.profile_loads, loads)
+
+        # Callers get a copy; mutating it does not corrupt the cache
+        self.service.get_user_profile()["facts"]["x"] = 1
+        self.assertNotIn("x", self.service.get_user_profile()["facts"])
+
+    def test_updates_are_coalesced_into_one_atomic_write(self):
+        service = MemoryService(flush_delay=60)
+        service.update_user_profile({"name": "Alice"})
+        service.update_user_info({"name": "Alice"})
+        service.add_user_pattern("morning meetings")
+        service.add_user_pattern("morning meetings")
+        service.add_session_summary("thread_1", "Work", "Planning")
+
+        self.assertEqual(self._read_file()["facts"], {})
+        self.assertEqual(service.profile_stats()["pending_updates"], 4)
+        service.flush()
+
+        on_disk = self._read_file()
+        self.assertEqual(service.profile_flushes, 1)
+        self.assertEqual(on_disk["facts"]["name"], "Alice")
+        self.assertEqual(on_disk["patterns"], ["morning meetings"])
+        self.assertEqual(on_disk["history"][0]["thread_id"], "thread_1")
+        self.assertFalse([f for f in os.listdir(self.test_dir) if f.endswith(".tmp")])
+
+    def test_external_rewrite_is_picked_up_with_pending_updates_replayed(self):
+        service = MemoryService(flush_delay=60, stat_interval=0)
+        service.update_user_profile({"hobby": "Tennis"})
+
+        profile = self._read_file()
+        profile["facts"]["city"] = "Seoul"
+        path = os.path.join(self.test_dir, "user_profile.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(profile, f)
+        os.utime(path, ns=(1, 1))
+
+        facts = service.get_user_profile()["facts"]
+        self.assertEqual(facts, {"city": "Seoul", "hobby": "Tennis"})
+        service.flush()
+        self.assertEqual(self._read_file()["facts"], {"city": "Seoul", "hobby": "Tennis"})
+
+    def test_flush_does_not_overwrite_an_unseen_external_rewrite(self):
+        # The cached stat is still fresh when another process rewrites the file
+        service = MemoryService(flush_delay=60, stat_interval=60)
+        service.update_user_profile({"hobby": "Tennis"})
+
+        profile = self._read_file()
+        profile["facts"]["city"] = "Seoul"
+        path = os.path.join(self.test_dir, "user_profile.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(profile, f)
+        os.utime(path, ns=(1, 1))
+
+        service.flush()
+        self.assertEqual(self._read_file()["facts"], {"city": "Seoul", "hobby": "Tennis"})
+        self.assertEqual(service.get_user_profile()["facts"], {"city": "Seoul", "hobby": "Tennis"})
+
+    def test_debounced_flush_runs_in_background(self):
+        service = MemoryService(flush_delay=0.05)
+        service.update_user_profile({"name": "Bob"})
+        deadline = time.monotonic() + 2.0
+        while service.profile_flushes == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self._read_file()["facts"]["name"], "Bob")
+
+    def test_sessions_round_trip_through_store(self):
+        from langchain_core.messages import AIMessage, HumanMessage
+        history = [HumanMessage(content="내일 일정 알려줘"), AIMessage(content="내일은 회의가 있습니다.")]
+        self.service.save_session("thread_1", history)
+        history.append(HumanMessage(content="고마워"))
+        self.service.save_session("thread_1", history)
+
+        loaded = self.service.load_session("thread_1")
+        self.assertEqual([m.content for m in loaded], [m.content for m in history])
+        self.assertEqual(self.service.sessions.stats()["appended_messages"], 3)
+
+        # An edited last message no longer matches the persisted prefix: the transcript is rewritten
+        history[-1] = HumanMessage(content="정말 고마워")
+        self.service.save_session("thread_1", history)
+        self.assertEqual(self.service.load_session("thread_1")[-1].content, "정말 고마워")
+        date_str = self.service.list_all_dates()[0]
+        self.assertEqual(self.service.list_sessions_by_date(date_str), ["thread_1"])
+
+    def test_legacy_json_sessions_are_imported_once(self):
+        daily_dir = os.path.join(self.test_dir, "sessions", "2025-12-01")
+        os.makedirs(daily_dir)
+        legacy = {"updated_at": "2025-12-01T09:00:00+09:00",
+                  "messages": [{"type": "human", "data": {"content": "예전 대화"}}]}
+        with open(os.path.join(daily_dir, "old_thread.json"), "w", encoding="utf-8") as f:
+            json.dump(legacy, f)
+
+        service = MemoryService(session_store=SessionStore(os.path.join(self.test_dir, "legacy.db")))
+        self.assertEqual([m.content for m in service.load_session("old_thread")], ["예전 대화"])
+        self.assertEqual(service.list_sessions_by_date("2025-12-01"), ["old_thread"])
+        self.assertIsNotNone(service.sessions.get_meta("legacy_json_imported"))
+
+    def test_legacy_json_sessions_are_imported_into_jsonl_store(self):
+        daily_dir = os.path.join(self.test_dir, "sessions", "2025-12-01")
+        os.makedirs(daily_dir)
+        legacy = {"updated_at": "2025-12-01T09:00:00+09:00",
+                  "messages": [{"type": "human", "data": {"content": "예전 대화"}}]}
+        with open(os.path.join(daily_dir, "old_thread.json"), "w", encoding="utf-8") as f:
+            json.dump(legacy, f)
+
+        store = JsonlSessionStore(os.path.join(self.test_dir, "session_logs"))
+        service = MemoryService(session_store=store)
+        self.assertEqual([m.content for m in service.load_session("old_thread")], ["예전 대화"])
+        self.assertEqual(service.list_sessions_by_date("2025-12-01"), ["old_thread"])
+        self.assertEqual(service.sessions.location, store.root_dir)
+        self.assertIsNotNone(service.sessions.get_meta("legacy_json_imported"))
+
+    def test_analyzer_only_sends_messages_after_watermark(self):
+        import asyncio
+        from unittest.mock import MagicMock, patch
+        from langchain_core.messages import AIMessage, HumanMessage
+        from app.services.memory import MemoryAnalyzer
+
+        replies = iter([
+            {"facts": {"team": "Platform"}, "category": "Work", "summary": "플랫폼 팀 회의 일정 논의"},
+            {"facts": {"editor": "vim"}, "category": "Work", "summary": "회의 일정과 개발 환경 논의"},
+        ])
+        llm = MagicMock()
+        llm.invoke.side_effect = lambda prompt: MagicMock(content=json.dumps(next(replies), ensure_ascii=False))
+        analyzer = MemoryAnalyzer(self.service)
+
+        history = [HumanMessage(content="저는 플랫폼 팀이에요"), AIMessage(content="알겠습니다.")]
+        with patch("app.agent.llm.get_llm", return_value=llm):
+            self.assertTrue(asyncio.run(analyzer.analyze_and_update(history, thread_id="t1")))
+            history += [HumanMessage(content="에디터는 vim을 써요"), AIMessage(content="기억할게요.")]
+            self.assertTrue(asyncio.run(analyzer.analyze_and_update(history, thread_id="t1")))
+            # Nothing new: no LLM call
+            self.assertTrue(asyncio.run(analyzer.analyze_and_update(history, thread_id="t1")))
+
+        self.assertEqual(llm.invoke.call_count, 2)
+        second_prompt = llm.invoke.call_args_list[1][0][0]
+        self.assertIn("플랫폼 팀 회의 일정 논의", second_prompt)
+        self.assertIn("에디터는 vim을 써요", second_prompt)
+        self.assertNotIn("저는 플랫폼 팀이에요", second_prompt)
+
+        profile = self.service.get_user_profile()
+        self.assertEqual(profile["facts"], {"team": "Platform", "editor": "vim"})
+        self.assertEqual(profile["history"][-1]["summary"], "회의 일정과 개발 환경 논의")
+        self.assertEqual(self.service.get_analysis_state("t1")["watermark"], 4)
+
 if __name__ == "__main__":
     unittest.main()
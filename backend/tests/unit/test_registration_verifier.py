@@ -0,0 +1,110 @@
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from app.services.registration_verifier import RegistrationVerifier
+
+
+class HttpError(Exception):
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.resp = MagicMock(status=status)
+
+
+class FakeBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        self.service.batches += 1
+        for request_id, event_id in self.requests:
+            outcome = self.service.outcomes.get(event_id, {"id": event_id})
+            if isinstance(outcome, list):
+                outcome = outcome.pop(0)
+            if isinstance(outcome, Exception):
+                self.callback(request_id, None, outcome)
+            else:
+                self.callback(request_id, outcome, None)
+
+
+class FakeService:
+    def __init__(self, outcomes=None):
+        self.outcomes = outcomes or {}
+        self.batches = 0
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+    def events(self):
+        return self
+
+    def get(self, calendarId, eventId):
+        return eventId
+
+
+def _created(*event_ids):
+    return [{"calendar_id": "primary", "event_id": event_id} for event_id in event_ids]
+
+
+class TestRegistrationVerifier(unittest.TestCase):
+    def test_trust_mode_makes_no_calls(self):
+        service = FakeService()
+        verifier = RegistrationVerifier(mode="trust", reporter=MagicMock())
+        self.assertEqual(verifier.after_insert(service, _created("a")), {"a": "trusted"})
+        self.assertEqual(service.batches, 0)
+
+    def test_sync_mode_checks_in_one_batch(self):
+        service = FakeService({"b": HttpError(404), "c": HttpError(503)})
+        reporter = MagicMock()
+        verifier = RegistrationVerifier(mode="sync", reporter=reporter)
+
+        outcome = verifier.after_insert(service, _created("a", "b", "c"))
+
+        self.assertEqual(outcome, {"a": "verified", "b": "missing", "c": "failed"})
+        self.assertEqual(service.batches, 1)
+        reporter.set_verification.assert_any_call("a", "verified", calendar_id="primary")
+        self.assertEqual(verifier.status("b"), "missing")
+
+    def test_async_mode_verifies_in_background_and_retries(self):
+        service = FakeService({"b": [HttpError(503), {"id": "b"}]})
+        reporter = MagicMock()
+        verifier = RegistrationVerifier(mode="async", delay_seconds=0.01, reporter=reporter)
+
+        with patch("app.services.registration_verifier.get_calendar_service", return_value=service):
+            outcome = verifier.after_insert(service, _created("a", "b"))
+            self.assertEqual(outcome, {"a": "pending", "b": "pending"})
+            deadline = time.monotonic() + 2.0
+            while reporter.set_verification.call_count < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        self.assertEqual(verifier.status("a"), "verified")
+        self.assertEqual(verifier.status("b"), "verified")
+        # The transient 503 was retried, never reported as failed
+        self.assertNotIn("failed", [c.args[1] for c in reporter.set_verification.call_args_list])
+        self.assertEqual(verifier.stats()["pending"], 0)
+
+    def test_retry_backoff_is_per_item(self):
+        service = FakeService({"a": HttpError(503), "b": HttpError(503)})
+        verifier = RegistrationVerifier(mode="async", delay_seconds=10.0, reporter=MagicMock())
+        ready = [
+            {"calendar_id": "primary", "event_id": "a", "due": 0.0, "attempts": 0},
+            {"calendar_id": "primary", "event_id": "b", "due": 0.0, "attempts": 1},
+        ]
+
+        with patch("app.services.registration_verifier.get_calendar_service", return_value=service):
+            verifier._verify_ready(ready)
+
+        due = {item["event_id"]: (item["attempts"], item["due"]) for item in verifier._pending}
+        self.assertEqual(due["a"][0], 1)
+        self.assertEqual(due["b"][0], 2)
+        # a waits 2x the delay, b (one attempt further along) 4x
+        self.assertAlmostEqual(due["b"][1] - due["a"][1], 20.0, delta=1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
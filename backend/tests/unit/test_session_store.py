@@ -0,0 +1,131 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from app.services.session_store import JsonlSessionStore, SessionStore
+
+
+def _msg(i: int, text: str = None):
+    return {"type": "human" if i % 2 == 0 else "ai", "data": {"content": text or f"메시지 {i}"}}
+
+
+class _StoreContract:
+    """Behaviour shared by both session store backends."""
+
+    def make_store(self, root):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = self.make_store(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_each_turn_appends_only_new_messages(self):
+        self.assertEqual(self.store.tail("t1"), (0, None))
+        self.assertEqual(self.store.append("t1", 0, [_msg(0), _msg(1)], "2026-01-01", "2026-01-01T10:00:00"), 2)
+        self.assertEqual(self.store.tail("t1"), (2, _msg(1)))
+
+        self.assertEqual(self.store.append("t1", 2, [_msg(2), _msg(3)], "2026-01-01", "2026-01-01T10:01:00"), 2)
+        self.assertEqual(self.store.load("t1"), [_msg(i) for i in range(4)])
+        self.assertEqual(self.store.tail("t1"), (4, _msg(3)))
+        self.assertEqual(self.store.rewrites, 0)
+
+    def test_rewritten_history_replaces_tail(self):
+        self.store.append("t1", 0, [_msg(0), _msg(1), _msg(2)], "2026-01-01", "2026-01-01T10:00:00")
+
+        # Trimmed history
+        self.store.append("t1", 1, [], "2026-01-01", "2026-01-01T10:01:00")
+        self.assertEqual(self.store.load("t1"), [_msg(0)])
+        self.assertEqual(self.store.tail("t1"), (1, _msg(0)))
+
+        # Edited from the start
+        edited = [_msg(0, "수정됨"), _msg(1)]
+        self.store.append("t1", 0, edited, "2026-01-01", "2026-01-01T10:02:00")
+        self.assertEqual(self.store.load("t1"), edited)
+        self.assertEqual(self.store.rewrites, 2)
+
+    def test_thread_index_by_date(self):
+        self.store.append("a", 0, [_msg(0)], "2026-01-01", "2026-01-01T09:00:00")
+        self.store.append("b", 0, [_msg(0)], "2026-01-02", "2026-01-02T09:00:00")
+        self.store.append("a", 1, [_msg(1)], "2026-01-03", "2026-01-03T09:00:00")
+
+        self.assertEqual(self.store.dates(), ["2026-01-03", "2026-01-02"])
+        self.assertEqual(self.store.threads_by_date("2026-01-03"), ["a"])
+        self.assertEqual(self.store.session_date("b"), "2026-01-02")
+        self.assertEqual(self.store.load("missing"), [])
+        self.assertEqual(self.store.stats()["threads"], 2)
+
+    def test_meta_persists_across_instances(self):
+        self.store.set_meta("legacy_json_imported", "yes")
+        self.assertEqual(self.make_store(self.tmpdir.name).get_meta("legacy_json_imported"), "yes")
+
+
+class TestSqliteSessionStore(_StoreContract, unittest.TestCase):
+    def make_store(self, root):
+        return SessionStore(os.path.join(root, "sessions.db"))
+
+    def test_rows_match_live_messages(self):
+        self.store.append("t1", 0, [_msg(0), _msg(1), _msg(2)], "2026-01-01", "2026-01-01T10:00:00")
+        self.store.append("t1", 1, [_msg(1, "다시")], "2026-01-01", "2026-01-01T10:01:00")
+        with sqlite3.connect(self.store.db_path) as conn:
+            rows = conn.execute("SELECT COUNT(*) FROM messages WHERE thread_id = 't1'").fetchone()[0]
+        self.assertEqual(rows, 2)
+
+
+class TestJsonlSessionStore(_StoreContract, unittest.TestCase):
+    def make_store(self, root):
+        return JsonlSessionStore(os.path.join(root, "session_logs"), compact_min_lines=4)
+
+    def _lines(self, thread_id):
+        with open(self.store._path(thread_id), "rb") as f:
+            return f.read().count(b"\n")
+
+    def test_log_is_compacted_once_superseded_lines_dominate(self):
+        self.store.append("t1", 0, [_msg(0), _msg(1)], "2026-01-01", "2026-01-01T10:00:00")
+        for turn in range(4):
+            # Regenerated answer: the last message is rewritten each time
+            self.store.append("t1", 1, [_msg(1, f"답변 {turn}"), _msg(2)], "2026-01-01", "2026-01-01T10:01:00")
+
+        self.assertEqual(self.store.compactions, 1)
+        self.assertEqual(self.store.load("t1"), [_msg(0), _msg(1, "답변 3"), _msg(2)])
+        self.assertLessEqual(self._lines("t1"), 5)
+
+        # The reopened store sees the same transcript and index
+        reopened = self.make_store(self.tmpdir.name)
+        self.assertEqual(reopened.load("t1"), self.store.load("t1"))
+        self.assertEqual(reopened.tail("t1"), (3, _msg(2)))
+
+    def test_saves_append_to_the_index_log_instead_of_rewriting_the_index(self):
+        self.store = JsonlSessionStore(os.path.join(self.tmpdir.name, "session_logs"), compact_min_lines=100)
+        for thread in range(3):
+            self.store.append(f"t{thread}", 0, [_msg(0)], "2026-01-01", "2026-01-01T10:00:00")
+        self.store.set_meta("analysis:t0", "긴 요약 " * 100)
+        self.assertFalse(os.path.exists(self.store.index_path))
+
+        self.store.append("t0", 1, [_msg(1)], "2026-01-02", "2026-01-02T10:00:00")
+        with open(self.store.index_log_path, "rb") as f:
+            last = f.read().splitlines()[-1]
+        # One small line per turn, whatever the size of the other entries
+        self.assertLess(len(last), 200)
+
+        reopened = JsonlSessionStore(self.store.root_dir, compact_min_lines=100)
+        self.assertEqual(reopened.tail("t0"), (2, _msg(1)))
+        self.assertEqual(reopened.dates(), ["2026-01-02", "2026-01-01"])
+        self.assertEqual(reopened.get_meta("analysis:t0"), "긴 요약 " * 100)
+
+    def test_index_log_is_folded_into_the_snapshot(self):
+        for turn in range(6):
+            self.store.append("t1", turn, [_msg(turn)], "2026-01-01", f"2026-01-01T10:0{turn}:00")
+
+        # compact_min_lines=4: the fifth update rewrote the snapshot and emptied the log
+        self.assertTrue(os.path.exists(self.store.index_path))
+        with open(self.store.index_log_path, "rb") as f:
+            self.assertEqual(len(f.read().splitlines()), 1)
+        self.assertEqual(self.make_store(self.tmpdir.name).tail("t1"), (6, _msg(5)))
+
+
+if __name__ == "__main__":
+    unittest.main()
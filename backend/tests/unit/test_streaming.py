@@ -0,0 +1,105 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from app.agent.streaming import AssistantMessageExtractor, format_sse, stream_chat_events
+
+
+def _feed_all(chunks):
+    extractor = AssistantMessageExtractor()
+    return "".join(extractor.feed(c) for c in chunks)
+
+
+def test_extractor_streams_assistant_message_from_json():
+    raw = json.dumps({"mode": "plan", "assistant_message": "내일 10시에 \"회의\"가 있어요.\n확인했어요 😀", "language": "ko"}, ensure_ascii=True)
+    # Split into tiny chunks so escapes and surrogate pairs straddle chunk boundaries
+    chunks = [raw[i:i + 3] for i in range(0, len(raw), 3)]
+
+    assert _feed_all(chunks) == "내일 10시에 \"회의\"가 있어요.\n확인했어요 😀"
+
+
+def test_extractor_ignores_text_after_message_field():
+    chunks = ['{"assistant_message": "hi"', ', "intent_description": "nope"}']
+
+    assert _feed_all(chunks) == "hi"
+
+
+def test_extractor_passes_plain_text_through():
+    assert _feed_all(["  오늘 일정은", " 두 개입니다."]) == "  오늘 일정은 두 개입니다."
+
+
+def test_format_sse():
+    frame = format_sse("token", {"text": "안녕"})
+
+    assert frame == 'event: token\ndata: {"text": "안녕"}\n\n'
+
+
+class FakeGraph:
+    def __init__(self, events):
+        self._events = events
+
+    async def astream_events(self, inputs, config=None, version=None):
+        for ev in self._events:
+            yield ev
+
+
+def test_stream_chat_events_translates_graph_events():
+    planner_meta = {"langgraph_node": "planner"}
+    events = [
+        {"event": "on_chain_start", "name": "LangGraph", "parent_ids": [], "metadata": {}},
+        {"event": "on_chain_start", "name": "planner", "parent_ids": ["root"], "metadata": planner_meta},
+        {"event": "on_chat_model_stream", "run_id": "r1", "metadata": planner_meta,
+         "data": {"chunk": SimpleNamespace(content='{"assistant_message": "안')}},
+        {"event": "on_chat_model_stream", "run_id": "r1", "metadata": planner_meta,
+         "data": {"chunk": SimpleNamespace(content='녕"}')}},
+        {"event": "on_chat_model_stream", "run_id": "r2", "metadata": {"langgraph_node": "router"},
+         "data": {"chunk": SimpleNamespace(content="router json")}},
+        {"event": "on_tool_start", "name": "list_events", "metadata": {}, "data": {"input": {"start_date": "2026-01-01"}}},
+        {"event": "on_tool_end", "name": "list_events", "metadata": {}},
+        {"event": "on_chain_end", "name": "planner", "parent_ids": ["root"], "metadata": planner_meta},
+        {"event": "on_chain_end", "name": "LangGraph", "parent_ids": [], "metadata": {}, "data": {"output": {"messages": ["m"]}}},
+    ]
+
+    async def collect():
+        return [item async for item in stream_chat_events(FakeGraph(events), {}, {})]
+
+    result = asyncio.run(collect())
+
+    assert result == [
+        ("node", {"node": "planner", "status": "start"}),
+        ("token", {"text": "안"}),
+        ("token", {"text": "녕"}),
+        ("tool", {"name": "list_events", "status": "start", "args": {"start_date": "2026-01-01"}}),
+        ("tool", {"name": "list_events", "status": "end"}),
+        ("node", {"node": "planner", "status": "end"}),
+        ("final", {"messages": ["m"]}),
+    ]
+
+
+def test_planner_rerun_resets_streamed_text():
+    planner_meta = {"langgraph_node": "planner"}
+
+    def chunk(run_id, content):
+        return {"event": "on_chat_model_stream", "run_id": run_id, "metadata": planner_meta,
+                "data": {"chunk": SimpleNamespace(content=content)}}
+
+    events = [
+        # First attempt streams part of its message, then fails to parse and is repaired
+        chunk("attempt", '{"assistant_message": "내일'),
+        chunk("attempt", ' 일정'),
+        chunk("repair", '{"assistant_message": "내일 일정은 없습니다."}'),
+        {"event": "on_chain_end", "name": "LangGraph", "parent_ids": [], "metadata": {}, "data": {"output": {"messages": []}}},
+    ]
+
+    async def collect():
+        return [item async for item in stream_chat_events(FakeGraph(events), {}, {})]
+
+    result = asyncio.run(collect())
+
+    assert result == [
+        ("token", {"text": "내일"}),
+        ("token", {"text": " 일정"}),
+        ("reset", {"reason": "planner_rerun"}),
+        ("token", {"text": "내일 일정은 없습니다."}),
+        ("final", {"messages": []}),
+    ]
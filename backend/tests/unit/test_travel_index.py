@@ -0,0 +1,146 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from app.services import travel
+
+
+class FakeFAISS:
+    """FAISS class stand-in: each partition keeps its documents; save/load go through `saved`."""
+    def __init__(self):
+        self.saved = {}
+        self.built = []
+        self.fail_next = None
+
+    def _db(self, docs, ids):
+        db = MagicMock()
+        db.index.ntotal = len(docs)
+        db.index_to_docstore_id = dict(enumerate(ids))
+        db.docstore.search.side_effect = dict(zip(ids, docs)).get
+
+        def save_local(path):
+            os.makedirs(path, exist_ok=True)
+            open(os.path.join(path, "index.faiss"), "w").close()
+            self.saved[path] = (docs, ids)
+        db.save_local.side_effect = save_local
+        return db
+
+    def from_documents(self, docs, embeddings, ids):
+        if self.fail_next:
+            error, self.fail_next = self.fail_next, None
+            raise error
+        self.built.append(ids)
+        return self._db(docs, ids)
+
+    def load_local(self, path, embeddings, allow_dangerous_deserialization=False):
+        return self._db(*self.saved[path])
+
+
+class TestPartitionedTravelIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.knowledge_dir = os.path.join(self.tmpdir.name, "knowledge")
+        self.index_dir = os.path.join(self.tmpdir.name, "index")
+        os.makedirs(self.knowledge_dir)
+        self._write("itinerary.md", "# Day 2\n오사카성 방문 후 호텔 체크인")
+        self._write("logistics.md", "# Flight\n대한항공 KE721 예약 번호 ABC123XYZ")
+        self.faiss = FakeFAISS()
+        self.patches = [
+            patch.object(travel, "KNOWLEDGE_DIR", self.knowledge_dir),
+            patch.object(travel, "VECTOR_DB_PATH", self.index_dir),
+            patch.object(travel, "MANIFEST_PATH", os.path.join(self.index_dir, "manifest.json")),
+            patch.object(travel, "PARTITIONS_DIR", os.path.join(self.index_dir, "partitions")),
+            patch.object(travel, "FAISS", self.faiss),
+            patch.object(travel, "get_embeddings", MagicMock()),
+            patch.object(travel, "CachedEmbeddings", MagicMock()),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+        self.tmpdir.cleanup()
+
+    def _write(self, name, text):
+        with open(os.path.join(self.knowledge_dir, name), "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def _start(self):
+        service = travel.TravelKnowledgeService()
+        service.warm_up().join()
+        self.assertTrue(service.is_ready)
+        return service
+
+    def test_construction_is_lazy_until_warm_up(self):
+        service = travel.TravelKnowledgeService()
+        self.assertEqual(service.status()["state"], "idle")
+        travel.get_embeddings.assert_not_called()
+        self.assertEqual(self.faiss.built, [])
+
+        self.assertEqual(service.search("zzz", mode="bm25"), [])
+        self.assertEqual(service.status()["state"], "ready")
+        self.assertEqual(service.status()["partitions"], {"itinerary.md": 1, "logistics.md": 1})
+
+    def test_failed_warm_up_is_reported_and_retried(self):
+        self.faiss.fail_next = RuntimeError("ollama unreachable")
+        service = travel.TravelKnowledgeService()
+        service.warm_up().join()
+        self.assertEqual(service.status()["state"], "failed")
+        self.assertIn("unreachable", service.status()["error"])
+
+        service.warm_up().join()
+        self.assertTrue(service.is_ready)
+
+    def test_only_changed_partition_is_rebuilt(self):
+        self._start()
+        self.assertEqual(self.faiss.built, [["itinerary.md::0"], ["logistics.md::0"]])
+
+        # Unchanged corpus: partitions are loaded, nothing is embedded
+        self._start()
+        self.assertEqual(len(self.faiss.built), 2)
+
+        self._write("logistics.md", "# Flight\nKE722")
+        os.remove(os.path.join(self.knowledge_dir, "itinerary.md"))
+        service = self._start()
+
+        self.assertEqual(self.faiss.built[2:], [["logistics.md::0"]])
+        self.assertFalse(os.path.exists(os.path.join(self.index_dir, "partitions", "itinerary.md")))
+        self.assertEqual(list(service.status()["partitions"]), ["logistics.md"])
+        self.assertIn("KE722", service.search("KE722", mode="bm25")[0]["content"])
+
+    def test_emptied_file_drops_its_partition(self):
+        self._start()
+        self._write("itinerary.md", "")
+        service = self._start()
+        self.assertFalse(os.path.exists(os.path.join(self.index_dir, "partitions", "itinerary.md")))
+        self.assertEqual(list(service.status()["partitions"]), ["logistics.md"])
+
+        # Hash now matches the manifest: the removed content must not come back
+        service = self._start()
+        self.assertEqual(list(service.status()["partitions"]), ["logistics.md"])
+        self.assertEqual(service.search("오사카성", mode="bm25"), [])
+
+    def test_routed_search_only_touches_selected_partitions(self):
+        service = self._start()
+        self.assertEqual(service.route("호텔 체크인 시간"), ["logistics.md"])
+        self.assertIsNone(service.route("맛집 추천"))
+
+        with patch.object(service, "_vector_ranking", return_value=["itinerary.md::0", "logistics.md::0"]) as vector:
+            results = service.search("KE721 예약 번호", k=2)
+            self.assertIn("KE721", results[0]["content"])
+            self.assertEqual(vector.call_args[0][2], ["itinerary.md", "logistics.md"])
+
+            service.search("호텔", k=3, partitions=["logistics.md"])
+            self.assertEqual(vector.call_args[0][2], ["logistics.md"])
+
+            source = os.path.join(self.knowledge_dir, "itinerary.md")
+            results = service.search("호텔", k=3, source_filter=source, mode="bm25")
+            self.assertEqual([r["metadata"]["source"] for r in results], [source])
+
+        self.assertEqual(service.search("호텔", partitions=["missing.md"]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
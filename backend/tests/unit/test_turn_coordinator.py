@@ -0,0 +1,109 @@
+import asyncio
+
+from app.services.turn_coordinator import TurnCoordinator
+
+
+def test_turns_serialize_within_thread_and_parallelize_across_threads():
+    coordinator = TurnCoordinator()
+    timeline = []
+
+    async def make_turn(name: str):
+        timeline.append(f"start:{name}")
+        await asyncio.sleep(0.05)
+        timeline.append(f"end:{name}")
+        return name
+
+    async def scenario():
+        return await asyncio.gather(
+            coordinator.run("t1", "first", lambda: make_turn("a1")),
+            coordinator.run("t1", "second", lambda: make_turn("a2")),
+            coordinator.run("t2", "first", lambda: make_turn("b1")),
+        )
+
+    results = asyncio.run(scenario())
+
+    assert results == ["a1", "a2", "b1"]
+    # t2 starts while t1's first turn is still running, t1's second turn waits
+    assert timeline.index("start:b1") < timeline.index("end:a1")
+    assert timeline.index("start:a2") > timeline.index("end:a1")
+    assert coordinator.snapshot()["busy_threads"] == 0
+
+
+def test_duplicate_messages_are_coalesced_while_in_flight():
+    coordinator = TurnCoordinator(coalesce_window=10.0)
+    calls = []
+
+    async def expensive_turn():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"response": "ok"}
+
+    async def scenario():
+        return await asyncio.gather(
+            coordinator.run("t1", "내일 일정 알려줘", expensive_turn),
+            coordinator.run("t1", "내일 일정 알려줘 ", expensive_turn),
+        )
+
+    in_flight = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert in_flight[0] is in_flight[1]
+    assert coordinator.snapshot()["coalesced_total"] == 1
+
+
+def test_repeated_message_after_completion_runs_again():
+    coordinator = TurnCoordinator(coalesce_window=10.0)
+    calls = []
+
+    async def confirm_turn():
+        calls.append(1)
+        return {"response": f"확인 {len(calls)}"}
+
+    async def scenario():
+        # Two separate confirmations answered with the same short reply
+        first = await coordinator.run("t1", "응", confirm_turn, should_cache=lambda r: "error" not in r)
+        second = await coordinator.run("t1", "응", confirm_turn, should_cache=lambda r: "error" not in r)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert len(calls) == 2
+    assert first != second
+
+
+def test_retry_with_same_message_id_reuses_finished_result():
+    coordinator = TurnCoordinator(coalesce_window=10.0)
+    calls = []
+
+    async def turn():
+        calls.append(1)
+        return {"response": "ok"}
+
+    async def scenario():
+        first = await coordinator.run("t1", "응", turn, message_id="m-1")
+        retried = await coordinator.run("t1", "응", turn, message_id="m-1")
+        fresh = await coordinator.run("t1", "응", turn, message_id="m-2")
+        return first, retried, fresh
+
+    first, retried, fresh = asyncio.run(scenario())
+
+    assert len(calls) == 2
+    assert first is retried
+    assert fresh is not first
+
+
+def test_error_results_are_not_cached():
+    coordinator = TurnCoordinator(coalesce_window=10.0)
+    calls = []
+
+    async def failing_turn():
+        calls.append(1)
+        return {"error": "timeout"}
+
+    async def scenario():
+        for _ in range(2):
+            await coordinator.run("t1", "hi", failing_turn, should_cache=lambda r: "error" not in r, message_id="m-1")
+
+    asyncio.run(scenario())
+
+    assert len(calls) == 2